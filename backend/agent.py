@@ -1,6 +1,15 @@
-from typing import TypedDict, Annotated, List, Dict
-from langgraph.graph import StateGraph, END
+from typing import TypedDict, Annotated, List, Dict, Tuple
+from langgraph.graph import StateGraph, START, END
 from tools import search_company_health, analyze_job_description, search_reddit_sentiment
+from tools import (
+    extract_metadata_from_text, filter_irrelevant_sources, filter_sources_combined, fused_job_analysis,
+    search_raw_intel, pick_relevant, INTEL_SUMMARIZERS,
+)
+from intel_store import company_intel, normalize_company_name
+from metrics import observe_node
+import deadline
+import tools
+import asyncio
 import datetime
 import json
 
@@ -15,17 +24,23 @@ class AgentState(TypedDict):
     temporal_analysis: str
     final_score: int
     final_reasoning: str
+    intel: Dict # Fused mode: resolved intel payloads per kind ("news", "reddit")
+    intel_raw: Dict # Fused mode: unfiltered search results awaiting relevance
+    triage: str # "insufficient" | "decisive" | "out_of_time" | "full", set by triage_node
+    partial: bool # Scored after the request deadline, some signals never arrived
+    degraded: bool # Scored without a signal whose provider call failed (e.g. circuit open)
+
+MIN_JD_CHARS = 200 # Less scraped text than this can't be verified
+VERIFIED_THRESHOLD = 70 # Scores above this are "Verified"
+GHOST_PROBABILITY_THRESHOLD = 80 # AI ghost_probability (0-100) at or above this is a red flag
+SKIP_TO_SCORE = ("insufficient", "decisive", "out_of_time") # Triage outcomes that skip the paid nodes
 
 # --- Nodes ---
 
-def search_node(state: AgentState):
+def _company_and_title(state: AgentState):
     """
-    Search for Company Health (Layoffs) AND Reddit Sentiment.
+    Company Name and Job Title from metadata (LLM extraction might be a string, so we need safe parsing).
     """
-    # 1. Try to find Company Name from metadata (LLM extraction might be a string, so we need safe parsing)
-    # Ideally, scraper returns a dict. If it returned raw LLM string, we might need to parse it here.
-    # For now, assume metadata has a 'company' key OR we try to fetch it.
-    
     # 1. Try to find Company Name from metadata
     company_name = state.get("metadata", {}).get("company", "Unknown Company")
     
@@ -43,12 +58,22 @@ def search_node(state: AgentState):
 
     # Extract Job Title if available
     job_title = state.get("metadata", {}).get("title", "")
+    return company_name, job_title
+
+@observe_node("search")
+async def search_node(state: AgentState):
+    """
+    Search for Company Health (Layoffs) AND Reddit Sentiment.
+    """
+    company_name, job_title = _company_and_title(state)
 
     print(f"🔎 Searching intelligence for: {company_name} - {job_title}")
     
-    # Parallelize these in production
-    news_result = search_company_health(company_name, job_title)
-    reddit_result = search_reddit_sentiment(company_name, job_title)
+    # Both searches are independent, run them side by side
+    news_result, reddit_result = await asyncio.gather(
+        search_company_health(company_name, job_title),
+        search_reddit_sentiment(company_name, job_title),
+    )
     
     return {
         "health_data": news_result.get("summary", ""), 
@@ -57,16 +82,18 @@ def search_node(state: AgentState):
         "reddit_links": reddit_result.get("links", [])
     }
 
-def analyze_node(state: AgentState):
+@observe_node("analyze")
+async def analyze_node(state: AgentState):
     """
     Analyze JD Text for Ghost Job patterns.
     """
     # Prefer scraped text if available, else standard metadata
     jd_text = state["metadata"].get("scraped_text") or str(state["metadata"])
     
-    analysis_result = analyze_job_description(jd_text)
+    analysis_result = await analyze_job_description(jd_text)
     return {"analysis": analysis_result}
 
+@observe_node("temporal")
 def temporal_audit_node(state: AgentState):
     """
     Check if the job is stale.
@@ -84,51 +111,84 @@ def temporal_audit_node(state: AgentState):
     
     return {"temporal_analysis": audit_result}
 
-def score_node(state: AgentState):
+def _signal_penalties(state: AgentState) -> List[Tuple[int, str]]:
     """
-    Compute final Ghost Score based on all signals.
+    (penalty, reason) for every red flag in the state. Signals that haven't run yet
+    (empty analysis or intel) add nothing, so on partial state this is a lower bound.
     """
-    score = 100 # Start perfect
-    reasons = []
+    penalties = []
 
-    # 0. Sanity Check: Is there enough data?
-    scraped_text = state["metadata"].get("scraped_text", "")
-    if not scraped_text or len(scraped_text) < 200:
-        return {
-            "final_score": 0,
-            "final_reasoning": "ERROR: Insufficient job data extracted. Verification incomplete."
-        }
-    
     # 1. JD Quality Check (AI-generated / Generic content)
     from tools import analyze_jd_quality
-    jd_analysis = analyze_jd_quality(scraped_text)
+    jd_analysis = analyze_jd_quality(state["metadata"].get("scraped_text", ""))
     if jd_analysis["is_suspicious"]:
-        penalty = 100 - jd_analysis["quality_score"]
-        score -= penalty
         red_flag_summary = ", ".join(jd_analysis["red_flags"][:2])  # Show top 2
-        reasons.append(f"JD Quality Issues: {red_flag_summary}")
+        penalties.append((100 - jd_analysis["quality_score"], f"JD Quality Issues: {red_flag_summary}"))
     
     # 2. Health Check
-    if "layoff" in state["health_data"].lower():
-        score -= 30
-        reasons.append("Company has recent layoff news.")
+    if "layoff" in state.get("health_data", "").lower():
+        penalties.append((30, "Company has recent layoff news."))
         
     # 3. Reddit Check
-    if "scam" in state["reddit_data"].lower() or "ghosting" in state["reddit_data"].lower():
-        score -= 25
-        reasons.append("Negative sentiment/scam reports found on Reddit.")
+    reddit_data = state.get("reddit_data", "").lower()
+    if "scam" in reddit_data or "ghosting" in reddit_data:
+        penalties.append((25, "Negative sentiment/scam reports found on Reddit."))
 
     # 4. JD Analysis
-    # Parse the LLM output (it might be a raw string)
-    analysis_raw = state["analysis"].get("raw_analysis", "").lower()
-    if "high probability" in analysis_raw or '"ghost_probability": 8' in analysis_raw or '"ghost_probability": 9' in analysis_raw:
-        score -= 40
-        reasons.append("Job Description matches 'Ghost Job' template patterns.")
+    # Fused analysis carries the integer; the legacy analysis is raw LLM text
+    analysis = state.get("analysis") or {}
+    probability = analysis.get("ghost_probability")
+    if isinstance(probability, (int, float)) and not isinstance(probability, bool):
+        ghost_like = probability >= GHOST_PROBABILITY_THRESHOLD
+    else:
+        analysis_raw = analysis.get("raw_analysis", "").lower()
+        ghost_like = "high probability" in analysis_raw or '"ghost_probability": 8' in analysis_raw or '"ghost_probability": 9' in analysis_raw
+    if ghost_like:
+        penalties.append((40, "Job Description matches 'Ghost Job' template patterns."))
 
     # 5. Temporal
-    if "WARNING" in state["temporal_analysis"]:
-        score -= 50
-        reasons.append("Job listing is stale (detected previous year dates).")
+    if "WARNING" in state.get("temporal_analysis", ""):
+        penalties.append((50, "Job listing is stale (detected previous year dates)."))
+
+    return penalties
+
+def _unavailable_signals(state: AgentState) -> List[str]:
+    """
+    Signals whose provider call failed (error summary or error analysis), e.g. while its circuit is open.
+    """
+    unavailable = []
+    if state.get("health_data", "").startswith("Error"):
+        unavailable.append("company news")
+    if state.get("reddit_data", "").startswith("Error"):
+        unavailable.append("Reddit")
+    if "error" in (state.get("analysis") or {}):
+        unavailable.append("AI JD analysis")
+    return unavailable
+
+@observe_node("score")
+def score_node(state: AgentState):
+    """
+    Compute final Ghost Score based on all signals.
+    """
+    # 0. Sanity Check: Is there enough data?
+    scraped_text = state["metadata"].get("scraped_text", "")
+    if not scraped_text or len(scraped_text) < MIN_JD_CHARS:
+        return {
+            "final_score": 0,
+            "final_reasoning": "ERROR: Insufficient job data extracted. Verification incomplete."
+        }
+    
+    penalties = _signal_penalties(state)
+    score = 100 - sum(penalty for penalty, _ in penalties) # Start perfect
+    reasons = [reason for _, reason in penalties]
+    if state.get("triage") == "decisive":
+        reasons.append("Deep checks skipped: local signals already rule out a verified listing.")
+    unavailable = _unavailable_signals(state)
+    if unavailable:
+        reasons.append(f"Degraded check: {', '.join(unavailable)} unavailable, scored on the remaining signals.")
+    partial = deadline.expired()
+    if partial:
+        reasons.append("Partial result: the time budget ran out before every check finished.")
     
     # Cap score
     score = max(0, score)
@@ -139,21 +199,211 @@ def score_node(state: AgentState):
         
     return {
         "final_score": score,
-        "final_reasoning": "; ".join(reasons) if reasons else "Job appears legitimate based on available signals."
+        "final_reasoning": "; ".join(reasons) if reasons else "Job appears legitimate based on available signals.",
+        "partial": partial,
+        "degraded": bool(unavailable),
+    }
+
+async def _stored_intel(company_name: str, kinds=("news", "reddit")) -> Dict[str, Dict]:
+    """
+    Intel already in the company store (no search, no LLM).
+    """
+    if normalize_company_name(company_name) is None:
+        return {}
+    cached = await asyncio.gather(*[asyncio.to_thread(company_intel.get, company_name, kind) for kind in kinds])
+    return {kind: payload for kind, payload in zip(kinds, cached) if payload is not None}
+
+@observe_node("triage")
+async def triage_node(state: AgentState):
+    """
+    Free checks before any paid call: too little text ends the run, and when the JD quality,
+    temporal audit and stored intel already cap the score at VERIFIED_THRESHOLD the
+    search and LLM branches are skipped (they can only lower the score further).
+    Same when the request deadline already passed (usually spent on scraping).
+    """
+    scraped_text = state["metadata"].get("scraped_text", "")
+    if not scraped_text or len(scraped_text) < MIN_JD_CHARS:
+        print("⛔ Not enough job text, skipping search and analysis.")
+        return {"triage": "insufficient"}
+
+    company_name, _ = _company_and_title(state)
+    intel = await _stored_intel(company_name)
+    news_result, reddit_result = intel.get("news", {}), intel.get("reddit", {})
+    local = {
+        **temporal_audit_node(state),
+        "health_data": news_result.get("summary", ""), 
+        "health_links": news_result.get("links", []),
+        "reddit_data": reddit_result.get("summary", ""),
+        "reddit_links": reddit_result.get("links", []),
+    }
+    if deadline.expired():
+        print("⏱️ Time budget spent before analysis, scoring from local signals.")
+        return {"triage": "out_of_time", "analysis": {}, **local}
+
+    best_case = 100 - sum(penalty for penalty, _ in _signal_penalties({**state, **local, "analysis": {}}))
+    if best_case > VERIFIED_THRESHOLD:
+        return {"triage": "full"}
+
+    print(f"⚡ Local signals cap the score at {best_case}, skipping search and analysis.")
+    return {"triage": "decisive", "analysis": {}, **local}
+
+def _route_after_triage(first_nodes: List[str]):
+    def route(state: AgentState) -> List[str]:
+        return ["score"] if state.get("triage") in SKIP_TO_SCORE else first_nodes
+    return route
+
+# --- Fused-mode nodes (FUSED_LLM_ANALYSIS=1) ---
+# intel -> analyze (one fused LLM call) -> search + temporal -> score
+
+PLACEHOLDER_VALUES = {"", "unknown", "unknown company", "unknown_entity", "unknown_role"}
+
+async def _collect_intel(company_name: str, job_title: str, kinds=("news", "reddit")):
+    """
+    Fresh stored intel per kind, plus raw (unfiltered) search results for the kinds not stored.
+    A kind whose search failed gets an error payload instead.
+    """
+    if not tools.tavily_api_key:
+        error = {"summary": "Error: TAVILY_API_KEY not found.", "links": []}
+        return {kind: error for kind in kinds}, {}
+    intel = await _stored_intel(company_name, kinds)
+    missing = [kind for kind in kinds if kind not in intel]
+    results = await asyncio.gather(
+        *[search_raw_intel(kind, company_name, job_title) for kind in missing], return_exceptions=True
+    )
+    raw = {}
+    for kind, result in zip(missing, results):
+        if isinstance(result, Exception): # e.g. CircuitOpen: degrade this signal, don't store it
+            intel[kind] = {"summary": f"Error performing search: {result}", "links": []}
+        else:
+            raw[kind] = result
+    return intel, raw
+
+async def _resolve_intel(company_name: str, filtered: Dict[str, List[Dict]]) -> Dict[str, Dict]:
+    """
+    Summarizes filtered results per kind and saves them to the company store.
+    """
+    payloads = {kind: INTEL_SUMMARIZERS[kind](results) for kind, results in filtered.items()}
+    await asyncio.gather(*[
+        asyncio.to_thread(company_intel.put, company_name, kind, payload) for kind, payload in payloads.items()
+    ])
+    return payloads
+
+@observe_node("intel")
+async def intel_node(state: AgentState):
+    """
+    Fused mode: gather company intel up front when the company is already known,
+    so the fused call can also judge source relevance.
+    """
+    company_name, job_title = _company_and_title(state)
+    if normalize_company_name(company_name) is None:
+        return {"intel": {}, "intel_raw": {}}
+    print(f"🔎 Gathering intelligence for: {company_name} - {job_title}")
+    intel, raw = await _collect_intel(company_name, job_title)
+    return {"intel": intel, "intel_raw": raw}
+
+@observe_node("analyze")
+async def fused_analyze_node(state: AgentState):
+    """
+    Fused mode: metadata, ghost analysis and source relevance from one LLM call.
+    Falls back to the multi-call path if the fused call fails.
+    """
+    metadata = state["metadata"]
+    jd_text = metadata.get("scraped_text") or str(metadata)
+    company_name, job_title = _company_and_title(state)
+    known_company = normalize_company_name(company_name) is not None
+    raw = state.get("intel_raw") or {}
+
+    fused = await fused_job_analysis(jd_text, state["url"], raw, company_hint=company_name if known_company else "")
+    if fused is not None:
+        extraction = fused.model_dump(include={"title", "company", "location", "posted_date", "source"})
+        verdict = fused.model_dump(include={"ghost_probability", "main_concerns", "is_template"})
+        analysis = {"raw_analysis": json.dumps(verdict), **verdict}
+        filtered = pick_relevant(raw, fused)
+    else:
+        extraction, analysis, *filtered_lists = await asyncio.gather(
+            extract_metadata_from_text(jd_text, state["url"]) if not known_company else asyncio.sleep(0, {}),
+            analyze_job_description(jd_text),
+            *[filter_irrelevant_sources(results, company_name, job_title) for results in raw.values()],
+        )
+        filtered = dict(zip(raw.keys(), filtered_lists))
+
+    # Keep what the scraper already found, fill the gaps from the LLM
+    merged = dict(metadata)
+    for key, value in (extraction or {}).items():
+        if value and str(merged.get(key, "")).strip().lower() in PLACEHOLDER_VALUES:
+            merged[key] = value
+
+    intel = {**(state.get("intel") or {}), **await _resolve_intel(company_name, filtered)}
+    return {"metadata": merged, "analysis": analysis, "intel": intel}
+
+@observe_node("search")
+async def fused_search_node(state: AgentState):
+    """
+    Fused mode: finish any intel the fused call couldn't cover (company was unknown before it),
+    using one combined relevance call for both result lists.
+    """
+    intel = dict(state.get("intel") or {})
+    missing = [kind for kind in ("news", "reddit") if kind not in intel]
+    if missing:
+        company_name, job_title = _company_and_title(state)
+        print(f"🔎 Searching intelligence for: {company_name} - {job_title}")
+        cached, raw = await _collect_intel(company_name, job_title, missing)
+        filtered = await filter_sources_combined(raw, company_name, job_title)
+        intel.update(cached)
+        intel.update(await _resolve_intel(company_name, filtered))
+
+    news_result, reddit_result = intel.get("news", {}), intel.get("reddit", {})
+    return {
+        "health_data": news_result.get("summary", ""), 
+        "health_links": news_result.get("links", []),
+        "reddit_data": reddit_result.get("summary", ""),
+        "reddit_links": reddit_result.get("links", [])
     }
 
 # --- Graph ---
+# triage decides for free whether the paid branches are needed at all. If so,
+# search, analyze and temporal only read the initial state and write disjoint keys,
+# so they fan out as parallel branches and join at score.
 workflow = StateGraph(AgentState)
 
+workflow.add_node("triage", triage_node)
 workflow.add_node("search", search_node)
 workflow.add_node("analyze", analyze_node)
 workflow.add_node("temporal", temporal_audit_node)
 workflow.add_node("score", score_node)
 
-workflow.set_entry_point("search")
-workflow.add_edge("search", "analyze")
-workflow.add_edge("analyze", "temporal")
-workflow.add_edge("temporal", "score")
+workflow.add_edge(START, "triage")
+workflow.add_conditional_edges(
+    "triage", _route_after_triage(["search", "analyze", "temporal"]), ["search", "analyze", "temporal", "score"]
+)
+workflow.add_edge(["search", "analyze", "temporal"], "score")
 workflow.add_edge("score", END)
 
 agent_graph = workflow.compile()
+
+# Fused variant: the single LLM call needs the company's raw intel first, and
+# temporal needs the posting date the fused call extracts.
+fused_workflow = StateGraph(AgentState)
+
+fused_workflow.add_node("triage", triage_node)
+fused_workflow.add_node("intel", intel_node)
+fused_workflow.add_node("analyze", fused_analyze_node)
+fused_workflow.add_node("search", fused_search_node)
+fused_workflow.add_node("temporal", temporal_audit_node)
+fused_workflow.add_node("score", score_node)
+
+fused_workflow.add_edge(START, "triage")
+fused_workflow.add_conditional_edges("triage", _route_after_triage(["intel"]), ["intel", "score"])
+fused_workflow.add_edge("intel", "analyze")
+fused_workflow.add_edge("analyze", "search")
+fused_workflow.add_edge("analyze", "temporal")
+fused_workflow.add_edge(["search", "temporal"], "score")
+fused_workflow.add_edge("score", END)
+
+fused_agent_graph = fused_workflow.compile()
+
+def get_agent_graph():
+    """
+    The fused single-call graph when FUSED_LLM_ANALYSIS=1, else the multi-call graph.
+    """
+    return fused_agent_graph if tools.FUSED_LLM_ANALYSIS else agent_graph
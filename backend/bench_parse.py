@@ -0,0 +1,82 @@
+"""
+Micro-benchmark of the HTML parsing paths used by the scrapers, over saved job-board pages.
+Compares full BeautifulSoup parses against the targeted (strained) Naukri parse and
+the page_text backends, and checks that every path extracts the same data.
+
+Every page must hold a Naukri JD (description container, title, company, JSON-LD):
+comparing two empty parses proves nothing, so a page the parser finds nothing in is an error.
+
+Usage:
+    python bench_parse.py [--runs 50] [files ...]   (defaults to bench_naukri_job.html)
+"""
+import argparse
+import os
+import statistics
+import time
+
+from bs4 import BeautifulSoup
+
+import html_parse
+from scraper import scrape_naukri_specific
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# A Naukri job page: the real page shell and script bundles from debug_curl.html around a full JD
+DEFAULT_FIXTURES = ["bench_naukri_job.html"]
+
+
+def _time(fn, runs: int) -> float:
+    """
+    Median milliseconds per call.
+    """
+    fn() # Warm-up
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def _full_soup_text(html: str, parser: str) -> str:
+    soup = BeautifulSoup(html, parser)
+    for tag in soup(html_parse.BOILERPLATE_TAGS):
+        tag.decompose()
+    return soup.get_text(separator=" ", strip=True)
+
+
+def cases(html: str):
+    parsers = ["html.parser"] + (["lxml"] if html_parse.LXML_AVAILABLE else [])
+    for parser in parsers:
+        yield f"naukri full [{parser}]", lambda p=parser: scrape_naukri_specific(BeautifulSoup(html, p))
+        yield f"naukri strained [{parser}]", lambda p=parser: scrape_naukri_specific(
+            BeautifulSoup(html, p, parse_only=html_parse.NAUKRI_STRAINER))
+        yield f"text full soup [{parser}]", lambda p=parser: _full_soup_text(html, p)
+    backend = "selectolax" if html_parse.SELECTOLAX_AVAILABLE else html_parse.HTML_PARSER
+    yield f"page_text [{backend}]", lambda: html_parse.page_text(html)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("files", nargs="*", default=DEFAULT_FIXTURES)
+    args = parser.parse_args()
+
+    print(f"⚙️ Default parser: {html_parse.HTML_PARSER} (lxml: {html_parse.LXML_AVAILABLE}, selectolax: {html_parse.SELECTOLAX_AVAILABLE})")
+    for name in args.files:
+        path = name if os.path.isabs(name) else os.path.join(HERE, name)
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+
+        reference = scrape_naukri_specific(BeautifulSoup(html, "html.parser"))
+        if not reference:
+            raise SystemExit(f"❌ {name}: the Naukri parser found no JD, nothing to compare")
+        strained = scrape_naukri_specific(html_parse.naukri_soup(html))
+        match = "✅ same" if strained == reference else "❌ differs"
+
+        print(f"\n📄 {name} ({len(html) / 1024:.1f} KiB) - strained Naukri output vs full parse: {match}")
+        for label, fn in cases(html):
+            print(f"   {_time(fn, args.runs):8.2f} ms  {label}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""
+Offline replay benchmark: runs the real verification pipeline against local stand-ins
+for Tavily, Groq and a job board that replay recorded responses (replay_fixtures.json)
+at a configurable latency, then reports p50/p95/p99 latency and throughput per stage.
+
+Nothing is mocked inside the app: the provider clients are pointed at the stand-in
+server through TAVILY_API_BASE_URL and GROQ_API_BASE, and graph nodes are timed with
+a LangChain callback, so the numbers include our own scheduling, parsing and caching.
+
+Usage:
+    python bench_replay.py [--requests 100] [--concurrency 10] [--mode verifier|app|both]
+                           [--tavily-latency 0.8] [--groq-latency 1.2] [--board-latency 0.3]
+                           [--jitter 0.2] [--companies N] [--fused] [--json report.json]
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import re
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_PATH = os.path.join(HERE, "replay_fixtures.json")
+
+
+# --- Stand-in providers ---
+
+class StandIns:
+    """
+    One local server playing Tavily (POST /search), Groq (POST /openai/v1/chat/completions)
+    and a job board (GET /jobs/{n}). Responses come from the fixtures with {company},
+    {slug}, {today} and {url} filled in for the company the request is about.
+    """
+
+    def __init__(self, fixtures: Dict, companies: List[str], latency: Dict[str, float], jitter: float, seed: int = 7):
+        self.fixtures = fixtures
+        self.companies_by_index = list(companies) # Job page n belongs to companies[n % len]
+        # Longest names first so one company name never shadows another
+        self.companies = sorted(companies, key=len, reverse=True)
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.calls = defaultdict(int)
+        self.today = datetime.date.today().isoformat()
+
+    def company_in(self, text: str) -> str:
+        return next((c for c in self.companies if c in text), self.companies[-1])
+
+    def fill(self, template: str, company: str, url: str = "") -> str:
+        slug = re.sub(r"\W+", "-", company.lower()).strip("-")
+        for key, value in (("{company}", company), ("{slug}", slug), ("{today}", self.today), ("{url}", url)):
+            template = template.replace(key, value)
+        return template
+
+    async def wait(self, provider: str):
+        self.calls[provider] += 1
+        base = self.latency[provider]
+        await asyncio.sleep(max(0.0, base * (1 + self.random.uniform(-self.jitter, self.jitter))))
+
+    def tavily_response(self, query: str) -> Dict:
+        if query.startswith("site:reddit.com") and "received interview" not in query:
+            kind = "reddit"
+        elif "layoffs" in query:
+            kind = "news"
+        elif query.startswith("http"):
+            kind = "page"
+        else:
+            kind = "signals"
+        company = self.company_in(query)
+        return json.loads(self.fill(json.dumps(self.fixtures["tavily"][kind]), company, query))
+
+    def groq_response(self, body: Dict) -> Dict:
+        messages = body.get("messages", [])
+        system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+        prompt = " ".join(str(m.get("content", "")) for m in messages)
+        company = self.company_in(prompt)
+        message = {"role": "assistant", "content": ""}
+
+        tools = body.get("tools") or []
+        if tools:
+            name = tools[0]["function"]["name"]
+            arguments = self.fill(json.dumps(self.fixtures["groq_tools"][name]), company)
+            message["tool_calls"] = [{"id": "call_replay", "type": "function", "function": {"name": name, "arguments": arguments}}]
+        elif "relevance filter" in system:
+            message["content"] = self.fixtures["groq"]["filter"]
+        elif "data extraction" in system:
+            message["content"] = self.fill(self.fixtures["groq"]["extract"], company)
+        else:
+            message["content"] = self.fill(self.fixtures["groq"]["analyze"], company)
+
+        return {
+            "id": "chatcmpl-replay",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "replay"),
+            "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if tools else "stop"}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": 64, "total_tokens": len(prompt) // 4 + 64},
+        }
+
+    def app(self):
+        from fastapi import FastAPI, Request
+        from fastapi.responses import HTMLResponse
+
+        app = FastAPI()
+
+        @app.post("/search")
+        async def search(request: Request):
+            body = await request.json()
+            await self.wait("tavily")
+            return self.tavily_response(body.get("query", ""))
+
+        @app.post("/openai/v1/chat/completions")
+        async def chat(request: Request):
+            body = await request.json()
+            await self.wait("groq")
+            return self.groq_response(body)
+
+        @app.get("/jobs/{n}")
+        async def job_page(n: int):
+            await self.wait("board")
+            company = self.companies_by_index[n % len(self.companies_by_index)]
+            return HTMLResponse(self.fill(self.fixtures["job_page"], company))
+
+        return app
+
+    def serve(self, port: int):
+        """
+        Runs the stand-in server on a background thread; returns once it accepts connections.
+        """
+        import uvicorn
+        server = uvicorn.Server(uvicorn.Config(self.app(), host="127.0.0.1", port=port, log_level="warning"))
+        threading.Thread(target=server.run, daemon=True).start()
+        deadline = time.time() + 10
+        while not server.started:
+            if time.time() > deadline:
+                raise TimeoutError("Stand-in server did not start")
+            time.sleep(0.02)
+        return server
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# --- Measurements ---
+
+class Samples:
+    """
+    Latency samples per stage (graph nodes, metadata preparation, end to end).
+    """
+
+    def __init__(self):
+        self.by_stage: Dict[str, List[float]] = defaultdict(list)
+
+    def add(self, stage: str, seconds: float):
+        self.by_stage[stage].append(seconds)
+
+    def report(self, wall_seconds: float) -> Dict[str, Dict]:
+        report = {}
+        for stage, values in sorted(self.by_stage.items()):
+            ordered = sorted(values)
+            q = statistics.quantiles(ordered, n=100, method="inclusive") if len(ordered) > 1 else ordered * 99
+            report[stage] = {
+                "count": len(ordered),
+                "p50_ms": round(q[49] * 1000, 1),
+                "p95_ms": round(q[94] * 1000, 1),
+                "p99_ms": round(q[98] * 1000, 1),
+                "mean_ms": round(statistics.fmean(ordered) * 1000, 1),
+                "throughput_per_s": round(len(ordered) / wall_seconds, 2) if wall_seconds else 0.0,
+            }
+        return report
+
+
+def node_timer(samples: Samples):
+    """
+    LangChain callback that times every LangGraph node run in its context.
+    """
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class NodeTimer(BaseCallbackHandler):
+        def __init__(self):
+            self.started = {}
+
+        def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, name=None, **kwargs):
+            node = (metadata or {}).get("langgraph_node")
+            if node and name == node: # The node itself, not the chains it calls
+                self.started[run_id] = (node, time.perf_counter())
+
+        def on_chain_end(self, outputs, *, run_id, **kwargs):
+            if run_id in self.started:
+                node, started = self.started.pop(run_id)
+                samples.add(f"node:{node}", time.perf_counter() - started)
+
+        def on_chain_error(self, error, *, run_id, **kwargs):
+            self.started.pop(run_id, None)
+
+    return NodeTimer()
+
+
+def configure_environment(base_url: str, fused: bool):
+    """
+    Points the app's provider clients at the stand-ins. Must run before the app modules are imported.
+    """
+    state_dir = tempfile.mkdtemp(prefix="verijob-replay-")
+    os.environ.update({
+        "TAVILY_API_KEY": "replay",
+        "GROQ_API_KEY": "replay",
+        "TAVILY_API_BASE_URL": base_url,
+        "GROQ_API_BASE": base_url,
+        "COMPANY_INTEL_DB": os.path.join(state_dir, "company_intel.db"),
+        "LLM_CACHE_DB": os.path.join(state_dir, "llm_cache.db"),
+        "VERIFICATION_DB": os.path.join(state_dir, "verifications.db"),
+        "FUSED_LLM_ANALYSIS": "1" if fused else "0",
+        "GROQ_RPM": os.getenv("GROQ_RPM", "100000"), # Measure the code path, not the real quotas
+        "TAVILY_RPM": os.getenv("TAVILY_RPM", "100000"),
+        "GROQ_BURST": os.getenv("GROQ_BURST", "1000"),
+        "TAVILY_BURST": os.getenv("TAVILY_BURST", "1000"),
+    })
+
+
+async def run_load(label: str, call, urls: List[str], concurrency: int, samples: Samples) -> float:
+    """
+    Drives `call(url)` over every URL with at most `concurrency` in flight. Returns wall seconds.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    errors = 0
+
+    async def one(url: str):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            result = await call(url)
+            samples.add(label, time.perf_counter() - started)
+            if result.get("status") == "Error":
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(url) for url in urls])
+    wall = time.perf_counter() - started
+    if errors:
+        print(f"⚠️ {label}: {errors}/{len(urls)} requests returned an error")
+    return wall
+
+
+async def bench(args, base_url: str, stand_ins: StandIns) -> Dict:
+    # App modules read provider settings at import time, so import them only now
+    sys.path.insert(0, HERE)
+    from langchain_core.tracers.context import register_configure_hook
+    import verifier
+    from cache import verification_cache
+
+    samples = Samples()
+    timer_var: ContextVar = ContextVar("replay_node_timer", default=None)
+    register_configure_hook(timer_var, inheritable=True)
+    timer_var.set(node_timer(samples))
+
+    prepare_metadata = verifier.prepare_metadata
+
+    async def timed_prepare(url, content=None):
+        started = time.perf_counter()
+        try:
+            return await prepare_metadata(url, content)
+        finally:
+            samples.add("metadata", time.perf_counter() - started)
+
+    verifier.prepare_metadata = timed_prepare # Instrumentation only, the real function still runs
+
+    report = {"config": {k: v for k, v in vars(args).items() if k != "json"}, "runs": {}}
+    modes = ["verifier", "app"] if args.mode == "both" else [args.mode]
+    for run, mode in enumerate(modes):
+        verification_cache.clear()
+        # Distinct job URLs per run so every request is a cold verification
+        urls = [f"{base_url}/jobs/{run * args.requests + i}" for i in range(args.requests)]
+        calls_before = dict(stand_ins.calls)
+        samples.by_stage.clear()
+
+        if mode == "verifier":
+            wall = await run_load("end_to_end", verifier.verify_job_listing, urls, args.concurrency, samples)
+        else:
+            import httpx
+            from main import app
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://app", timeout=120) as client:
+                async def post(url):
+                    response = await client.post("/verify", json={"url": url})
+                    return response.json()
+                wall = await run_load("end_to_end", post, urls, args.concurrency, samples)
+
+        report["runs"][mode] = {
+            "wall_seconds": round(wall, 3),
+            "requests_per_s": round(args.requests / wall, 2),
+            "provider_calls": {k: v - calls_before.get(k, 0) for k, v in stand_ins.calls.items()},
+            "stages": samples.report(wall),
+        }
+    return report
+
+
+def print_report(report: Dict):
+    for mode, run in report["runs"].items():
+        print(f"\n📊 {mode}: {run['requests_per_s']} req/s over {run['wall_seconds']}s, provider calls {run['provider_calls']}")
+        print(f"   {'stage':<16}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'per s':>9}")
+        for stage, s in run["stages"].items():
+            print(f"   {stage:<16}{s['count']:>7}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}{s['throughput_per_s']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--mode", choices=["verifier", "app", "both"], default="both")
+    parser.add_argument("--tavily-latency", type=float, default=0.8, help="seconds per Tavily search")
+    parser.add_argument("--groq-latency", type=float, default=1.2, help="seconds per Groq completion")
+    parser.add_argument("--board-latency", type=float, default=0.3, help="seconds per job page")
+    parser.add_argument("--jitter", type=float, default=0.2, help="+/- fraction applied to every latency")
+    parser.add_argument("--companies", type=int, default=None,
+                        help="distinct employers (default: one per request, so company intel is never reused)")
+    parser.add_argument("--fused", action="store_true", help="benchmark the FUSED_LLM_ANALYSIS graph")
+    parser.add_argument("--fixtures", default=FIXTURES_PATH)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    with open(args.fixtures, encoding="utf-8") as f:
+        fixtures = json.load(f)
+    total = args.requests * (2 if args.mode == "both" else 1)
+    count = args.companies or total
+    companies = [f"Replay Labs {k:04d}" for k in range(count)]
+    stand_ins = StandIns(
+        fixtures, companies,
+        latency={"tavily": args.tavily_latency, "groq": args.groq_latency, "board": args.board_latency},
+        jitter=args.jitter,
+    )
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = stand_ins.serve(port)
+    configure_environment(base_url, args.fused)
+    try:
+        report = asyncio.run(bench(args, base_url, stand_ins))
+    finally:
+        server.should_exit = True
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
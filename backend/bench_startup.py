@@ -0,0 +1,110 @@
+"""
+Measures cold import time of the app and boot time until /healthz answers,
+and checks them against a budget. Exits non-zero when over budget so CI can track it.
+
+Usage:
+    python bench_startup.py [--runs 3]
+
+Budgets (seconds) come from IMPORT_BUDGET_SECONDS and BOOT_BUDGET_SECONDS.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "2.0"))
+BOOT_BUDGET_SECONDS = float(os.getenv("BOOT_BUDGET_SECONDS", "4.0"))
+
+
+def measure_import() -> float:
+    """
+    Wall time for a fresh interpreter to `import main`.
+    """
+    code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(limit: int = 10):
+    """
+    Top modules by cumulative import time, from `python -X importtime`.
+    """
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                         cwd=HERE, capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative) / 1e6, name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_boot(timeout: float = 60.0) -> dict:
+    """
+    Time from spawning uvicorn until /healthz returns 200, plus readiness reported by /readyz.
+    """
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/healthz", timeout=0.5).status_code == 200:
+                    boot = time.perf_counter() - started
+                    readyz = httpx.get(f"http://127.0.0.1:{port}/readyz", timeout=2).json()
+                    return {"boot_seconds": boot, "readyz": readyz}
+            except httpx.TransportError:
+                pass
+            time.sleep(0.05)
+        raise TimeoutError(f"Server did not answer /healthz within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    import_times = [measure_import() for _ in range(args.runs)]
+    boot_times = [measure_boot()["boot_seconds"] for _ in range(args.runs)]
+    import_p50 = statistics.median(import_times)
+    boot_p50 = statistics.median(boot_times)
+
+    print("⏱️ Slowest imports (cumulative s):")
+    for seconds, name in slowest_imports():
+        print(f"   {seconds:6.3f}  {name}")
+
+    report = {
+        "import_seconds_p50": round(import_p50, 3),
+        "import_budget": IMPORT_BUDGET_SECONDS,
+        "boot_seconds_p50": round(boot_p50, 3),
+        "boot_budget": BOOT_BUDGET_SECONDS,
+    }
+    print(json.dumps(report, indent=2))
+
+    over = import_p50 > IMPORT_BUDGET_SECONDS or boot_p50 > BOOT_BUDGET_SECONDS
+    print("❌ Over startup budget." if over else "✅ Within startup budget.")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
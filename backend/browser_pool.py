@@ -0,0 +1,180 @@
+import asyncio
+import glob
+import os
+import sys
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "3"))
+BROWSER_PAGE_MAX_USES = int(os.getenv("BROWSER_PAGE_MAX_USES", "20"))
+BROWSER_ACQUIRE_TIMEOUT = float(os.getenv("BROWSER_ACQUIRE_TIMEOUT", "10"))
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+LAUNCH_ARGS = ['--disable-blink-features=AutomationControlled', '--no-sandbox']
+
+
+def playwright_browsers_dir() -> str:
+    """
+    Where `playwright install` puts browsers on this platform.
+    """
+    custom = os.getenv("PLAYWRIGHT_BROWSERS_PATH")
+    if custom and custom != "0":
+        return custom
+    home = os.path.expanduser("~")
+    if sys.platform == "win32":
+        return os.path.join(os.getenv("LOCALAPPDATA", os.path.join(home, "AppData", "Local")), "ms-playwright")
+    if sys.platform == "darwin":
+        return os.path.join(home, "Library", "Caches", "ms-playwright")
+    return os.path.join(os.getenv("XDG_CACHE_HOME", os.path.join(home, ".cache")), "ms-playwright")
+
+
+def chromium_installed() -> bool:
+    """
+    Cheap filesystem check for an installed Chromium build. Never launches or installs anything.
+    """
+    browsers_dir = playwright_browsers_dir()
+    return bool(glob.glob(os.path.join(browsers_dir, "chromium-*")) or
+                glob.glob(os.path.join(browsers_dir, "chromium_headless_shell-*")))
+
+
+async def install_chromium() -> bool:
+    """
+    Runs `playwright install chromium` as a subprocess without blocking the event loop.
+    """
+    try:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "playwright", "install", "chromium",
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await process.communicate()
+        if process.returncode != 0:
+            print(f"⚠️ Playwright install failed: {stderr.decode(errors='ignore')[-300:]}")
+        return process.returncode == 0
+    except Exception as e:
+        print(f"⚠️ Playwright install failed: {e}")
+        return False
+
+
+class BrowserPoolExhausted(Exception):
+    """
+    Raised when no page frees up within the acquire timeout.
+    """
+
+
+class _Slot:
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.uses = 0
+
+
+class BrowserPool:
+    """
+    One long-lived Chromium with a bounded pool of reusable context+page slots.
+    Slots are recycled after max_uses navigations or after any error on them.
+    Callers wait (up to acquire_timeout) when all slots are busy.
+    """
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE, max_uses: int = BROWSER_PAGE_MAX_USES,
+                 acquire_timeout: float = BROWSER_ACQUIRE_TIMEOUT):
+        self.size = size
+        self.max_uses = max_uses
+        self.acquire_timeout = acquire_timeout
+        self._playwright = None
+        self._browser = None
+        self._idle: List[_Slot] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self.in_use = 0
+        self.recycled = 0
+
+    def _ensure_primitives(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.size)
+            self._start_lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def start(self):
+        """
+        Launches the shared browser if it isn't running (also relaunches after a crash).
+        """
+        self._ensure_primitives()
+        async with self._start_lock:
+            if self.running:
+                return
+            await self._close_browser()
+            from playwright.async_api import async_playwright
+            print("🧭 Launching shared Chromium for the browser pool...")
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+
+    async def stop(self):
+        """
+        Closes every slot, the browser and the Playwright driver. Called on app shutdown.
+        """
+        await self._close_browser()
+
+    async def _close_browser(self):
+        for slot in self._idle:
+            await self._discard(slot)
+        self._idle.clear()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    async def _new_slot(self) -> _Slot:
+        context = await self._browser.new_context(user_agent=USER_AGENT)
+        page = await context.new_page()
+        return _Slot(context, page)
+
+    async def _discard(self, slot: _Slot):
+        self.recycled += 1
+        try:
+            await slot.context.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def page(self):
+        """
+        Yields a ready page from the pool, launching the browser on first use.
+        """
+        self._ensure_primitives()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise BrowserPoolExhausted(f"No browser page free after {self.acquire_timeout}s")
+
+        slot = None
+        healthy = False
+        self.in_use += 1
+        try:
+            if not self.running:
+                await self.start()
+            slot = self._idle.pop() if self._idle else await self._new_slot()
+            yield slot.page
+            healthy = True
+        finally:
+            self.in_use -= 1
+            if slot is not None:
+                slot.uses += 1
+                if healthy and slot.uses < self.max_uses and self.running:
+                    self._idle.append(slot)
+                else:
+                    await self._discard(slot)
+            self._semaphore.release()
+
+
+browser_pool = BrowserPool()
@@ -0,0 +1,178 @@
+import asyncio
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Tracking/referral params that never change which job a URL points at. Anything else is kept,
+# since boards put the job identity in all sorts of params (Greenhouse ?for=&token=, Glassdoor ?jl=).
+TRACKING_PARAMS = {
+    "trk", "trkinfo", "refid", "ref", "src", "source", "sid", "tracking_id", "trackingid",
+    "gh_src", "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "_ga", "lipi", "origin", "from", "spa",
+    # Search-result position and session params (Naukri xp/px/nignbevent_src, LinkedIn position/pageNum/eBP)
+    "xp", "px", "nignbevent_src", "position", "pagenum", "ebp", "originalsubdomain",
+}
+TRACKING_PREFIXES = ("utm", "trk_")
+
+
+def _is_tracking_param(key: str) -> bool:
+    key = key.lower()
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PREFIXES)
+
+
+def canonical_job_url(url: str) -> str:
+    """
+    Normalizes a job URL so tracking params, fragments and SPA variants map to one identity.
+    e.g. linkedin.com/jobs/search/?currentJobId=123&trk=x -> https://www.linkedin.com/jobs/view/123
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    path = parts.path.rstrip("/") or "/"
+    params = [(k, v) for k, v in parse_qsl(parts.query) if not _is_tracking_param(k)]
+
+    if "linkedin.com" in host:
+        host = "www.linkedin.com"
+        view_match = re.search(r"/jobs/view/(?:[^/]*?-)?(\d+)", path)
+        job_id = view_match.group(1) if view_match else next(
+            (v for k, v in params if k.lower() == "currentjobid"), None
+        )
+        if job_id:
+            return f"https://{host}/jobs/view/{job_id}"
+
+    query = urlencode(sorted(params))
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def content_hash(content: Optional[str]) -> str:
+    """
+    Whitespace-insensitive hash of page content, so SPA re-renders of the same JD hash equal.
+    """
+    if not content:
+        return ""
+    normalized = " ".join(content.split()).lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def job_cache_key(url: str, content: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Cache key for a verification: canonical job identity + content hash.
+    """
+    return canonical_job_url(url), content_hash(content)
+
+
+class TTLCache:
+    """
+    In-memory LRU cache with per-entry TTL and single-flight deduplication.
+    Concurrent get_or_compute calls for the same key share one computation.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 900.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """
+        Returns the cached value, joins an in-flight computation for the key, or starts one.
+        The computation runs as its own task so one cancelled caller doesn't cancel the others.
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            self.hits += 1
+            return value
+
+        inflight = self.in_flight(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        return await asyncio.shield(self.start(key, compute, should_cache))
+
+    def in_flight(self, key: Hashable) -> Optional[asyncio.Future]:
+        """
+        The running computation for `key`, if any (await it through asyncio.shield).
+        """
+        return self._inflight.get(key)
+
+    def start(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = lambda value: True,
+    ) -> asyncio.Task:
+        """
+        Counts a miss and starts the computation for `key` as a task others can join.
+        For callers that need more than the final value while it runs (e.g. progress events).
+        """
+        self.misses += 1
+
+        async def run():
+            try:
+                result = await compute()
+                if should_cache(result):
+                    self.set(key, result)
+                return result
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.ensure_future(run())
+        self._inflight[key] = task
+        return task
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "in_flight": len(self._inflight),
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
+
+
+verification_cache = TTLCache(
+    maxsize=int(os.getenv("VERIFY_CACHE_MAXSIZE", "512")),
+    ttl=float(os.getenv("VERIFY_CACHE_TTL", "900")),
+)
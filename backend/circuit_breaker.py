@@ -0,0 +1,158 @@
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+import httpx
+
+from metrics import registry, CallbackMetric
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "30"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpen(Exception):
+    """
+    Raised instead of calling a dependency whose breaker is open.
+    """
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} circuit open, retrying in {retry_in:.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+def is_outage(error: Exception) -> bool:
+    """
+    Errors that say the dependency itself is unhealthy: timeouts, connection errors and 5xx.
+    Rate limits (429) and other 4xx mean it answered, so they don't trip a breaker.
+    """
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if status:
+        return status >= 500
+    # SDK connection errors (groq/openai APIConnectionError) don't share a base with httpx's
+    return any(cls.__name__ == "APIConnectionError" for cls in type(error).__mro__)
+
+
+class CircuitBreaker:
+    """
+    Closed: calls go through, consecutive failures are counted.
+    Open (after failure_threshold in a row): calls are refused for reset_seconds.
+    Half-open: one probe call is let through; success closes the breaker, failure reopens it.
+    Registered breakers are exported per name in /metrics. Pass register=False for breakers
+    created per key at runtime (e.g. per domain), which would grow the label set without bound.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_seconds: float = BREAKER_RESET_SECONDS, register: bool = True):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opens = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._open = False
+        self._probing = False
+        if register:
+            _breakers.append(self)
+
+    @property
+    def state(self) -> str:
+        if not self._open:
+            return CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return HALF_OPEN
+        return OPEN
+
+    def retry_in(self) -> float:
+        return max(0.0, self._opened_at + self.reset_seconds - time.monotonic()) if self._open else 0.0
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go ahead now. In half-open this hands out the single probe,
+        so every allowed call must end in record_success, record_failure or release.
+        """
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        if self._open:
+            print(f"🟢 {self.name} recovered, circuit closed")
+        self.failures = 0
+        self._open = False
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probing or (not self._open and self.failures >= self.failure_threshold):
+            if not self._open:
+                self.opens += 1
+                print(f"🔴 {self.name} failing ({self.failures} in a row), circuit open for {self.reset_seconds:.0f}s")
+            self._open = True
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+    def release(self):
+        """
+        A call ended without a verdict (e.g. cancelled): give the probe back.
+        """
+        self._probing = False
+
+    @contextmanager
+    def call(self, is_failure: Callable[[Exception], bool] = is_outage):
+        """
+        Guards one call: raises CircuitOpen up front if refused, then records the outcome.
+        Exceptions that aren't failures (per is_failure) count as the dependency answering.
+        """
+        if not self.allow():
+            raise CircuitOpen(self.name, self.retry_in())
+        try:
+            yield
+        except Exception as e:
+            if is_failure(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        else:
+            self.record_success()
+
+    def stats(self) -> Dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opens": self.opens,
+            "rejected": self.rejected,
+            "retry_in": round(self.retry_in(), 1),
+        }
+
+
+_breakers: List[CircuitBreaker] = []
+
+registry.register(CallbackMetric(
+    "verijob_circuit_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)."
+)).add(lambda: [({"breaker": b.name}, STATE_VALUES[b.state]) for b in _breakers])
+registry.register(CallbackMetric(
+    "verijob_circuit_opens_total", "Times a circuit breaker opened.", "counter"
+)).add(lambda: [({"breaker": b.name}, b.opens) for b in _breakers])
+registry.register(CallbackMetric(
+    "verijob_circuit_rejected_total", "Calls refused by an open circuit breaker.", "counter"
+)).add(lambda: [({"breaker": b.name}, b.rejected) for b in _breakers])
@@ -0,0 +1,80 @@
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Optional, TypeVar
+
+# End-to-end latency budget for one verification (scrape, graph and every provider call)
+VERIFY_BUDGET_SECONDS = float(os.getenv("VERIFY_BUDGET_SECONDS", "25"))
+
+T = TypeVar("T")
+
+# Absolute time.monotonic() deadline of the current request, None outside a request
+_deadline: ContextVar[Optional[float]] = ContextVar("verijob_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """
+    The request's time budget ran out. Not a timeout of the dependency itself,
+    so breakers and rate limiters don't count it against the provider.
+    """
+
+    def __init__(self):
+        super().__init__("request time budget exhausted")
+
+
+@contextmanager
+def scope(seconds: float = VERIFY_BUDGET_SECONDS):
+    """
+    Runs the block (and tasks started in it) under a deadline `seconds` from now.
+    A tighter deadline already in effect is kept.
+    """
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(at, current))
+    try:
+        yield
+    finally:
+        try:
+            _deadline.reset(token)
+        except ValueError: # Async generator finalized from another context, nothing to restore there
+            pass
+
+
+def remaining() -> Optional[float]:
+    """
+    Seconds left in the current request's budget, or None without a deadline.
+    """
+    at = _deadline.get()
+    return None if at is None else max(0.0, at - time.monotonic())
+
+
+def expired() -> bool:
+    return remaining() == 0.0
+
+
+def budget(timeout: float) -> float:
+    """
+    `timeout`, shortened to what's left of the request budget.
+    """
+    left = remaining()
+    return timeout if left is None else min(timeout, left)
+
+
+async def wait_for(aw: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """
+    asyncio.wait_for, also bounded by the request deadline. Raises DeadlineExceeded
+    (instead of asyncio.TimeoutError) when the deadline is what ran out.
+    """
+    left = remaining()
+    if left is None or (timeout is not None and timeout <= left):
+        return await asyncio.wait_for(aw, timeout)
+    if left <= 0:
+        if asyncio.iscoroutine(aw):
+            aw.close() # Never started, don't leave a "never awaited" warning
+        raise DeadlineExceeded()
+    try:
+        return await asyncio.wait_for(aw, left)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded() from None
@@ -0,0 +1,123 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+FEED_REFRESH_SECONDS = float(os.getenv("FEED_REFRESH_SECONDS", "1800"))
+# How long clients/CDNs may keep serving an old copy while they revalidate
+FEED_STALE_WHILE_REVALIDATE = int(os.getenv("FEED_STALE_WHILE_REVALIDATE", "86400"))
+
+Fetcher = Callable[[], Awaitable[List[Dict[str, Any]]]]
+
+
+class FeedCache:
+    """
+    The hiring-signals feed, kept in memory and refreshed by a background loop.
+    Requests never wait on Tavily once a first copy exists: stale data is served
+    immediately and a refresh is kicked off (one at a time).
+    A failed or empty refresh keeps the previous copy.
+    """
+
+    def __init__(self, fetch: Fetcher, refresh_seconds: float = FEED_REFRESH_SECONDS):
+        self.fetch = fetch
+        self.refresh_seconds = refresh_seconds
+        self.signals: Optional[List[Dict[str, Any]]] = None
+        self.etag: Optional[str] = None
+        self.updated_at: Optional[float] = None
+        self.refreshes = 0
+        self.failures = 0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    @property
+    def age(self) -> Optional[float]:
+        return None if self.updated_at is None else time.monotonic() - self.updated_at
+
+    @property
+    def stale(self) -> bool:
+        return self.updated_at is None or self.age >= self.refresh_seconds
+
+    async def _refresh(self):
+        try:
+            signals = await self.fetch()
+        except Exception as e:
+            print(f"⚠️ Feed refresh failed: {e}")
+            signals = []
+        if not signals:
+            self.failures += 1
+            return
+        body = json.dumps(signals, sort_keys=True, default=str).encode()
+        self.signals = signals
+        self.etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        self.updated_at = time.monotonic()
+        self.refreshes += 1
+        print(f"📰 Feed refreshed ({len(signals)} signals)")
+
+    def refresh(self) -> asyncio.Task:
+        """
+        Starts a refresh unless one is already running; returns the running task.
+        """
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+        return self._refresh_task
+
+    async def get(self) -> List[Dict[str, Any]]:
+        """
+        Current feed. Only waits when there is no copy yet (cold start).
+        """
+        if self.signals is None:
+            await asyncio.shield(self.refresh())
+            return self.signals or []
+        if self.stale:
+            self.refresh()
+        return self.signals
+
+    async def _run(self):
+        while True:
+            await asyncio.shield(self.refresh())
+            await asyncio.sleep(self.refresh_seconds)
+
+    def start(self):
+        """
+        Starts the scheduled refresher. Called on app startup.
+        """
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """
+        Cancels the refresher and any refresh in flight. Called on app shutdown.
+        """
+        for task in (self._loop_task, self._refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._loop_task = None
+        self._refresh_task = None
+
+    def cache_control(self) -> str:
+        max_age = int(self.refresh_seconds if self.age is None else max(0, self.refresh_seconds - self.age))
+        return f"public, max-age={max_age}, stale-while-revalidate={FEED_STALE_WHILE_REVALIDATE}"
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "signals": len(self.signals or []),
+            "age_seconds": None if self.age is None else round(self.age, 1),
+            "stale": self.stale,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+        }
+
+
+async def _fetch_hiring_signals() -> List[Dict[str, Any]]:
+    from tools import search_hiring_signals
+    return await search_hiring_signals()
+
+
+feed_cache = FeedCache(_fetch_hiring_signals)
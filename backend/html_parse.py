@@ -0,0 +1,130 @@
+import html as html_lib
+import importlib.util
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Fastest available backends (both optional: pip install lxml selectolax)
+LXML_AVAILABLE = importlib.util.find_spec("lxml") is not None
+SELECTOLAX_AVAILABLE = importlib.util.find_spec("selectolax") is not None
+
+HTML_PARSER = os.getenv("HTML_PARSER") or ("lxml" if LXML_AVAILABLE else "html.parser")
+
+# Tags dropped before taking the visible text of a generic page
+BOILERPLATE_TAGS = ("script", "style", "nav", "footer", "header")
+
+# Class fragments of the Naukri description/header containers read by scrape_naukri_specific
+NAUKRI_CLASS_MARKERS = ("job-desc", "jd-header")
+
+TagFilter = Callable[[str, Dict], bool]
+
+
+def _class_string(attrs: Dict) -> str:
+    value = attrs.get("class") or ""
+    return value if isinstance(value, str) else " ".join(value)
+
+
+def naukri_target(name: str, attrs: Dict) -> bool:
+    """
+    True for the tags (and so the subtrees) scrape_naukri_specific reads:
+    title, meta, JSON-LD and the description/header containers.
+    """
+    attrs = attrs or {}
+    if name in ("title", "meta"):
+        return True
+    if name == "script":
+        return attrs.get("type") == "application/ld+json"
+    classes = _class_string(attrs)
+    return any(marker in classes for marker in NAUKRI_CLASS_MARKERS)
+
+
+class _TargetStrainer(SoupStrainer):
+    """
+    Only builds subtrees whose root tag passes the filter; everything else is skipped while parsing.
+    """
+
+    def __init__(self, keep: TagFilter):
+        super().__init__()
+        self.keep = keep
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return self.keep(name, attrs or {})
+
+
+def target_strainer(keep: TagFilter) -> SoupStrainer:
+    if hasattr(SoupStrainer, "allow_tag_creation"):
+        return _TargetStrainer(keep)
+    return SoupStrainer(keep) # bs4 < 4.13 calls a callable filter with (name, attrs) while parsing
+
+
+NAUKRI_STRAINER = target_strainer(naukri_target)
+JSON_LD_STRAINER = target_strainer(lambda name, attrs: name == "script" and attrs.get("type") == "application/ld+json")
+
+
+def make_soup(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+
+
+def naukri_soup(html: str) -> BeautifulSoup:
+    """
+    Partial tree with just what the Naukri extractor needs.
+    """
+    return make_soup(html, NAUKRI_STRAINER)
+
+
+def page_text(html: str, drop: Iterable[str] = BOILERPLATE_TAGS) -> str:
+    """
+    Visible text of a whole page (space separated), without the `drop` tags.
+    Uses selectolax when installed, BeautifulSoup otherwise.
+    """
+    drop = list(drop)
+    if SELECTOLAX_AVAILABLE:
+        from selectolax.parser import HTMLParser
+        tree = HTMLParser(html)
+        if drop:
+            tree.strip_tags(drop)
+        root = tree.body or tree.root
+        return root.text(separator=" ", strip=True) if root is not None else ""
+
+    soup = make_soup(html)
+    for tag in soup(drop):
+        tag.decompose()
+    return soup.get_text(separator=" ", strip=True)
+
+
+def _job_posting_in(data: Any) -> Optional[Dict]:
+    if isinstance(data, list):
+        for item in data:
+            found = _job_posting_in(item)
+            if found:
+                return found
+        return None
+    if not isinstance(data, dict):
+        return None
+    types = data.get("@type")
+    if types == "JobPosting" or (isinstance(types, list) and "JobPosting" in types):
+        return data
+    return _job_posting_in(data.get("@graph"))
+
+
+def job_posting_json_ld(html: str) -> Optional[Dict]:
+    """
+    The first JSON-LD JobPosting on the page (top level, in a list or in an @graph), or None.
+    """
+    for script in make_soup(html, JSON_LD_STRAINER).find_all("script"):
+        try:
+            posting = _job_posting_in(json.loads(script.string or "", strict=False))
+        except ValueError:
+            continue
+        if posting:
+            return posting
+    return None
+
+
+def html_fragment_text(fragment: str) -> str:
+    """
+    Plain text of an HTML snippet that may itself be entity-escaped (as JSON-LD descriptions often are).
+    """
+    return page_text(html_lib.unescape(fragment), ())
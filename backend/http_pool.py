@@ -0,0 +1,219 @@
+import asyncio
+import importlib.util
+import os
+import re
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+PER_HOST_CONCURRENCY = int(os.getenv("SCRAPE_PER_HOST_CONCURRENCY", "4"))
+SCRAPE_HOST_SLOTS_MAX = int(os.getenv("SCRAPE_HOST_SLOTS_MAX", "1024")) # Per-host semaphores kept, LRU
+CURL_MAX_CLIENTS = int(os.getenv("CURL_MAX_CLIENTS", "10"))
+# Hard ceiling on decoded bytes read per scraped page (bloated pages inline megabytes of JS state)
+SCRAPE_MAX_BYTES = int(os.getenv("SCRAPE_MAX_BYTES", str(2 * 1024 * 1024)))
+# Bytes still read after the JD marker is seen, enough for the container/JSON-LD block it opens
+SCRAPE_STOP_MARGIN = int(os.getenv("SCRAPE_STOP_MARGIN", str(256 * 1024)))
+
+# HTTP/2 needs the optional `h2` package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Referer": "https://www.google.com/",
+    "Upgrade-Insecure-Requests": "1"
+}
+
+
+class Sentinel:
+    """
+    Watches a streamed body for a short marker (the JD container, a JSON-LD JobPosting...)
+    and says to stop once `margin` more bytes have arrived after it.
+    """
+
+    def __init__(self, pattern: bytes, margin: int):
+        self.pattern = re.compile(pattern, re.IGNORECASE | re.DOTALL)
+        self.margin = margin
+        self._scanned = 0
+        self._found_at: Optional[int] = None
+
+    def seen_enough(self, body: bytearray) -> bool:
+        if self._found_at is None:
+            # Rescan a little overlap so markers split across chunks still match
+            start = max(0, self._scanned - 4096)
+            match = self.pattern.search(body, start)
+            self._scanned = len(body)
+            if match is None:
+                return False
+            self._found_at = match.end()
+        return len(body) - self._found_at >= self.margin
+
+
+# Naukri: the description container (its text and the header before it are all the extractor needs)
+NAUKRI_MARKER = rb"job-desc"
+# Generic job pages: a JSON-LD JobPosting block (the scraper reads the JD from its description
+# when the read stops here, the visible description may come later in the page)
+JOB_POSTING_MARKER = rb'"@type"\s*:\s*"JobPosting"'
+
+
+def page_sentinel(url: str) -> Sentinel:
+    """
+    Early-stop rule for a job page: read SCRAPE_STOP_MARGIN bytes past the marker, then stop.
+    """
+    return Sentinel(NAUKRI_MARKER if "naukri.com" in url else JOB_POSTING_MARKER, SCRAPE_STOP_MARGIN)
+
+
+class CappedPage(NamedTuple):
+    status_code: int
+    text: str
+    bytes_read: int
+    truncated: bool # Stopped early (byte cap or sentinel), the rest of the body was never downloaded
+
+
+async def read_capped(chunks: AsyncIterator[bytes], max_bytes: int = SCRAPE_MAX_BYTES,
+                      sentinel: Optional[Sentinel] = None) -> tuple:
+    """
+    Reads already-decompressed chunks until the byte cap or the sentinel says stop.
+    Returns (body, truncated).
+    """
+    body = bytearray()
+    async for chunk in chunks:
+        body += chunk
+        if len(body) >= max_bytes:
+            del body[max_bytes:]
+            return bytes(body), True
+        if sentinel is not None and sentinel.seen_enough(body):
+            return bytes(body), True
+    return bytes(body), False
+
+
+class HttpPool:
+    """
+    App-wide pooled clients for the scraping backends (httpx and curl_cffi),
+    plus a per-host concurrency cap so one job board never sees a flood from us.
+    Clients are bound to the event loop that created them and rebuilt if it changes.
+    """
+
+    def __init__(self, per_host: int = PER_HOST_CONCURRENCY, max_hosts: int = SCRAPE_HOST_SLOTS_MAX):
+        self.per_host = per_host
+        self.max_hosts = max_hosts
+        self._loop = None
+        self._httpx: Optional[httpx.AsyncClient] = None
+        self._curl = None
+        self._host_slots: "OrderedDict[str, asyncio.Semaphore]" = OrderedDict()
+        self._host_users: Dict[str, int] = {} # Requests holding or waiting for each host's slot
+
+    def _check_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._httpx = None
+            self._curl = None
+            self._host_slots = OrderedDict()
+            self._host_users = {}
+            self._loop = loop
+
+    def httpx_client(self) -> httpx.AsyncClient:
+        self._check_loop()
+        if self._httpx is None or self._httpx.is_closed:
+            self._httpx = httpx.AsyncClient(
+                follow_redirects=True,
+                timeout=15.0,
+                http2=HTTP2_AVAILABLE,
+                headers=BROWSER_HEADERS,
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                ),
+            )
+        return self._httpx
+
+    def curl_session(self):
+        """
+        Shared curl_cffi session impersonating Chrome (reuses connections and TLS sessions).
+        """
+        self._check_loop()
+        if self._curl is None:
+            from curl_cffi.requests import AsyncSession
+            self._curl = AsyncSession(impersonate="chrome120", max_clients=CURL_MAX_CLIENTS)
+        return self._curl
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        """
+        The host's semaphore, kept in a bounded LRU. Only idle hosts (nobody holding or
+        waiting for a slot) are evicted, so the cap is never bypassed mid-request.
+        """
+        semaphore = self._host_slots.get(host)
+        if semaphore is not None:
+            self._host_slots.move_to_end(host)
+            return semaphore
+        semaphore = self._host_slots[host] = asyncio.Semaphore(self.per_host)
+        for old in list(self._host_slots):
+            if len(self._host_slots) <= self.max_hosts:
+                break
+            if not self._host_users.get(old):
+                del self._host_slots[old]
+        return semaphore
+
+    @asynccontextmanager
+    async def host_slot(self, url: str):
+        """
+        Caps concurrent requests per host.
+        """
+        self._check_loop()
+        host = urlsplit(url).netloc.lower()
+        self._host_users[host] = self._host_users.get(host, 0) + 1
+        try:
+            async with self._host_semaphore(host):
+                yield
+        finally:
+            self._host_users[host] -= 1
+            if not self._host_users[host]:
+                del self._host_users[host]
+
+    async def fetch_httpx(self, url: str, max_bytes: int = SCRAPE_MAX_BYTES,
+                          sentinel: Optional[Sentinel] = None) -> CappedPage:
+        """
+        Streams a page through the shared httpx client (bodies are decompressed
+        incrementally) and stops at the byte cap or once the sentinel is satisfied.
+        """
+        async with self.httpx_client().stream("GET", url) as response:
+            if response.status_code != 200:
+                return CappedPage(response.status_code, "", 0, False)
+            body, truncated = await read_capped(response.aiter_bytes(), max_bytes, sentinel)
+            return CappedPage(response.status_code, body.decode(response.encoding or "utf-8", errors="replace"),
+                              len(body), truncated)
+
+    async def fetch_curl(self, url: str, timeout: float = 30, max_bytes: int = SCRAPE_MAX_BYTES,
+                         sentinel: Optional[Sentinel] = None) -> CappedPage:
+        """
+        Same as fetch_httpx over the curl_cffi session (libcurl decodes gzip/br as chunks arrive).
+        """
+        async with self.curl_session().stream("GET", url, timeout=timeout) as response:
+            if response.status_code != 200:
+                return CappedPage(response.status_code, "", 0, False)
+            body, truncated = await read_capped(response.aiter_content(), max_bytes, sentinel)
+            return CappedPage(response.status_code, body.decode(response.encoding or "utf-8", errors="replace"),
+                              len(body), truncated)
+
+    async def aclose(self):
+        if self._httpx is not None and not self._httpx.is_closed:
+            await self._httpx.aclose()
+        if self._curl is not None:
+            try:
+                await self._curl.close()
+            except Exception:
+                pass
+        self._httpx = None
+        self._curl = None
+
+
+http_pool = HttpPool()
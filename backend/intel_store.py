@@ -0,0 +1,156 @@
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# How long each kind of company intelligence stays fresh (seconds)
+DEFAULT_TTLS = {
+    "news": float(os.getenv("COMPANY_NEWS_TTL", str(6 * 3600))),
+    "reddit": float(os.getenv("COMPANY_REDDIT_TTL", str(72 * 3600))),
+}
+
+DEFAULT_DB_PATH = os.getenv(
+    "COMPANY_INTEL_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "company_intel.db")
+)
+
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "llp", "ltd", "limited", "pvt", "private", "corp",
+    "corporation", "co", "company", "plc", "gmbh", "ag", "sa", "bv", "pte",
+}
+
+UNKNOWN_NAMES = {"", "unknown", "unknown company", "unknown entity", "unknown_entity", "n/a", "none"}
+
+
+def normalize_company_name(name: Optional[str]) -> Optional[str]:
+    """
+    Maps name variants ("Acme Pvt. Ltd.", "ACME Inc") to one key ("acme").
+    Returns None for placeholder names we should never cache under.
+    """
+    if not name or name.strip().lower() in UNKNOWN_NAMES:
+        return None
+    words = re.sub(r"[^\w\s&]", " ", name.lower()).split()
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    key = " ".join(words)
+    return key if key not in UNKNOWN_NAMES else None
+
+
+class CompanyIntelStore:
+    """
+    SQLite-backed store of per-company search results (news, reddit), shared across postings.
+    Survives restarts. Concurrent misses for the same company share one fetch.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, ttls: Optional[Dict[str, float]] = None):
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                """
+                create table if not exists company_intel (
+                  company_key text not null,
+                  kind text not null,
+                  payload text not null,
+                  fetched_at real not null,
+                  primary key (company_key, kind)
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, company_name: str, kind: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the stored payload if it is still fresh for this kind, else None.
+        """
+        key = normalize_company_name(company_name)
+        if key is None:
+            return None
+        with self._lock:
+            row = self._db().execute(
+                "select payload, fetched_at from company_intel where company_key = ? and kind = ?",
+                (key, kind),
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttls.get(kind, 0):
+            return None
+        return json.loads(row[0])
+
+    def put(self, company_name: str, kind: str, payload: Dict[str, Any]):
+        key = normalize_company_name(company_name)
+        if key is None:
+            return
+        with self._lock:
+            self._db().execute(
+                "insert or replace into company_intel (company_key, kind, payload, fetched_at) values (?, ?, ?, ?)",
+                (key, kind, json.dumps(payload), time.time()),
+            )
+            self._db().commit()
+
+    async def get_or_fetch(
+        self,
+        company_name: str,
+        kind: str,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+        should_store: Callable[[Dict[str, Any]], bool] = lambda payload: True,
+    ) -> Dict[str, Any]:
+        """
+        Serves fresh stored intel, or runs fetch once per company/kind and stores the result.
+        """
+        key = normalize_company_name(company_name)
+        if key is None:
+            return await fetch()
+
+        cached = await asyncio.to_thread(self.get, company_name, kind)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        inflight = self._inflight.get((key, kind))
+        if inflight is not None:
+            self.hits += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+
+        async def run():
+            try:
+                payload = await fetch()
+                if should_store(payload):
+                    await asyncio.to_thread(self.put, company_name, kind, payload)
+                return payload
+            finally:
+                self._inflight.pop((key, kind), None)
+
+        task = asyncio.ensure_future(run())
+        self._inflight[(key, kind)] = task
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "in_flight": len(self._inflight),
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+company_intel = CompanyIntelStore()
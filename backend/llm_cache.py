@@ -0,0 +1,186 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+DEFAULT_DB_PATH = os.getenv(
+    "LLM_CACHE_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_cache.db")
+)
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600)))
+EVICT_TO = 0.9 # Evict down to this share of max_bytes so we don't evict on every put
+
+_INVISIBLE = re.compile("[\u200b-\u200f\u2060\ufeff]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Folds differences that don't change the answer (case, whitespace, unicode forms,
+    zero-width characters), so reposts of the same JD share one entry.
+    """
+    text = _INVISIBLE.sub("", unicodedata.normalize("NFKC", text or ""))
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+def cache_key(model: str, prompt_version: str, text: str, *extra: str) -> str:
+    """
+    Content address of one LLM call: model, prompt template version and the normalized input.
+    """
+    digest = hashlib.sha256()
+    for part in (model, prompt_version, *extra, normalize_text(text)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class LLMCache:
+    """
+    SQLite-backed cache of LLM results by content address. Survives restarts,
+    evicts least recently used entries past max_bytes, and lets concurrent misses
+    for the same input share one call.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, max_bytes: int = LLM_CACHE_MAX_BYTES, ttl: float = LLM_CACHE_TTL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(
+                """
+                create table if not exists llm_cache (
+                  key text primary key,
+                  namespace text not null,
+                  value text not null,
+                  size integer not null,
+                  created_at real not null,
+                  last_used real not null
+                );
+                create index if not exists llm_cache_last_used on llm_cache (last_used);
+                """
+            )
+            self._conn.commit()
+            self._bytes = self._conn.execute("select coalesce(sum(size), 0) from llm_cache").fetchone()[0]
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the cached value if present and within ttl (and marks it recently used), else None.
+        """
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute("select value, created_at from llm_cache where key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                return None
+            db.execute("update llm_cache set last_used = ? where key = ?", (now, key))
+            db.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, namespace: str, value: Any):
+        data = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            old = db.execute("select size from llm_cache where key = ?", (key,)).fetchone()
+            db.execute(
+                "insert or replace into llm_cache (key, namespace, value, size, created_at, last_used) values (?, ?, ?, ?, ?, ?)",
+                (key, namespace, data, len(data), now, now),
+            )
+            self._bytes += len(data) - (old[0] if old else 0)
+            if self._bytes > self.max_bytes:
+                self._evict(db)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection):
+        """
+        Drops least recently used entries until the cache is back under EVICT_TO of max_bytes.
+        """
+        target = self.max_bytes * EVICT_TO
+        rows = db.execute("select key, size from llm_cache order by last_used").fetchall()
+        doomed = []
+        for key, size in rows:
+            if self._bytes <= target:
+                break
+            doomed.append((key,))
+            self._bytes -= size
+        db.executemany("delete from llm_cache where key = ?", doomed)
+        self.evictions += len(doomed)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        namespace: str,
+        compute: Callable[[], Awaitable[Any]],
+        should_store: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """
+        Serves the cached result for `key`, or runs compute once (shared by concurrent callers)
+        and stores what it returns.
+        """
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+
+        async def run():
+            try:
+                value = await compute()
+                if should_store(value):
+                    await asyncio.to_thread(self.put, key, namespace, value)
+                return value
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.ensure_future(run())
+        self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._db().execute("select count(*) from llm_cache").fetchone()[0]
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "in_flight": len(self._inflight),
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+llm_cache = LLMCache()
@@ -1,4 +1,10 @@
-from fastapi import FastAPI
+import time
+BOOT_STARTED = time.perf_counter() # Process-relative boot clock, reported by /readyz
+
+import os
+import json
+from fastapi import FastAPI, Request, Response, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
@@ -18,49 +24,181 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Readiness state, filled in by startup_event (liveness doesn't depend on it)
+startup_state = {
+    "started": False,
+    "browser": "unknown", # installed | missing | installing | unavailable
+    "boot_seconds": None,
+}
+
+async def _install_browser_in_background():
+    from browser_pool import install_chromium
+    startup_state["browser"] = "installing"
+    ok = await install_chromium()
+    startup_state["browser"] = "installed" if ok else "missing"
+    print("✅ Playwright Browsers Installed." if ok else "⚠️ Failed to auto-install browsers.")
+
 @app.on_event("startup")
 async def startup_event():
     """
-    Ensure browsers are installed for Playwright on startup.
-    This fixes the 'Executable doesn't exist' error on Render.
+    Quick, non-blocking startup: only checks whether Chromium is on disk.
+    The build step installs it (render.yaml). Set PLAYWRIGHT_AUTO_INSTALL=1 to install
+    it in the background when missing; scraping falls back to HTTP strategies meanwhile.
     """
-    import os
-    import subprocess
+    import time
+    from browser_pool import chromium_installed
+    from scraper import PLAYWRIGHT_AVAILABLE
     print("🚀 Checking Playwright Browsers...")
-    try:
-        # Check if we can run verify installation or just install
-        # This command is safe to run multiple times (it verifies)
-        subprocess.run(["playwright", "install", "chromium"], check=True)
-        print("✅ Playwright Browsers Installed.")
-    except Exception as e:
-        print(f"⚠️ Failed to auto-install browsers: {e}")
+    if not PLAYWRIGHT_AVAILABLE:
+        startup_state["browser"] = "unavailable"
+    elif chromium_installed():
+        startup_state["browser"] = "installed"
+    elif os.getenv("PLAYWRIGHT_AUTO_INSTALL") == "1":
+        asyncio.create_task(_install_browser_in_background())
+    else:
+        startup_state["browser"] = "missing"
+        print("⚠️ Chromium not found. Run `playwright install chromium` (Playwright fallback disabled).")
+
+    from feed import feed_cache
+    from verification_store import verification_store
+    feed_cache.start()
+    verification_store.start()
 
-from typing import Optional
+    startup_state["started"] = True
+    startup_state["boot_seconds"] = round(time.perf_counter() - BOOT_STARTED, 3)
+    print(f"✅ Startup complete in {startup_state['boot_seconds']}s (browser: {startup_state['browser']})")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Release pooled network clients and the shared browser.
+    """
+    from tools import aclose_clients
+    from intel_store import company_intel
+    from llm_cache import llm_cache
+    from verification_store import verification_store
+    from browser_pool import browser_pool
+    from http_pool import http_pool
+    from feed import feed_cache
+    await feed_cache.stop()
+    await aclose_clients()
+    await http_pool.aclose()
+    await browser_pool.stop()
+    await verification_store.stop() # Flush buffered verifications before exit
+    company_intel.close()
+    llm_cache.close()
+    verification_store.close()
+
+from typing import Optional, List
 
 class VerifyRequest(BaseModel):
     url: str
     content: Optional[str] = None
 
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+
 @app.get("/")
 def read_root():
     return {"message": "VeriJob AI Verification Engine is Running!"}
 
-from verifier import verify_job_listing
+@app.get("/healthz")
+def liveness():
+    """
+    Liveness: the process is up and serving requests.
+    """
+    return {"status": "alive"}
+
+@app.get("/readyz")
+def readiness(response: Response):
+    """
+    Readiness: startup finished and provider keys are configured.
+    The browser status is reported but doesn't gate readiness (HTTP scrapers still work).
+    """
+    checks = {
+        "startup_complete": startup_state["started"],
+        "groq_key": bool(os.getenv("GROQ_API_KEY")),
+        "tavily_key": bool(os.getenv("TAVILY_API_KEY")),
+    }
+    ready = all(checks.values())
+    if not ready:
+        response.status_code = 503
+    return {
+        "status": "ready" if ready else "not_ready",
+        "checks": checks,
+        "browser": startup_state["browser"],
+        "boot_seconds": startup_state["boot_seconds"],
+    }
 
+from verifier import verify_job_listing, verify_job_listings, stream_verification
+from cache import verification_cache
+from intel_store import company_intel
+from llm_cache import llm_cache
+from verification_store import verification_store
+from metrics import register_cache
 
-from tools import search_hiring_signals
+register_cache("verification", verification_cache.stats, hit_keys=("hits", "coalesced"))
+register_cache("company_intel", company_intel.stats)
+register_cache("llm", llm_cache.stats, hit_keys=("hits", "coalesced"))
+register_cache("verification_store", verification_store.stats)
+
+
+from feed import feed_cache
 
 @app.get("/feed")
-def get_feed():
+async def get_feed(request: Request):
     """
     Returns a list of 'Green Flags' (Hiring Signals).
+    Served from memory; a background task refreshes it, so Tavily latency never hits this endpoint.
     """
     try:
-        signals = search_hiring_signals()
-        return signals
+        signals = await feed_cache.get()
     except Exception as e:
         print(f"Feed error: {e}")
         return []
+    if not feed_cache.etag:
+        return signals
+    headers = {"ETag": feed_cache.etag, "Cache-Control": feed_cache.cache_control()}
+    if request.headers.get("if-none-match") == feed_cache.etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(signals, headers=headers)
+
+@app.get("/verified")
+async def recent_verified(limit: int = 5):
+    """
+    Most recent stored verifications (same fields as Supabase's verified_jobs rows).
+    """
+    return await asyncio.to_thread(verification_store.recent, max(1, min(limit, 50)))
+
+@app.get("/cache/stats")
+def cache_stats():
+    """
+    Hit/miss counters for the verification result cache.
+    """
+    from intel_store import company_intel
+    return {
+        "verification": verification_cache.stats(),
+        "company_intel": company_intel.stats(),
+        "feed": feed_cache.stats(),
+        "llm": llm_cache.stats(),
+        "verification_store": verification_store.stats(),
+    }
+
+@app.get("/metrics")
+def prometheus_metrics():
+    """
+    Prometheus metrics: node/strategy/provider latency histograms, in-flight,
+    error and retry counters, and cache hit ratios.
+    """
+    from metrics import registry, CONTENT_TYPE
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+@app.get("/scraper/stats")
+def scraper_stats(limit: int = 50):
+    """
+    Per-domain success rate and latency of each scrape strategy, most recently scraped domains first.
+    """
+    from strategy_engine import strategy_engine
+    return strategy_engine.snapshot(max(1, min(limit, 200)))
 
 @app.post("/verify")
 async def verify_job(request: VerifyRequest):
@@ -76,3 +214,40 @@ async def verify_job(request: VerifyRequest):
             "traceback": traceback.format_exc()
         }
 
+
+@app.post("/verify/batch")
+async def verify_batch(requests: List[VerifyRequest]):
+    """
+    Verifies many postings with bounded concurrency and streams one NDJSON line
+    per posting as soon as it finishes (lines arrive in completion order, keyed by index).
+    """
+    if len(requests) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {BATCH_MAX_ITEMS} items).")
+
+    items = [(r.url, r.content) for r in requests]
+
+    async def ndjson_lines():
+        async for index, result in verify_job_listings(items):
+            yield json.dumps({"index": index, "url": items[index][0], **result}, default=str) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+@app.post("/verify/stream")
+async def verify_stream(request: VerifyRequest):
+    """
+    Server-sent events for one verification: an event per finished stage
+    (metadata, health, reddit, analysis, temporal, score) and a final `result`.
+    """
+    async def sse_events():
+        try:
+            async for event, data in stream_verification(request.url, request.content):
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        except Exception as e:
+            error = {"status": "Error", "score": 0, "details": f"Internal Error: {str(e)}"}
+            yield f"event: result\ndata: {json.dumps(error)}\n\n"
+
+    return StreamingResponse(
+        sse_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,233 @@
+import asyncio
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Prometheus text exposition (format 0.0.4), kept dependency-free.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: Iterable[Tuple[str, str]]) -> str:
+    pairs = [f'{k}="{_escape(v)}"' for k, v in key]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+
+class CallbackMetric(_Metric):
+    """
+    Values read at scrape time from one or more sources returning [(labels, value), ...]
+    (e.g. cache stats that are already counted elsewhere).
+    """
+
+    def __init__(self, name: str, help_text: str, kind: str = "gauge"):
+        super().__init__(name, help_text)
+        self.kind = kind
+        self._sources: List[Callable[[], List[Tuple[Dict[str, str], float]]]] = []
+
+    def add(self, source: Callable[[], List[Tuple[Dict[str, str], float]]]):
+        self._sources.append(source)
+
+    def render(self) -> List[str]:
+        lines = []
+        for source in self._sources:
+            try:
+                samples = source()
+            except Exception:
+                continue
+            lines.extend(f"{self.name}{_format_labels(_label_key(labels))} {_format_value(v)}" for labels, v in samples)
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelKey, List] = {} # key -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, **labels) -> int:
+        series = self._series.get(_label_key(labels))
+        return series[-1] if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, series):
+                cumulative += bucket
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', _format_value(bound)),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(key + (('le', '+Inf'),))} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.setdefault(metric.name, metric)
+        return self._metrics[metric.name]
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self.register(Counter(name, help_text))
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self.register(Gauge(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            body = metric.render()
+            if body:
+                lines.extend(metric.header() + body)
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# --- App metrics ---
+
+NODE_SECONDS = registry.histogram("verijob_node_duration_seconds", "LangGraph node run time.")
+STRATEGY_SECONDS = registry.histogram("verijob_scrape_strategy_duration_seconds", "Scrape strategy run time by outcome.")
+PROVIDER_SECONDS = registry.histogram("verijob_provider_request_duration_seconds", "Tavily/Groq request time per attempt.")
+VERIFICATION_SECONDS = registry.histogram("verijob_verification_duration_seconds", "End-to-end verification time.")
+IN_FLIGHT = registry.gauge("verijob_in_flight", "Operations currently running.")
+ERRORS = registry.counter("verijob_errors_total", "Operations that raised.")
+RETRIES = registry.counter("verijob_provider_retries_total", "Provider request retries.")
+VERIFICATIONS = registry.counter("verijob_verifications_total", "Finished verifications by status.")
+
+
+@contextmanager
+def timed(histogram: Histogram, kind: str, name: str, **labels):
+    """
+    Observes the block's duration in `histogram` (labelled `kind`=`name`) and keeps the
+    in-flight gauge and error counter for it. Works around `await`s in async code too.
+    """
+    IN_FLIGHT.inc(kind=kind, name=name)
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e: # Cancellation (e.g. a hedged scrape that lost) isn't an error
+        ERRORS.inc(kind=kind, name=name, error=type(e).__name__)
+        raise
+    finally:
+        IN_FLIGHT.dec(kind=kind, name=name)
+        histogram.observe(time.perf_counter() - started, **{kind: name}, **labels)
+
+
+def observe_node(name: str):
+    """
+    Decorator timing a graph node (sync or async) into verijob_node_duration_seconds.
+    """
+    def decorate(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def run_async(*args, **kwargs):
+                with timed(NODE_SECONDS, "node", name):
+                    return await fn(*args, **kwargs)
+            return run_async
+
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            with timed(NODE_SECONDS, "node", name):
+                return fn(*args, **kwargs)
+        return run
+
+    return decorate
+
+
+CACHE_HITS = registry.register(CallbackMetric("verijob_cache_hits_total", "Cache hits by cache.", "counter"))
+CACHE_MISSES = registry.register(CallbackMetric("verijob_cache_misses_total", "Cache misses by cache.", "counter"))
+CACHE_HIT_RATIO = registry.register(CallbackMetric("verijob_cache_hit_ratio", "Cache hit ratio by cache."))
+
+
+def register_cache(cache_name: str, stats: Callable[[], Dict], hit_keys: Tuple[str, ...] = ("hits",)):
+    """
+    Exposes a cache's stats() as hit/miss counters and a hit ratio gauge.
+    """
+    labels = {"cache": cache_name}
+    CACHE_HITS.add(lambda: [(labels, sum(stats().get(k, 0) for k in hit_keys))])
+    CACHE_MISSES.add(lambda: [(labels, stats().get("misses", 0))])
+    CACHE_HIT_RATIO.add(lambda: [(labels, stats().get("hit_ratio", 0.0))])
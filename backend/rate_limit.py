@@ -0,0 +1,174 @@
+import asyncio
+import datetime
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Callable, List, Optional, Tuple
+
+import httpx
+
+from metrics import registry, CallbackMetric
+
+MAX_RETRY_AFTER = 60.0 # Never park a provider longer than this on one header
+BACKOFF_COOLDOWN = 1.0 # A burst of 429s from one overload only halves the limit once
+
+
+def retry_after_seconds(headers) -> Optional[float]:
+    """
+    Retry-After as seconds (delta-seconds or HTTP-date form), capped at MAX_RETRY_AFTER.
+    """
+    value = (headers or {}).get("retry-after")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        seconds = (when - datetime.datetime.now(when.tzinfo or datetime.timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def classify_overload(error: Exception) -> Tuple[bool, Optional[float]]:
+    """
+    (is the provider overloaded, Retry-After seconds) for an error from a provider call.
+    Timeouts, 429 and 503 count as overload; works for httpx and the Groq SDK errors.
+    """
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, httpx.TimeoutException)):
+        return True, None
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status in (429, 503):
+        return True, retry_after_seconds(getattr(response, "headers", None))
+    return False, None
+
+
+class AdaptiveLimiter:
+    """
+    Per-provider request limiter: a token bucket caps the request rate (rpm, with bursts),
+    and an AIMD limit caps concurrency: +1/limit per success, halved on overload
+    (429, 503, timeout). Retry-After pauses every caller until it passes.
+    Primitives are rebuilt if the event loop changes; the learned limit is kept.
+    """
+
+    def __init__(self, name: str, rpm: float, burst: int, max_concurrency: int, min_concurrency: int = 1,
+                 classify: Callable[[Exception], Tuple[bool, Optional[float]]] = classify_overload):
+        self.name = name
+        self.rate = rpm / 60.0
+        self.burst = burst
+        self.tokens = float(burst)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.limit = float(max_concurrency)
+        self.classify = classify
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.backoffs = 0
+        self._refilled = time.monotonic()
+        self._last_backoff = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop = None
+        _limiters.append(self)
+
+    def _get_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self.in_flight = 0
+        return self._condition
+
+    def pause_remaining(self) -> float:
+        return max(0.0, self.paused_until - time.monotonic())
+
+    def _token_wait(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+        wait = self.pause_remaining()
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    async def acquire(self):
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        try:
+            while True:
+                wait = self._token_wait()
+                if wait <= 0:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep(wait)
+        except BaseException:
+            await self.release()
+            raise
+
+    async def release(self):
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            condition.notify_all()
+
+    def on_success(self):
+        self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+
+    def on_overload(self, retry_after: Optional[float] = None):
+        now = time.monotonic()
+        if retry_after:
+            self.paused_until = max(self.paused_until, now + retry_after)
+        if now - self._last_backoff >= BACKOFF_COOLDOWN:
+            self.limit = max(self.min_concurrency, self.limit / 2)
+            self._last_backoff = now
+            self.backoffs += 1
+            print(f"🐢 {self.name} overloaded, concurrency limit now {int(self.limit)}"
+                  + (f", pausing {retry_after:.1f}s" if retry_after else ""))
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        One provider call: waits for a concurrency slot and a token, then feeds the outcome back.
+        """
+        await self.acquire()
+        try:
+            yield
+            self.on_success()
+        except Exception as e:
+            overloaded, retry_after = self.classify(e)
+            if overloaded:
+                self.on_overload(retry_after)
+            raise
+        finally:
+            await self.release()
+
+    def stats(self):
+        return {
+            "concurrency_limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "tokens": round(min(self.burst, self.tokens), 2),
+            "rate_per_s": round(self.rate, 3),
+            "paused_seconds": round(self.pause_remaining(), 2),
+            "backoffs": self.backoffs,
+        }
+
+
+_limiters: List[AdaptiveLimiter] = []
+
+
+def _stat_source(field: str):
+    return lambda: [({"provider": limiter.name}, limiter.stats()[field]) for limiter in _limiters]
+
+
+for _field, _kind, _help in (
+    ("concurrency_limit", "gauge", "Current AIMD concurrency limit."),
+    ("in_flight", "gauge", "Calls holding a limiter slot."),
+    ("tokens", "gauge", "Request tokens available in the bucket."),
+    ("paused_seconds", "gauge", "Seconds left in a Retry-After pause."),
+    ("backoffs", "counter", "Times the concurrency limit was cut on overload."),
+):
+    _name = f"verijob_rate_limit_{_field}" + ("_total" if _kind == "counter" else "")
+    registry.register(CallbackMetric(_name, _help, _kind)).add(_stat_source(_field))
@@ -0,0 +1,102 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from intel_store import normalize_company_name
+
+# Terms that make a source about the kind of trouble we look for (layoffs, scams, ghosting...)
+INTENT_TERMS = [
+    "layoff", "layoffs", "laid", "fired", "freeze", "scam", "scammed", "fake", "fraud",
+    "ghost", "ghosted", "ghosting", "interview", "rejected", "offer", "revoked", "hiring",
+]
+
+# Generic round-ups that name many companies ("Top 10 ...", "List of layoffs ...")
+LISTICLE = re.compile(r"\b(top \d+|list of|\d+ companies|companies that|best companies)\b", re.IGNORECASE)
+
+TOKEN = re.compile(r"\w+")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Minimum normalized BM25 intent score for a source that names the company in its body to be kept locally
+INTENT_KEEP_THRESHOLD = 0.5
+
+
+def company_aliases(company_name: str) -> List[str]:
+    """
+    Lowercase names a source might use for the company: the normalized name and the name as given.
+    """
+    normalized = normalize_company_name(company_name)
+    if normalized is None:
+        return []
+    aliases = {normalized, " ".join(TOKEN.findall(company_name.lower()))}
+    return sorted(a for a in aliases if len(a) >= 2)
+
+
+def company_acronym(company_name: str) -> Optional[str]:
+    """
+    Uppercase acronym of a multi-word name ("Tata Consultancy Services" -> "TCS").
+    Two-letter ones ("MS", "RH") match too much unrelated text, so only 3+ letters count.
+    """
+    normalized = normalize_company_name(company_name)
+    words = normalized.split() if normalized else []
+    acronym = "".join(w[0] for w in words).upper()
+    return acronym if len(acronym) >= 3 and acronym.isalpha() else None
+
+
+def bm25_scores(docs: List[str], query_terms: List[str]) -> np.ndarray:
+    """
+    BM25 score of each doc for the query, with IDF computed over the docs themselves.
+    """
+    if not docs:
+        return np.zeros(0)
+    tokenized = [TOKEN.findall(d.lower()) for d in docs]
+    terms = sorted(set(query_terms))
+    index = {t: j for j, t in enumerate(terms)}
+    tf = np.zeros((len(docs), len(terms)))
+    for i, tokens in enumerate(tokenized):
+        for token in tokens:
+            j = index.get(token)
+            if j is not None:
+                tf[i, j] += 1
+    lengths = np.array([len(t) for t in tokenized], dtype=float)
+    avg_length = lengths.mean() or 1.0
+    df = (tf > 0).sum(axis=0)
+    idf = np.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / avg_length)
+    return ((tf * (BM25_K1 + 1)) / (tf + norm[:, None]) * idf).sum(axis=1)
+
+
+def prefilter_sources(results: List[Dict], company_name: str) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Splits search results into (keep, drop, ambiguous) index lists without an LLM:
+    - drop: the company (or its acronym) is never mentioned
+    - keep: named in the title of a non-listicle, or named repeatedly in the body
+      alongside a strong layoff/scam/ghosting signal
+    - ambiguous: everything else, left for the LLM filter. This includes sources that
+      only mention the acronym, which can just as well be some other company.
+    """
+    aliases = company_aliases(company_name)
+    if not aliases or not results:
+        return [], [], list(range(len(results)))
+
+    alias_pattern = re.compile(r"\b(" + "|".join(re.escape(a) for a in aliases) + r")\b", re.IGNORECASE)
+    acronym = company_acronym(company_name)
+    acronym_pattern = re.compile(r"\b" + acronym + r"\b") if acronym else None # Case-sensitive
+    titles = [r.get("title", "") or "" for r in results]
+    contents = [r.get("content", "") or "" for r in results]
+
+    intent = bm25_scores([f"{t} {c}" for t, c in zip(titles, contents)], INTENT_TERMS)
+    intent = intent / intent.max() if intent.size and intent.max() > 0 else intent
+    title_hits = np.array([bool(alias_pattern.search(t)) for t in titles])
+    body_hits = np.array([len(alias_pattern.findall(c)) for c in contents])
+    acronym_hits = np.array([
+        bool(acronym_pattern and acronym_pattern.search(f"{t} {c}")) for t, c in zip(titles, contents)
+    ])
+    listicle = np.array([bool(LISTICLE.search(t)) for t in titles])
+
+    drop = ~title_hits & (body_hits == 0) & ~acronym_hits
+    keep = ~listicle & (title_hits | ((body_hits >= 2) & (intent >= INTENT_KEEP_THRESHOLD)))
+    ambiguous = ~drop & ~keep
+
+    return (np.flatnonzero(keep).tolist(), np.flatnonzero(drop).tolist(), np.flatnonzero(ambiguous).tolist())
@@ -1,15 +1,16 @@
-import httpx
 from bs4 import BeautifulSoup
 from typing import Dict, Any
 import asyncio
-from tools import extract_metadata_from_text, safe_tavily_search
+from tools import extract_metadata_from_text, async_tavily_search
+from browser_pool import browser_pool, BrowserPoolExhausted
+from strategy_engine import strategy_engine
+from http_pool import http_pool, page_sentinel
+import deadline
+from html_parse import html_fragment_text, job_posting_json_ld, naukri_soup, page_text
 
-# Try imports for Playwright
-try:
-    from playwright.async_api import async_playwright
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+# Check for Playwright without importing it (the driver is only loaded when the pool starts)
+import importlib.util
+PLAYWRIGHT_AVAILABLE = importlib.util.find_spec("playwright") is not None
 
 def scrape_naukri_specific(soup: BeautifulSoup) -> Dict[str, str]:
     """
@@ -88,7 +89,29 @@ def scrape_naukri_specific(soup: BeautifulSoup) -> Dict[str, str]:
         
     return {}
 
-async def scrape_with_tavily(url: str) -> Dict[str, Any]:
+def parse_naukri_html(html: str) -> Dict[str, str]:
+    return scrape_naukri_specific(naukri_soup(html))
+
+def parse_job_posting_json_ld(html: str) -> Dict[str, str]:
+    """
+    JD, title and company from the page's JSON-LD JobPosting. Used when the read stopped
+    early at the JobPosting sentinel, so the visible description may never have been downloaded.
+    """
+    posting = job_posting_json_ld(html)
+    if not posting:
+        return {}
+    description = html_fragment_text(str(posting.get("description") or ""))
+    if not description:
+        return {}
+    organization = posting.get("hiringOrganization")
+    company = organization.get("name", "") if isinstance(organization, dict) else organization
+    return {
+        "scraped_text": description[:15000],
+        "title": str(posting.get("title") or posting.get("name") or "UNKNOWN_ROLE"),
+        "company": str(company or "UNKNOWN_ENTITY"),
+    }
+
+async def scrape_with_tavily(url: str, extract: bool = True) -> Dict[str, Any]:
     """
     Option 3: Use Search Snippets/API to get content (Lightweight & Reliable).
     """
@@ -96,7 +119,7 @@ async def scrape_with_tavily(url: str) -> Dict[str, Any]:
     try:
         # Use Tavily's search to find the URL content
         # We search specifically for the URL or "job description {url}"
-        response = safe_tavily_search(
+        response = await async_tavily_search(
             query=url, 
             search_depth="advanced", 
             include_raw_content=True,
@@ -113,7 +136,7 @@ async def scrape_with_tavily(url: str) -> Dict[str, Any]:
         
         if content and len(content) > 300:
             print(f"✅ Tavily Extracted {len(content)} chars.")
-            extraction_result = extract_metadata_from_text(content, url)
+            extraction_result = await extract_metadata_from_text(content, url) if extract else {}
             return {
                 "scraped_text": content[:15000],
                 **extraction_result
@@ -123,43 +146,50 @@ async def scrape_with_tavily(url: str) -> Dict[str, Any]:
         
     return {}
 
-async def scrape_with_curl_cffi(url: str) -> Dict[str, Any]:
+async def scrape_with_curl_cffi(url: str, extract: bool = True) -> Dict[str, Any]:
     """
     Advanced scraper using curl_cffi to mimic real Chrome TLS fingerprint.
     Best for Naukri to avoid 'Access Denied'.
     """
-    try:
-        from curl_cffi.requests import AsyncSession
-    except ImportError:
+    if importlib.util.find_spec("curl_cffi") is None:
         print("⚠️ curl_cffi not installed. skipping advanced scrape.")
         return {}
 
     print(f"🕵️‍♂️ Scraping with curl_cffi (Chrome Masquerade): {url}...")
     try:
-        # Impersonate Chrome 120
-        async with AsyncSession(impersonate="chrome120") as s:
-            response = await s.get(url, timeout=30)
+        # Shared session impersonating Chrome 120
+        # Streamed with a byte cap, stopping once the JD container/JSON-LD has arrived
+        async with http_pool.host_slot(url):
+            response = await http_pool.fetch_curl(url, timeout=30, sentinel=page_sentinel(url))
             
         if response.status_code == 200:
+            if response.truncated:
+                print(f"✂️ curl_cffi stopped reading after {response.bytes_read} bytes.")
             # Check for block
             if "Access Denied" in response.text or "Security Check" in response.text:
                  print("⚠️ curl_cffi got blocked (Access Denied).")
                  return {} # Fallback
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
+            # Parsing is CPU-bound, keep it off the event loop
             # Naukri specific parsing
             if "naukri.com" in url:
-                naukri_data = scrape_naukri_specific(soup)
+                naukri_data = await asyncio.to_thread(parse_naukri_html, response.text)
                 if naukri_data:
                     print("✅ curl_cffi Successfully Scraped Naukri!")
                     return naukri_data
             
+            # Stopped at the JSON-LD sentinel: the JD is in the JobPosting, maybe not in the visible HTML yet
+            if response.truncated:
+                posting = await asyncio.to_thread(parse_job_posting_json_ld, response.text)
+                if posting:
+                    print("✅ curl_cffi read the JD from JSON-LD.")
+                    return posting
+
             # General fallback
-            text = soup.get_text(separator=' ', strip=True)
+            text = await asyncio.to_thread(page_text, response.text, ())
             if len(text) > 500:
                  print(f"✅ curl_cffi Extracted {len(text)} chars.")
-                 extraction_result = extract_metadata_from_text(text, url)
+                 extraction_result = await extract_metadata_from_text(text, url) if extract else {}
                  return {"scraped_text": text[:15000], **extraction_result}
                  
     except Exception as e:
@@ -167,53 +197,48 @@ async def scrape_with_curl_cffi(url: str) -> Dict[str, Any]:
         
     return {}
 
-async def scrape_with_httpx(url: str) -> Dict[str, Any]:
+async def scrape_with_httpx(url: str, extract: bool = True) -> Dict[str, Any]:
     """
     Primary scraper using HTTPX (No browser required).
     """
     print(f"🚀 Scraping with HTTPX: {url}...")
     if "naukri.com" in url:
-        print("🎯 Detected Naukri URL, preparing specific headers...")
-    
-    # Specific headers for Naukri to prevent blocking
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Referer": "https://www.google.com/",
-        "Upgrade-Insecure-Requests": "1"
-    }
+        print("🎯 Detected Naukri URL, using browser-like headers...")
     
+    # Browser-like headers (set on the shared client) to prevent blocking
     try:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=15.0) as client:
-            response = await client.get(url, headers=headers)
+        async with http_pool.host_slot(url):
+            response = await http_pool.fetch_httpx(url, sentinel=page_sentinel(url))
             
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
+            if response.truncated:
+                print(f"✂️ HTTPX stopped reading after {response.bytes_read} bytes.")
             # Check for Naukri specific content first
             if "naukri.com" in url:
                 # print(f"🕵️‍♂️ Naukri Raw HTML Preview: {response.text[:500]}")
                 # with open("debug_naukri.html", "w", encoding="utf-8") as f:
                 #     f.write(response.text)
                 
-                naukri_data = scrape_naukri_specific(soup)
+                naukri_data = await asyncio.to_thread(parse_naukri_html, response.text)
                 if naukri_data:
                     print("✅ Successfully used Naukri-specific parser.")
                     return naukri_data
                 else:
                     print("⚠️ Naukri parser matched nothing.")
 
-            # Remove scripts and styles
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.decompose()
-                
-            text = soup.get_text(separator=' ', strip=True)
+            # Stopped at the JSON-LD sentinel: the JD is in the JobPosting, maybe not in the visible HTML yet
+            if response.truncated:
+                posting = await asyncio.to_thread(parse_job_posting_json_ld, response.text)
+                if posting:
+                    print("✅ HTTPX read the JD from JSON-LD.")
+                    return posting
+
+            # Visible text without scripts, styles and page chrome
+            text = await asyncio.to_thread(page_text, response.text)
             
             if len(text) > 500:
                 print(f"✅ HTTPX Extracted {len(text)} chars.")
-                extraction_result = extract_metadata_from_text(text, url)
+                extraction_result = await extract_metadata_from_text(text, url) if extract else {}
                 return {
                     "scraped_text": text[:15000], 
                     **extraction_result
@@ -225,93 +250,73 @@ async def scrape_with_httpx(url: str) -> Dict[str, Any]:
         
     return {}
 
-async def scrape_with_playwright(url: str) -> Dict[str, Any]:
+async def scrape_with_playwright(url: str, extract: bool = True) -> Dict[str, Any]:
     """
     Secondary scraper using Playwright (Only if installed & HTTPX fails).
+    Borrows a page from the shared browser pool instead of booting Chromium per call.
     """
     if not PLAYWRIGHT_AVAILABLE:
         return {}
 
     print(f"🕸️ Attempting Playwright for: {url}...")
-    browser = None
     try:
-        async with async_playwright() as p:
-            # Try to verify if browser exists BEFORE launching to avoid crash
-            try:
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=['--disable-blink-features=AutomationControlled', '--no-sandbox']
-                )
-            except Exception as launch_err:
-                print(f"⛔ Playwright binary missing or launch failed: {launch_err}")
-                return {} 
+        async with browser_pool.page() as page:
+            await page.goto(url, wait_until="domcontentloaded", timeout=45000)
+            await page.wait_for_timeout(5000) # Wait for hydration
+            page_content = await page.evaluate("document.body.innerText")
 
-            context = await browser.new_context(user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-            page = await context.new_page()
-            
-            try:
-                await page.goto(url, wait_until="domcontentloaded", timeout=45000)
-                await page.wait_for_timeout(5000) # Wait for hydration
-                page_content = await page.evaluate("document.body.innerText")
-                
-                if len(page_content) > 500:
-                   extraction_result = extract_metadata_from_text(page_content, url)
-                   return {"scraped_text": page_content[:15000], **extraction_result}
-            finally:
-                await browser.close()
-                
+        if len(page_content) > 500:
+            extraction_result = await extract_metadata_from_text(page_content, url) if extract else {}
+            return {"scraped_text": page_content[:15000], **extraction_result}
+    except BrowserPoolExhausted as e:
+        print(f"⏳ Playwright skipped, pool busy: {e}")
     except Exception as e:
         print(f"❌ Playwright execution error: {e}")
     
     return {}
 
-async def scrape_job_details(url: str) -> Dict[str, Any]:
+def _has_job_text(result: Dict[str, Any]) -> bool:
+    return bool(result.get("scraped_text"))
+
+async def scrape_job_details(url: str, extract_metadata: bool = True) -> Dict[str, Any]:
     """
     Main scraping entry point.
-    Strategy: 
-    1. Naukri -> Tavily (Option 3 - API based)
-    2. Others -> HTTPX -> Playwright
+    Strategies race with hedging (see strategy_engine): the next one starts if the
+    current leader is slow or fails, and the first usable result wins.
+    Default order (re-ranked per domain by observed success rate and latency):
+    1. Naukri -> curl_cffi -> Tavily -> Playwright -> HTTPX
+    2. Others -> HTTPX -> Playwright -> Tavily
+    extract_metadata=False skips the LLM metadata extraction (fused analysis does it later).
+    Bounded by the request deadline (see deadline.py) when there is one.
     """
     print(f"🕸️ Scraping URL: {url}...")
 
-    # SPECIAL HANDLING FOR NAUKRI
     if "naukri.com" in url:
-        print("⚡ Naukri URL detected: Using Advanced TLS Fingerprinting (curl_cffi)...")
-        # 1. Try curl_cffi (Best for evasion)
-        result = await scrape_with_curl_cffi(url)
-        if result:
-            return result
-        
-        # 2. Try Search Snippets (Tavily - Option 3)
-        print("⚠️ curl_cffi failed. Trying Search Snippets (Option 3)...")
-        result = await scrape_with_tavily(url)
-        if result:
-            return result
-        
-        # 3. Fallback to Playwright
-        if PLAYWRIGHT_AVAILABLE:
-             print("⚠️ Tavily failed. Trying Playwright fallback...")
-             result = await scrape_with_playwright(url)
-             if result: return result
+        print("⚡ Naukri URL detected: leading with Advanced TLS Fingerprinting (curl_cffi)...")
+        strategies = [
+            ("curl_cffi", lambda: scrape_with_curl_cffi(url, extract_metadata)),
+            ("tavily", lambda: scrape_with_tavily(url, extract_metadata)),
+            ("playwright", lambda: scrape_with_playwright(url, extract_metadata)),
+            ("httpx", lambda: scrape_with_httpx(url, extract_metadata)),
+        ]
+    else:
+        strategies = [
+            ("httpx", lambda: scrape_with_httpx(url, extract_metadata)),
+            ("playwright", lambda: scrape_with_playwright(url, extract_metadata)),
+            ("tavily", lambda: scrape_with_tavily(url, extract_metadata)),
+        ]
+
+    if not PLAYWRIGHT_AVAILABLE:
+        strategies = [s for s in strategies if s[0] != "playwright"]
 
-    # 1. Try HTTPX first (Standard Strategy for non-Naukri)
-    result = await scrape_with_httpx(url)
+    try:
+        # Strategies keep their own timeouts, the request deadline cancels whatever is still running
+        result = await deadline.wait_for(strategy_engine.race(url, strategies, accept=_has_job_text))
+    except deadline.DeadlineExceeded:
+        print("⏱️ Scraping ran out of time budget.")
+        return {"error": "Timed out extracting content. Please paste Job Description manually."}
     if result:
         return result
-        
-    # 2. Try Playwright only if HTTPX failed
-    try:
-        if PLAYWRIGHT_AVAILABLE:
-            result = await scrape_with_playwright(url)
-            if result:
-                return result
-    except Exception:
-        pass
-        
-    # 3. Last Resort: Tavily (if everything else failed)
-    print("⚠️ Standard methods failed. Trying Tavily as last resort...")
-    result = await scrape_with_tavily(url)
-    if result: return result
 
     print("❌ All scraping methods failed.")
     return {
@@ -0,0 +1,215 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+from circuit_breaker import CLOSED, CircuitBreaker
+from metrics import IN_FLIGHT, STRATEGY_SECONDS, registry, CallbackMetric
+
+SCRAPE_HEDGE_DELAY = float(os.getenv("SCRAPE_HEDGE_DELAY", "3.0"))
+SCRAPE_BREAKER_THRESHOLD = int(os.getenv("SCRAPE_BREAKER_THRESHOLD", "5"))
+SCRAPE_BREAKER_RESET_SECONDS = float(os.getenv("SCRAPE_BREAKER_RESET_SECONDS", "120"))
+SCRAPE_BREAKER_MAX = int(os.getenv("SCRAPE_BREAKER_MAX", "1024")) # (domain, strategy) breakers kept, LRU
+SCRAPE_STATS_MAX_DOMAINS = int(os.getenv("SCRAPE_STATS_MAX_DOMAINS", "512")) # Domains with stats kept, LRU
+
+# Prior used until a strategy has history on a domain (keeps the default order on ties)
+PRIOR_LATENCY = 5.0
+EWMA_ALPHA = 0.3
+
+Strategy = Tuple[str, Callable[[], Awaitable[Dict[str, Any]]]]
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+def lru_entry(entries: "OrderedDict[K, V]", key: K, create: Callable[[], V], maxsize: int) -> V:
+    """
+    entries[key] as most recently used, created if missing; the least recently used
+    entries are dropped past maxsize. Per-domain state is unbounded otherwise.
+    """
+    value = entries.get(key)
+    if value is not None:
+        entries.move_to_end(key)
+        return value
+    value = entries[key] = create()
+    while len(entries) > maxsize:
+        entries.popitem(last=False)
+    return value
+
+
+def domain_of(url: str) -> str:
+    host = urlsplit(url).netloc.lower().split(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+class StrategyStats:
+    """
+    Success rate and EWMA latency of one strategy on one domain.
+    """
+
+    def __init__(self):
+        self.attempts = 0
+        self.successes = 0
+        self.latency = PRIOR_LATENCY
+
+    def record(self, ok: bool, seconds: float):
+        self.latency = seconds if self.attempts == 0 else (1 - EWMA_ALPHA) * self.latency + EWMA_ALPHA * seconds
+        self.attempts += 1
+        self.successes += int(ok)
+
+    @property
+    def success_rate(self) -> float:
+        # Laplace smoothing so one early failure doesn't bury a strategy forever
+        return (self.successes + 1) / (self.attempts + 2)
+
+    @property
+    def expected_cost(self) -> float:
+        """
+        Expected seconds spent per successful scrape. Lower is tried first.
+        """
+        return self.latency / self.success_rate
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "success_rate": round(self.success_rate, 3),
+            "latency_ewma": round(self.latency, 3),
+        }
+
+
+class StrategyEngine:
+    """
+    Runs scrape strategies as a hedged race: start the best-ranked one, start the next
+    if nothing acceptable arrived after hedge_delay (or right away when one fails),
+    take the first acceptable result and cancel the rest.
+    Per-domain stats reorder strategies so the fastest reliable one goes first, and a
+    per-domain circuit breaker skips a strategy that keeps failing there (e.g. blocked).
+    """
+
+    def __init__(self, hedge_delay: float = SCRAPE_HEDGE_DELAY, max_breakers: int = SCRAPE_BREAKER_MAX,
+                 max_domains: int = SCRAPE_STATS_MAX_DOMAINS):
+        self.hedge_delay = hedge_delay
+        self.max_breakers = max_breakers
+        self.max_domains = max_domains
+        self._stats: "OrderedDict[str, Dict[str, StrategyStats]]" = OrderedDict()
+        self._breakers: "OrderedDict[Tuple[str, str], CircuitBreaker]" = OrderedDict()
+
+    def _stats_for(self, domain: str, name: str) -> StrategyStats:
+        by_name = lru_entry(self._stats, domain, dict, self.max_domains)
+        return by_name.setdefault(name, StrategyStats())
+
+    def _breaker_for(self, domain: str, name: str) -> CircuitBreaker:
+        """
+        The (domain, strategy) breaker, kept in a bounded LRU. Not in the global breaker
+        registry: domains are unbounded, so they're only exported as an open count.
+        """
+        return lru_entry(
+            self._breakers, (domain, name),
+            lambda: CircuitBreaker(f"{name}@{domain}", SCRAPE_BREAKER_THRESHOLD, SCRAPE_BREAKER_RESET_SECONDS, register=False),
+            self.max_breakers,
+        )
+
+    def _circuit_state(self, domain: str, name: str) -> str:
+        breaker = self._breakers.get((domain, name)) # Peek, don't create or refresh
+        return breaker.state if breaker else CLOSED
+
+    def open_breakers(self) -> int:
+        return sum(1 for breaker in self._breakers.values() if breaker.state != CLOSED)
+
+    def order(self, domain: str, strategies: List[Strategy]) -> List[Strategy]:
+        ranked = sorted(
+            enumerate(strategies),
+            key=lambda item: (self._stats_for(domain, item[1][0]).expected_cost, item[0]),
+        )
+        return [strategy for _, strategy in ranked]
+
+    async def race(
+        self,
+        url: str,
+        strategies: List[Strategy],
+        accept: Callable[[Dict[str, Any]], bool],
+        hedge_delay: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Returns the first acceptable result, or {} if every strategy fails or is switched off
+        by its breaker.
+        """
+        domain = domain_of(url)
+        delay = self.hedge_delay if hedge_delay is None else hedge_delay
+        queue = self.order(domain, strategies)
+        running: Dict[asyncio.Task, Tuple[str, float]] = {}
+
+        def launch_next():
+            while queue:
+                name, run = queue.pop(0)
+                if not self._breaker_for(domain, name).allow():
+                    print(f"⛔ Skipping scrape strategy '{name}' for {domain}, circuit open")
+                    continue
+                print(f"🏁 Launching scrape strategy '{name}' for {domain}")
+                IN_FLIGHT.inc(kind="strategy", name=name)
+                running[asyncio.ensure_future(run())] = (name, time.perf_counter())
+                return
+
+        try:
+            launch_next()
+            while running:
+                done, _ = await asyncio.wait(
+                    running.keys(),
+                    timeout=delay if queue else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    launch_next() # Hedge: current leader is slow
+                    continue
+
+                for task in done:
+                    name, started = running.pop(task)
+                    elapsed = time.perf_counter() - started
+                    IN_FLIGHT.dec(kind="strategy", name=name)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        print(f"⚠️ Strategy '{name}' raised: {e}")
+                        result = {}
+                    ok = bool(result) and accept(result)
+                    self._stats_for(domain, name).record(ok, elapsed)
+                    if ok:
+                        self._breaker_for(domain, name).record_success()
+                    else:
+                        self._breaker_for(domain, name).record_failure()
+                    STRATEGY_SECONDS.observe(elapsed, strategy=name, outcome="win" if ok else "fail")
+                    if ok:
+                        print(f"✅ Strategy '{name}' won for {domain} in {elapsed:.2f}s")
+                        return result
+
+                if queue and len(running) == 0:
+                    launch_next() # Leader failed, don't wait out the hedge delay
+            return {}
+        finally:
+            for task, (name, started) in running.items():
+                task.cancel()
+                self._breaker_for(domain, name).release() # Lost the race, says nothing about health
+                IN_FLIGHT.dec(kind="strategy", name=name)
+                STRATEGY_SECONDS.observe(time.perf_counter() - started, strategy=name, outcome="cancelled")
+
+    def snapshot(self, limit: Optional[int] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Stats of the `limit` most recently scraped domains (all tracked ones by default).
+        """
+        domains = list(reversed(self._stats))[:limit]
+        return {
+            domain: {
+                name: {**stats.as_dict(), "circuit": self._circuit_state(domain, name)}
+                for name, stats in self._stats[domain].items()
+            }
+            for domain in domains
+        }
+
+
+strategy_engine = StrategyEngine()
+
+registry.register(CallbackMetric(
+    "verijob_scrape_circuits_open", "Per-domain scrape strategy breakers currently open or half-open."
+)).add(lambda: [({}, strategy_engine.open_breakers())])
@@ -1,14 +1,22 @@
 -- Create Verified Jobs Table
+-- The backend keeps the same table locally in SQLite (verification_store.py)
 create table verified_jobs (
   id bigint generated by default as identity primary key,
   title text not null,
   company text not null,
   url text not null,
+  canonical_url text not null, -- tracking params stripped, see canonical_job_url
+  content_hash text not null default '', -- '' when the backend scraped the page itself
   score int not null,
   status text not null,
+  result jsonb not null, -- full verification response
   created_at timestamp with time zone default timezone('utc'::text, now()) not null
 );
 
+create index if not exists verified_jobs_canonical_url_idx on verified_jobs (canonical_url, content_hash, created_at desc);
+create index if not exists verified_jobs_company_idx on verified_jobs (company);
+create index if not exists verified_jobs_created_at_idx on verified_jobs (created_at desc);
+
 -- Create Reports Table
 create table reports (
   id bigint generated by default as identity primary key,
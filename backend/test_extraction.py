@@ -1,3 +1,4 @@
+import asyncio
 from dotenv import load_dotenv
 import os
 load_dotenv()
@@ -13,5 +14,5 @@ Posted 2 days ago.
 """
 print(f"Testing extraction...")
 
-result = extract_metadata_from_text(sample_text, "http://example.com")
+result = asyncio.run(extract_metadata_from_text(sample_text, "http://example.com"))
 print(f"\nExtraction Result: {result}")
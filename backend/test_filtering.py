@@ -1,3 +1,4 @@
+import asyncio
 from dotenv import load_dotenv
 import os
 load_dotenv()
@@ -10,11 +11,11 @@ role = "Data Analyst"
 print(f"Testing filtered search for: {company} - {role}")
 
 print("\n--- Health News ---")
-health = search_company_health(company, role)
+health = asyncio.run(search_company_health(company, role))
 for link in health.get('links', []):
     print(f" [KEEP] {link['title']}")
 
 print("\n--- Reddit ---")
-reddit = search_reddit_sentiment(company, role)
+reddit = asyncio.run(search_reddit_sentiment(company, role))
 for link in reddit.get('links', []):
     print(f" [KEEP] {link['title']}")
@@ -27,7 +27,7 @@ async def test_flow():
     
     # 1. Test Metadata Extraction
     print("\n1. Testing Metadata Extraction...")
-    metadata = extract_metadata_from_text(tcs_jd, "http://tcs.com/job")
+    metadata = await extract_metadata_from_text(tcs_jd, "http://tcs.com/job")
     print(f"Extraction Result: {metadata}")
     
     # 2. Test Verification Logic (Agent)
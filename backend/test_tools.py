@@ -1,3 +1,4 @@
+import asyncio
 from dotenv import load_dotenv
 import os
 load_dotenv()
@@ -9,8 +10,8 @@ print(f"API Key present: {'Yes' if os.getenv('TAVILY_API_KEY') else 'No'}")
 company = "Google" # Known entity
 print(f"Testing search for: {company}")
 
-health = search_company_health(company)
+health = asyncio.run(search_company_health(company))
 print(f"\nHealth Results: {health}")
 
-reddit = search_reddit_sentiment(company)
+reddit = asyncio.run(search_reddit_sentiment(company))
 print(f"\nReddit Results: {reddit}")
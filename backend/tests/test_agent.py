@@ -58,3 +58,209 @@ async def test_agent_stale_job():
         # Base 50 + 10 (Health) + 10 (Analysis) - 30 (Stale) = 40
         assert result['final_score'] == 40
         assert result['temporal_analysis']['is_stale'] is True
+
+@pytest.mark.asyncio
+async def test_agent_branches_run_in_parallel():
+    import asyncio
+    import time
+    initial_state = {
+        "url": "http://example.com/parallel",
+        "metadata": {"company": "Test Corp", "title": "Dev", "scraped_text": "We are hiring engineers. " * 20},
+        "health_data": "",
+        "analysis": {},
+        "final_score": 0,
+        "final_reasoning": ""
+    }
+
+    async def slow_search(company_name, job_title=""):
+        await asyncio.sleep(0.3)
+        return {"summary": "No news.", "links": []}
+
+    async def slow_analyze(jd_text):
+        await asyncio.sleep(0.3)
+        return {"raw_analysis": "low probability"}
+
+    with patch('agent.search_company_health', new=slow_search), \
+         patch('agent.search_reddit_sentiment', new=slow_search), \
+         patch('agent.analyze_job_description', new=slow_analyze):
+
+        started = time.perf_counter()
+        result = await agent_graph.ainvoke(initial_state)
+        elapsed = time.perf_counter() - started
+
+    # Three 0.3s calls back to back would take ~0.9s
+    assert elapsed < 0.75
+    assert result['health_data'] == "No news."
+    assert result['analysis'] == {"raw_analysis": "low probability"}
+    assert result['final_score'] > 0
+
+@pytest.mark.asyncio
+async def test_fused_graph_uses_one_llm_call_when_company_is_known(tmp_path):
+    import agent
+    import tools
+    from intel_store import CompanyIntelStore
+    from tools import FusedJobAnalysis
+
+    raw = {
+        "news": [{"title": "Acme layoffs", "content": "Acme cut 10%", "url": "https://n/1"},
+                 {"title": "Top 10 layoffs", "content": "generic", "url": "https://n/2"}],
+        "reddit": [{"title": "Acme ghosted me", "content": "ghosting", "url": "https://r/1"}],
+    }
+    fused_calls = []
+
+    async def fake_raw(kind, company_name, job_title=""):
+        return raw[kind]
+
+    async def fake_fused(jd_text, url, sources=None, company_hint=""):
+        fused_calls.append(sources)
+        return FusedJobAnalysis(title="Backend Dev", company="Acme", posted_date="2025-01-02",
+                                ghost_probability=20, relevant_news_ids=[0], relevant_reddit_ids=[0, 7])
+
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("multi-call path should not run")
+
+    state = {
+        "url": "https://jobs.test/acme",
+        "metadata": {"company": "Acme", "title": "UNKNOWN_ROLE", "scraped_text": "Python backend role, salary ₹20L. " * 10},
+        "health_data": "", "analysis": {}, "final_score": 0, "final_reasoning": ""
+    }
+    with patch.object(tools, "tavily_api_key", "test"), \
+         patch.object(agent, "company_intel", CompanyIntelStore(path=str(tmp_path / "intel.db"))), \
+         patch.object(agent, "search_raw_intel", new=fake_raw), \
+         patch.object(agent, "fused_job_analysis", new=fake_fused), \
+         patch.object(agent, "filter_sources_combined", new=unexpected), \
+         patch.object(agent, "filter_irrelevant_sources", new=unexpected), \
+         patch.object(agent, "analyze_job_description", new=unexpected):
+        result = await agent.fused_agent_graph.ainvoke(state)
+
+    assert len(fused_calls) == 1 and fused_calls[0] == raw
+    assert result["metadata"]["title"] == "Backend Dev"  # placeholder replaced
+    assert [l["url"] for l in result["health_links"]] == ["https://n/1"]
+    assert [l["url"] for l in result["reddit_links"]] == ["https://r/1"]
+    assert '"ghost_probability": 20' in result["analysis"]["raw_analysis"]
+    assert "Temporal Status" in result["temporal_analysis"] or "WARNING" in result["temporal_analysis"]
+
+@pytest.mark.asyncio
+async def test_insufficient_text_costs_no_paid_calls():
+    import agent
+
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("paid call should not run")
+
+    state = {
+        "url": "https://jobs.test/empty",
+        "metadata": {"company": "Acme", "title": "Dev", "scraped_text": "Apply now"},
+        "health_data": "", "analysis": {}, "final_score": 0, "final_reasoning": ""
+    }
+    with patch.object(agent, "search_company_health", new=unexpected), \
+         patch.object(agent, "search_reddit_sentiment", new=unexpected), \
+         patch.object(agent, "analyze_job_description", new=unexpected):
+        result = await agent.agent_graph.ainvoke(state)
+
+    assert result["final_score"] == 0
+    assert "Insufficient" in result["final_reasoning"]
+
+@pytest.mark.asyncio
+async def test_decisive_local_signals_skip_search_and_llm(tmp_path):
+    import agent
+    from intel_store import CompanyIntelStore
+
+    store = CompanyIntelStore(path=str(tmp_path / "intel.db"))
+    store.put("Acme", "news", {"summary": "Acme announced layoffs in March.", "links": [{"url": "https://n/1"}]})
+
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("paid call should not run")
+
+    state = {
+        "url": "https://jobs.test/old",
+        "metadata": {"company": "Acme", "title": "Dev", "posted_date": "2023-01-01",
+                     "scraped_text": "Backend role on the payments team, Python and Postgres, 4 years experience. " * 5},
+        "health_data": "", "analysis": {}, "final_score": 0, "final_reasoning": ""
+    }
+    with patch.object(agent, "company_intel", store), \
+         patch.object(agent, "search_company_health", new=unexpected), \
+         patch.object(agent, "search_reddit_sentiment", new=unexpected), \
+         patch.object(agent, "analyze_job_description", new=unexpected):
+        result = await agent.agent_graph.ainvoke(state)
+
+    assert result["triage"] == "decisive"
+    assert result["final_score"] <= agent.VERIFIED_THRESHOLD
+    assert result["health_links"] == [{"url": "https://n/1"}]
+    assert "Deep checks skipped" in result["final_reasoning"]
+
+def test_score_notes_degraded_signals():
+    import agent
+
+    state = {
+        "url": "https://jobs.test/1",
+        "metadata": {"company": "Acme", "scraped_text": "Backend role on the payments team, Python and Postgres, 4 years experience. " * 5},
+        "health_data": "Error performing search: tavily circuit open, retrying in 30s",
+        "reddit_data": "No specific negative discussions found on Reddit.",
+        "analysis": {"error": "groq circuit open, retrying in 30s"},
+        "temporal_analysis": "Temporal Status: Unknown",
+    }
+    result = agent.score_node(state)
+
+    assert result["final_score"] > 0
+    assert "Degraded check: company news, AI JD analysis unavailable" in result["final_reasoning"]
+    assert result["degraded"] is True
+
+def test_degraded_results_are_not_cached_or_stored():
+    import verifier
+
+    result = {"status": "Unverified", "score": 60, "partial": False, "degraded": True,
+              "metadata": {"scraped_text": "x" * 500}}
+    assert not verifier._is_final(result)
+    assert not verifier._is_storable(result)
+    assert verifier._is_storable({**result, "degraded": False})
+
+@pytest.mark.asyncio
+async def test_slow_llm_is_cut_at_the_deadline_and_scored_partial():
+    import asyncio
+    import agent
+    import deadline
+    import tools
+    from langchain_core.runnables import RunnableLambda
+
+    async def slow_llm(prompt_value):
+        await asyncio.sleep(5)
+
+    async def no_news(company_name, job_title=""):
+        return {"summary": "No specific news found after filtering.", "links": []}
+
+    state = {
+        "url": "https://jobs.test/slow",
+        "metadata": {"company": "Acme", "title": "Dev",
+                     "scraped_text": "Backend role on the payments team, Python and Postgres, 4 years experience. " * 5},
+        "health_data": "", "analysis": {}, "final_score": 0, "final_reasoning": ""
+    }
+    with patch.object(tools, "llm", RunnableLambda(slow_llm)), \
+         patch.object(agent, "search_company_health", new=no_news), \
+         patch.object(agent, "search_reddit_sentiment", new=no_news), \
+         deadline.scope(0.2):
+        result = await asyncio.wait_for(agent.agent_graph.ainvoke(state), timeout=2)
+
+    assert result["partial"] is True
+    assert result["final_score"] > 0
+    assert "Partial result" in result["final_reasoning"]
+    assert tools.groq_breaker.state == "closed" # Our budget running out isn't a Groq outage
+
+def test_ghost_probability_penalty_uses_the_integer_when_present():
+    import json
+    import agent
+
+    def penalized(analysis):
+        state = {
+            "metadata": {"scraped_text": "Backend role on the payments team, Python and Postgres, 4 years experience. " * 5},
+            "analysis": analysis,
+        }
+        return any("Ghost Job" in reason for _, reason in agent._signal_penalties(state))
+
+    def fused(probability):
+        verdict = {"ghost_probability": probability, "main_concerns": [], "is_template": False}
+        return {"raw_analysis": json.dumps(verdict), **verdict}
+
+    assert not penalized(fused(9)) # Text match would read this as 90-something
+    assert penalized(fused(85))
+    assert penalized(fused(100)) # Text match would miss this
+    assert penalized({"raw_analysis": 'Verdict: {"ghost_probability": 85}'}) # Legacy free text
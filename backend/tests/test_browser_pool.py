@@ -0,0 +1,74 @@
+import pytest
+
+from browser_pool import BrowserPool, BrowserPoolExhausted
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def new_page(self):
+        return object()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self, **kwargs):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_pages_are_reused_then_recycled():
+    pool = BrowserPool(size=1, max_uses=2, acquire_timeout=1)
+    pool._browser = FakeBrowser()
+
+    seen = []
+    for _ in range(3):
+        async with pool.page() as page:
+            seen.append(page)
+
+    assert seen[0] is seen[1]
+    assert seen[2] is not seen[0]
+    assert pool._browser.contexts[0].closed
+    assert pool.recycled == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_discard_the_slot():
+    pool = BrowserPool(size=1, max_uses=10, acquire_timeout=1)
+    pool._browser = FakeBrowser()
+
+    with pytest.raises(RuntimeError):
+        async with pool.page():
+            raise RuntimeError("navigation crashed")
+
+    assert pool._browser.contexts[0].closed
+    assert pool.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_back_pressure_when_pool_is_exhausted():
+    pool = BrowserPool(size=1, max_uses=10, acquire_timeout=0.05)
+    pool._browser = FakeBrowser()
+
+    async with pool.page():
+        with pytest.raises(BrowserPoolExhausted):
+            async with pool.page():
+                pass
+
+    # Freed slot is available again
+    async with pool.page():
+        pass
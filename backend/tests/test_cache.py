@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+
+from cache import TTLCache, canonical_job_url, job_cache_key
+
+
+def test_canonical_job_url_strips_tracking_noise():
+    assert canonical_job_url("https://linkedin.com/jobs/search/?currentJobId=123&trk=abc") == \
+        "https://www.linkedin.com/jobs/view/123"
+    assert canonical_job_url("https://www.linkedin.com/jobs/view/senior-dev-at-acme-123/?refId=x#top") == \
+        "https://www.linkedin.com/jobs/view/123"
+    assert canonical_job_url("https://www.naukri.com/job-listings-dev-acme-123/?src=jobsearch&utm_source=x") == \
+        "https://www.naukri.com/job-listings-dev-acme-123"
+    assert canonical_job_url("https://boards.greenhouse.io/embed/job_app?token=42&for=acme&gh_src=abc&utm_medium=x") == \
+        "https://boards.greenhouse.io/embed/job_app?for=acme&token=42"
+    assert job_cache_key("https://x.com/j?id=1", "Some   JD text") == job_cache_key("https://x.com/j?id=1&utm=2", "some jd text")
+
+
+def test_naukri_search_position_does_not_change_the_key():
+    base = "https://www.naukri.com/job-listings-senior-backend-engineer-finlytics-bengaluru-5-to-8-years-140125500123"
+    from_search = canonical_job_url(f"{base}?src=jobsearchDesk&sid=17368412345678&xp=1&px=1")
+    from_page_two = canonical_job_url(f"{base}?src=jobsearchDesk&sid=17368499999999&xp=23&px=2&nignbevent_src=jobsearchDeskGNB")
+    assert from_search == from_page_two == base
+
+
+def test_canonical_job_url_keeps_job_identity_params():
+    # Unknown params may identify the job, so different jobs must not share a key
+    assert canonical_job_url("https://www.glassdoor.co.in/job-listing/x.htm?jl=1001&src=GD_JOB_AD") != \
+        canonical_job_url("https://www.glassdoor.co.in/job-listing/x.htm?jl=1002&src=GD_JOB_AD")
+    assert canonical_job_url("https://boards.greenhouse.io/embed/job_app?for=acme&token=1") != \
+        canonical_job_url("https://boards.greenhouse.io/embed/job_app?for=acme&token=2")
+
+
+def test_ttl_and_lru_eviction(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+    now[0] += 11
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_coalesce():
+    cache = TTLCache(maxsize=8, ttl=60)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"status": "Verified", "score": 90}
+
+    results = await asyncio.gather(*[cache.get_or_compute("job", compute) for _ in range(5)])
+    assert calls == 1
+    assert all(r["score"] == 90 for r in results)
+
+    await cache.get_or_compute("job", compute)
+    stats = cache.stats()
+    assert calls == 1
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 4, 1)
+
+
+@pytest.mark.asyncio
+async def test_uncacheable_results_are_not_stored():
+    cache = TTLCache()
+
+    async def compute():
+        return {"status": "Error"}
+
+    await cache.get_or_compute("job", compute, should_cache=lambda r: r["status"] != "Error")
+    assert cache.get("job") is None
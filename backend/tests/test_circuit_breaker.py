@@ -0,0 +1,52 @@
+import asyncio
+import time
+import httpx
+import pytest
+
+from circuit_breaker import CircuitBreaker, CircuitOpen, is_outage
+
+
+def test_breaker_opens_after_threshold_and_probes_when_half_open():
+    breaker = CircuitBreaker("test-provider", failure_threshold=2, reset_seconds=0.05)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert breaker.allow() # The probe
+    assert not breaker.allow() # Only one at a time
+
+    breaker.record_failure() # Failed probe reopens right away
+    assert breaker.state == "open"
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.stats()["opens"] == 1 # Reopening from half-open is the same outage
+
+
+@pytest.mark.asyncio
+async def test_call_fails_fast_and_only_counts_outages():
+    breaker = CircuitBreaker("test-call", failure_threshold=1, reset_seconds=60)
+    request = httpx.Request("POST", "https://api.example/search")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        with breaker.call():
+            raise httpx.HTTPStatusError("bad query", request=request, response=httpx.Response(400, request=request))
+    assert breaker.state == "closed" # The provider answered
+
+    with pytest.raises(asyncio.TimeoutError):
+        with breaker.call():
+            raise asyncio.TimeoutError()
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpen):
+        with breaker.call():
+            pytest.fail("should not run")
+
+    assert is_outage(httpx.ConnectError("down"))
+    assert not is_outage(httpx.HTTPStatusError("slow down", request=request, response=httpx.Response(429, request=request)))
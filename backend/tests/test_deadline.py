@@ -0,0 +1,28 @@
+import asyncio
+import pytest
+
+import deadline
+
+
+@pytest.mark.asyncio
+async def test_scope_keeps_the_tighter_deadline():
+    assert deadline.remaining() is None
+    with deadline.scope(0.2):
+        with deadline.scope(10):
+            assert deadline.remaining() <= 0.2
+        assert deadline.budget(5) <= 0.2
+        assert deadline.budget(0.01) == 0.01
+    assert deadline.remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_wait_for_tells_deadline_from_own_timeout():
+    with pytest.raises(asyncio.TimeoutError):
+        await deadline.wait_for(asyncio.sleep(1), timeout=0.01)
+
+    with deadline.scope(0.05):
+        with pytest.raises(deadline.DeadlineExceeded):
+            await deadline.wait_for(asyncio.sleep(1), timeout=5)
+        assert deadline.expired()
+        with pytest.raises(deadline.DeadlineExceeded):
+            await deadline.wait_for(asyncio.sleep(0)) # Nothing left to start with
@@ -0,0 +1,46 @@
+import asyncio
+import pytest
+
+from feed import FeedCache
+
+
+@pytest.mark.asyncio
+async def test_stale_feed_is_served_immediately_and_refreshed_once():
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            await release.wait()
+        return [{"company": f"Acme {calls}"}]
+
+    feed = FeedCache(fetch, refresh_seconds=0)
+    assert await feed.get() == [{"company": "Acme 1"}] # Cold start waits for the first copy
+
+    # Stale: old copy comes back at once, a single refresh runs behind it
+    results = await asyncio.gather(*[feed.get() for _ in range(5)])
+    assert all(r == [{"company": "Acme 1"}] for r in results)
+    assert calls == 2
+
+    release.set()
+    await feed.refresh()
+    assert feed.signals == [{"company": "Acme 2"}]
+    await feed.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_previous_copy():
+    responses = [[{"company": "Acme"}], []]
+
+    async def fetch():
+        return responses.pop(0)
+
+    feed = FeedCache(fetch, refresh_seconds=3600)
+    await feed.refresh()
+    etag = feed.etag
+    await feed.refresh()
+    assert feed.signals == [{"company": "Acme"}]
+    assert feed.etag == etag
+    assert feed.stats()["failures"] == 1
@@ -0,0 +1,83 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from html_parse import naukri_soup, page_text
+from scraper import scrape_naukri_specific
+
+NAUKRI_PAGE = """
+<html><head><title>Backend Engineer - Acme | Naukri.com</title>
+<meta property="og:title" content="Backend Engineer">
+<script type="application/ld+json">{"title": "Backend Engineer", "hiringOrganization": {"name": "Acme"}}</script>
+<script>window.__STATE__ = {"huge": "bundle"}</script>
+</head><body>
+<nav><a href="/">Jobs</a><a href="/companies">Companies</a></nav>
+<header class="styles_jd-header__kv1aP"><h1>Backend Engineer</h1></header>
+<div class="sidebar"><p>Similar jobs you may like</p></div>
+<div class="styles_job-desc-container__txpYf"><p>Build APIs in Python.</p><ul><li>3+ years</li></ul></div>
+<footer>About us</footer>
+</body></html>
+"""
+
+
+def test_strained_naukri_parse_matches_full_parse():
+    full = scrape_naukri_specific(BeautifulSoup(NAUKRI_PAGE, "html.parser"))
+    strained_soup = naukri_soup(NAUKRI_PAGE)
+    assert scrape_naukri_specific(strained_soup) == full
+    assert full["company"] == "Acme"
+    assert "Similar jobs" not in strained_soup.get_text() # Unrelated subtrees never built
+
+
+def test_page_text_drops_boilerplate():
+    text = page_text(NAUKRI_PAGE)
+    assert "Build APIs in Python." in text
+    assert "About us" not in text and "__STATE__" not in text
+
+
+GENERIC_PAGE_HEAD = """
+<html><head><title>Careers</title>
+<script type="application/ld+json">{"@context": "https://schema.org", "@graph": [
+  {"@type": "WebSite", "name": "Acme Careers"},
+  {"@type": "JobPosting", "title": "Data Engineer", "hiringOrganization": {"@type": "Organization", "name": "Acme"},
+   "description": "&lt;p&gt;Own our Spark pipelines.&lt;/p&gt;&lt;ul&gt;&lt;li&gt;4+ years&lt;/li&gt;&lt;/ul&gt;"}
+]}</script>
+<script>window.__STATE__ = {"huge": "bundle"}</script>
+</head><body><nav>Jobs</nav>
+"""
+
+
+def test_job_posting_json_ld_gives_jd_when_visible_text_was_cut_off():
+    from scraper import parse_job_posting_json_ld
+
+    posting = parse_job_posting_json_ld(GENERIC_PAGE_HEAD)
+    assert posting["title"] == "Data Engineer"
+    assert posting["company"] == "Acme"
+    assert "Own our Spark pipelines." in posting["scraped_text"]
+    assert "<p>" not in posting["scraped_text"]
+    assert "Spark" not in page_text(GENERIC_PAGE_HEAD) # What the generic path would have seen
+    assert parse_job_posting_json_ld(NAUKRI_PAGE) == {} # No JobPosting type
+
+
+@pytest.mark.asyncio
+async def test_truncated_generic_page_is_scraped_from_json_ld(monkeypatch):
+    import scraper
+    from http_pool import CappedPage
+
+    async def fetch_httpx(url, sentinel=None):
+        return CappedPage(200, GENERIC_PAGE_HEAD, len(GENERIC_PAGE_HEAD), True)
+
+    monkeypatch.setattr(scraper.http_pool, "fetch_httpx", fetch_httpx)
+    result = await scraper.scrape_with_httpx("https://careers.acme.test/jobs/42")
+    assert result["company"] == "Acme"
+    assert "Spark pipelines" in result["scraped_text"]
+
+
+def test_bench_fixture_has_a_jd_and_strained_parse_matches():
+    import os
+
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench_naukri_job.html")
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    full = scrape_naukri_specific(BeautifulSoup(html, "html.parser"))
+    assert full["company"] == "Finlytics Technologies"
+    assert "Payments Platform team" in full["scraped_text"]
+    assert scrape_naukri_specific(naukri_soup(html)) == full
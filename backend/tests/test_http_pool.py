@@ -0,0 +1,91 @@
+import asyncio
+import pytest
+
+from http_pool import HttpPool
+
+
+@pytest.mark.asyncio
+async def test_per_host_concurrency_cap():
+    pool = HttpPool(per_host=2)
+    in_flight = {"a.com": 0, "b.com": 0}
+    peak = {"a.com": 0, "b.com": 0}
+
+    async def fetch(host):
+        async with pool.host_slot(f"https://{host}/job"):
+            in_flight[host] += 1
+            peak[host] = max(peak[host], in_flight[host])
+            await asyncio.sleep(0.01)
+            in_flight[host] -= 1
+
+    await asyncio.gather(*[fetch(h) for h in ["a.com"] * 6 + ["b.com"] * 6])
+    assert peak == {"a.com": 2, "b.com": 2}
+
+
+@pytest.mark.asyncio
+async def test_httpx_client_is_shared_and_closed():
+    pool = HttpPool()
+    client = pool.httpx_client()
+    assert pool.httpx_client() is client
+    await pool.aclose()
+    assert client.is_closed
+
+
+def _streamed_page(chunks, served):
+    import httpx
+
+    async def body():
+        for chunk in chunks:
+            served.append(chunk)
+            yield chunk
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body())))
+
+
+@pytest.mark.asyncio
+async def test_fetch_stops_at_byte_cap():
+    served = []
+    pool = HttpPool()
+    pool._check_loop()
+    pool._httpx = _streamed_page([b"<html>" + b"x" * 1000] * 100, served)
+
+    page = await pool.fetch_httpx("https://jobs.test/huge", max_bytes=5000)
+    assert page.truncated and page.bytes_read == 5000
+    assert len(served) < 10
+
+
+@pytest.mark.asyncio
+async def test_fetch_stops_after_jd_marker():
+    from http_pool import Sentinel
+
+    served = []
+    chunks = [b"<head>" + b" " * 500, b'<div class="styles_job-', b'desc-container">Build APIs', b"</div>"] + [b"<script>" + b"s" * 1000] * 50
+    pool = HttpPool()
+    pool._check_loop()
+    pool._httpx = _streamed_page(chunks, served)
+
+    page = await pool.fetch_httpx("https://www.naukri.com/job", sentinel=Sentinel(b"job-desc", margin=100))
+    assert page.truncated
+    assert "Build APIs</div>" in page.text
+    assert len(served) < 10
+
+
+@pytest.mark.asyncio
+async def test_host_slots_are_bounded_and_keep_busy_hosts():
+    pool = HttpPool(per_host=1, max_hosts=2)
+    release = asyncio.Event()
+
+    async def hold(host):
+        async with pool.host_slot(f"https://{host}/job"):
+            await release.wait()
+
+    busy = asyncio.ensure_future(hold("busy.com"))
+    await asyncio.sleep(0)
+    for i in range(5):
+        async with pool.host_slot(f"https://site{i}.com/job"):
+            pass
+
+    assert len(pool._host_slots) == 2
+    assert "busy.com" in pool._host_slots # In use, never evicted
+    release.set()
+    await busy
+    assert pool._host_users == {}
@@ -0,0 +1,47 @@
+import asyncio
+import pytest
+
+from intel_store import CompanyIntelStore, normalize_company_name
+
+
+def test_normalize_company_name():
+    assert normalize_company_name("Acme Pvt. Ltd.") == "acme"
+    assert normalize_company_name("ACME Inc") == "acme"
+    assert normalize_company_name("Tata Consultancy Services") == "tata consultancy services"
+    assert normalize_company_name("Unknown Company") is None
+    assert normalize_company_name("UNKNOWN_ENTITY") is None
+
+
+@pytest.mark.asyncio
+async def test_one_fetch_per_company_across_postings(tmp_path):
+    store = CompanyIntelStore(path=str(tmp_path / "intel.db"))
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return {"summary": "No layoffs.", "links": []}
+
+    names = ["Acme Inc", "ACME", "Acme Ltd."] * 10
+    results = await asyncio.gather(*[store.get_or_fetch(n, "news", fetch) for n in names])
+    assert calls == 1
+    assert all(r["summary"] == "No layoffs." for r in results)
+
+    # Persisted across restarts
+    store.close()
+    reopened = CompanyIntelStore(path=str(tmp_path / "intel.db"))
+    assert reopened.get("acme", "news") == {"summary": "No layoffs.", "links": []}
+    assert reopened.get("acme", "reddit") is None
+
+
+def test_kinds_have_separate_freshness(tmp_path, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr("intel_store.time.time", lambda: now[0])
+    store = CompanyIntelStore(path=str(tmp_path / "intel.db"), ttls={"news": 10, "reddit": 100})
+    store.put("Acme", "news", {"summary": "n"})
+    store.put("Acme", "reddit", {"summary": "r"})
+
+    now[0] += 50
+    assert store.get("Acme", "news") is None
+    assert store.get("Acme", "reddit") == {"summary": "r"}
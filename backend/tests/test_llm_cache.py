@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from llm_cache import LLMCache, cache_key
+
+
+def test_key_ignores_case_and_whitespace_but_not_model_or_prompt_version():
+    base = cache_key("llama", "analyze-v1", "Backend Engineer\n\nPython,  Postgres")
+    assert cache_key("llama", "analyze-v1", "  backend engineer python, postgres ") == base
+    assert cache_key("llama", "analyze-v1", "Backend​ Engineer Python, Postgres") == base
+    assert cache_key("llama", "analyze-v2", "Backend Engineer Python, Postgres") != base
+    assert cache_key("mixtral", "analyze-v1", "Backend Engineer Python, Postgres") != base
+    assert cache_key("llama", "analyze-v1", "Backend Engineer Python, Postgres", "naukri.com") != base
+
+
+def test_evicts_least_recently_used_past_max_bytes(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "llm.db"), max_bytes=350)
+    for i in range(3):
+        cache.put(f"k{i}", "analyze", {"raw_analysis": "x" * 80})
+    cache.get("k0") # k1 is now the least recently used
+    cache.put("k3", "analyze", {"raw_analysis": "x" * 80})
+
+    assert cache.get("k1") is None
+    assert cache.get("k0") is not None and cache.get("k3") is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= 350
+
+    reopened = LLMCache(path=str(tmp_path / "llm.db"), max_bytes=350)
+    assert reopened.get("k3") == {"raw_analysis": "x" * 80}
+
+
+@pytest.mark.asyncio
+async def test_reposted_jd_skips_the_llm(tmp_path):
+    import tools
+    from langchain_core.messages import AIMessage
+    from langchain_core.runnables import RunnableLambda
+
+    calls = 0
+
+    async def fake_llm(prompt_value):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return AIMessage(content='{"ghost_probability": 10}')
+
+    jd = "Backend engineer on the payments team. Python, Postgres, Kafka."
+    cache = LLMCache(path=str(tmp_path / "llm.db"))
+    with patch.object(tools, "llm", RunnableLambda(fake_llm)), patch.object(tools, "llm_cache", cache):
+        first, concurrent = await asyncio.gather(
+            tools.analyze_job_description(jd), tools.analyze_job_description(jd)
+        )
+        repost = await tools.analyze_job_description("  " + jd.upper().replace(" ", "\n"))
+
+    assert calls == 1
+    assert first == concurrent == repost == {"raw_analysis": '{"ghost_probability": 10}'}
+    assert cache.stats()["hits"] == 1 and cache.stats()["coalesced"] == 1
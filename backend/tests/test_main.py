@@ -15,3 +15,111 @@ def test_verify_job_mock():
     data = response.json()
     assert data["status"] in ["Verified", "Unverified", "Error"]
     assert "score" in data
+
+def test_liveness_and_readiness(monkeypatch):
+    assert client.get("/healthz").json() == {"status": "alive"}
+
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+    monkeypatch.setenv("TAVILY_API_KEY", "test")
+    with TestClient(app) as booted:
+        response = booted.get("/readyz")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["checks"]["startup_complete"] is True
+    assert body["browser"] in ["installed", "missing", "installing", "unavailable"]
+
+    monkeypatch.delenv("GROQ_API_KEY")
+    assert client.get("/readyz").status_code == 503
+
+def test_verify_batch_streams_ndjson_in_completion_order(monkeypatch):
+    import asyncio
+    import json
+    import verifier
+
+    async def fake_verify(url, content=None):
+        await asyncio.sleep(0.2 if url.endswith("slow") else 0.01)
+        if url.endswith("boom"):
+            raise RuntimeError("scrape exploded")
+        return {"status": "Verified", "score": 90}
+
+    monkeypatch.setattr(verifier, "verify_job_listing", fake_verify)
+    payload = [{"url": "https://jobs.test/slow"}, {"url": "https://jobs.test/fast"}, {"url": "https://jobs.test/boom"}]
+
+    with client.stream("POST", "/verify/batch", json=payload) as response:
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert [line["index"] for line in lines][-1] == 0
+    assert {line["url"]: line["status"] for line in lines} == {
+        "https://jobs.test/slow": "Verified",
+        "https://jobs.test/fast": "Verified",
+        "https://jobs.test/boom": "Error",
+    }
+
+def test_verify_stream_emits_stage_events(monkeypatch, tmp_path):
+    import asyncio
+    import json
+    import agent
+    import verifier
+    from verification_store import VerificationStore
+
+    async def fake_metadata(url, content=None):
+        return {"company": "Acme", "title": "Dev", "scraped_text": "Python backend role with salary and benefits. " * 10}
+
+    async def fake_search(company_name, job_title=""):
+        await asyncio.sleep(0.05)
+        return {"summary": "No news.", "links": []}
+
+    async def fake_analyze(jd_text):
+        return {"raw_analysis": "low probability"}
+
+    monkeypatch.setattr(verifier, "prepare_metadata", fake_metadata)
+    monkeypatch.setattr(verifier, "verification_store", VerificationStore(path=str(tmp_path / "verifications.db")))
+    monkeypatch.setattr(agent, "search_company_health", fake_search)
+    monkeypatch.setattr(agent, "search_reddit_sentiment", fake_search)
+    monkeypatch.setattr(agent, "analyze_job_description", fake_analyze)
+
+    with client.stream("POST", "/verify/stream", json={"url": "https://jobs.test/stream-1"}) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = "".join(response.iter_text())
+
+    frames = [f for f in body.split("\n\n") if f]
+    events = [f.split("\n")[0].removeprefix("event: ") for f in frames]
+    assert events[0] == "metadata"
+    assert events[-2:] == ["score", "result"]
+    assert {"health", "reddit", "analysis", "temporal"} <= set(events)
+    assert events.index("analysis") < events.index("health")  # analysis finished first, streamed first
+
+    result = json.loads(frames[-1].split("data: ", 1)[1])
+    assert result["metadata"]["company"] == "Acme"
+    assert result["score"] > 0
+
+def test_feed_etag_and_not_modified(monkeypatch):
+    from feed import feed_cache
+
+    async def fake_fetch():
+        return [{"company": "Acme", "title": "Acme raises Series B", "type": "FUNDING"}]
+
+    monkeypatch.setattr(feed_cache, "fetch", fake_fetch)
+    monkeypatch.setattr(feed_cache, "signals", None)
+    response = client.get("/feed")
+    assert response.status_code == 200
+    assert response.json()[0]["company"] == "Acme"
+    assert "max-age" in response.headers["cache-control"]
+
+    cached = client.get("/feed", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+def test_metrics_endpoint_exposes_node_histograms():
+    import asyncio
+    import agent
+
+    state = {"url": "https://jobs.test/m", "metadata": {"scraped_text": "too short"},
+             "health_data": "", "analysis": {}, "final_score": 0, "final_reasoning": ""}
+    asyncio.run(agent.agent_graph.ainvoke(state))
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'verijob_node_duration_seconds_count{node="triage"}' in response.text
+    assert 'verijob_cache_hit_ratio{cache="verification"}' in response.text
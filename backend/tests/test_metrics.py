@@ -0,0 +1,33 @@
+import asyncio
+import pytest
+
+from metrics import Registry, timed
+
+
+def test_histogram_exposition_is_cumulative():
+    registry = Registry()
+    histogram = registry.histogram("demo_seconds", "Demo.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, node="search")
+    text = registry.render()
+    assert 'demo_seconds_bucket{node="search",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{node="search",le="1"} 2' in text
+    assert 'demo_seconds_bucket{node="search",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{node="search"} 3' in text
+    assert "# TYPE demo_seconds histogram" in text
+
+
+@pytest.mark.asyncio
+async def test_timed_tracks_in_flight_and_errors():
+    from metrics import ERRORS, IN_FLIGHT, PROVIDER_SECONDS
+
+    before = PROVIDER_SECONDS.count(provider="test")
+    with pytest.raises(RuntimeError):
+        with timed(PROVIDER_SECONDS, "provider", "test"):
+            assert IN_FLIGHT.value(kind="provider", name="test") == 1
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+    assert IN_FLIGHT.value(kind="provider", name="test") == 0
+    assert PROVIDER_SECONDS.count(provider="test") == before + 1
+    assert ERRORS.value(kind="provider", name="test", error="RuntimeError") >= 1
@@ -0,0 +1,70 @@
+import asyncio
+import httpx
+import pytest
+
+from rate_limit import AdaptiveLimiter, classify_overload, retry_after_seconds
+
+
+def _status_error(status: int, headers=None) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://api.example/search")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return httpx.HTTPStatusError("boom", request=request, response=response)
+
+
+def test_retry_after_parsing_and_overload_classification():
+    assert retry_after_seconds({"retry-after": "2"}) == 2.0
+    assert retry_after_seconds({"retry-after": "9999"}) == 60.0
+    assert retry_after_seconds({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert retry_after_seconds({}) is None
+
+    assert classify_overload(_status_error(429, {"retry-after": "3"})) == (True, 3.0)
+    assert classify_overload(_status_error(503)) == (True, None)
+    assert classify_overload(asyncio.TimeoutError()) == (True, None)
+    assert classify_overload(_status_error(400)) == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_limiter_halves_on_overload_and_recovers_additively():
+    limiter = AdaptiveLimiter("test-aimd", rpm=60000, burst=100, max_concurrency=8)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        async with limiter.slot():
+            raise _status_error(429, {"retry-after": "0.05"})
+    assert limiter.limit == 4
+    assert limiter.pause_remaining() > 0
+
+    # A second 429 from the same burst doesn't cut the limit again
+    limiter.on_overload()
+    assert limiter.limit == 4
+
+    # Callers wait out the Retry-After pause
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    async with limiter.slot():
+        pass
+    assert loop.time() - started >= 0.04
+    assert 4 < limiter.limit < 5
+
+
+@pytest.mark.asyncio
+async def test_limiter_bounds_concurrency_and_rate():
+    limiter = AdaptiveLimiter("test-bound", rpm=1200, burst=2, max_concurrency=2)
+    in_flight = 0
+    peak = 0
+
+    async def call():
+        nonlocal in_flight, peak
+        async with limiter.slot():
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await asyncio.gather(*[call() for _ in range(4)])
+
+    # Burst of 2 goes straight through, the other 2 wait for tokens at 20/s
+    assert peak == 2
+    assert loop.time() - started >= 0.09
+    assert limiter.in_flight == 0
@@ -0,0 +1,57 @@
+import pytest
+from unittest.mock import patch
+
+import tools
+from relevance import bm25_scores, company_acronym, company_aliases, prefilter_sources
+
+RESULTS = [
+    {"title": "Acme Corp announces layoffs in Pune", "content": "Acme cut 200 roles this week."},
+    {"title": "Top 10 companies hiring in 2025", "content": "Acme, Globex and Initech are hiring."},
+    {"title": "Weather update", "content": "Heavy rain expected in Mumbai."},
+    {"title": "r/developersIndia thread", "content": "Acme ghosted me after the final interview. Acme HR never replied, fake offer?"},
+    {"title": "Startup roundup", "content": "Funding news featuring Acme among others."},
+]
+
+
+def test_company_aliases_and_acronym():
+    assert "tata consultancy services" in company_aliases("Tata Consultancy Services Ltd")
+    assert company_aliases("Unknown Company") == []
+    assert company_acronym("Tata Consultancy Services Ltd") == "TCS"
+    assert company_acronym("Morgan Stanley") is None # "MS" would match "MS Excel"
+
+
+def test_bm25_ranks_matching_docs_higher():
+    scores = bm25_scores(["layoffs at acme", "weather is nice", "acme layoffs and more layoffs"], ["layoffs"])
+    assert scores[1] == 0
+    assert scores[0] > 0 and scores[2] > 0
+
+
+def test_prefilter_splits_obvious_cases():
+    keep, drop, ambiguous = prefilter_sources(RESULTS, "Acme Corp")
+    assert keep == [0, 3]
+    assert drop == [2]
+    assert ambiguous == [1, 4]
+
+
+def test_prefilter_sends_acronym_only_matches_to_llm():
+    results = [
+        {"title": "TCS layoffs news", "content": "TCS cuts roles, layoffs confirmed."},
+        {"title": "Tcs tips", "content": "Learn about the tcs file format."},
+        {"title": "Tata Consultancy Services freezes hiring", "content": "Hiring freeze."},
+    ]
+    keep, drop, ambiguous = prefilter_sources(results, "Tata Consultancy Services")
+    assert keep == [2]
+    assert drop == [1] # Lowercase "tcs" isn't the acronym
+    assert ambiguous == [0]
+
+
+def test_prefilter_without_known_company_defers_everything():
+    assert prefilter_sources(RESULTS, "Unknown Company") == ([], [], [0, 1, 2, 3, 4])
+
+
+@pytest.mark.asyncio
+async def test_filter_skips_llm_when_nothing_is_ambiguous():
+    results = [RESULTS[0], RESULTS[2]]
+    with patch.object(tools, "get_llm", side_effect=AssertionError("LLM should not be called")):
+        filtered = await tools.filter_irrelevant_sources(results, "Acme Corp", "Engineer")
+    assert filtered == [RESULTS[0]]
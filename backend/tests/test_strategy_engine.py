@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+
+from strategy_engine import StrategyEngine
+
+
+def _strategy(name, delay, result, log):
+    async def run():
+        log.append(f"start:{name}")
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            log.append(f"cancel:{name}")
+            raise
+        return result
+    return (name, run)
+
+
+@pytest.mark.asyncio
+async def test_slow_leader_is_hedged_and_cancelled():
+    engine = StrategyEngine(hedge_delay=0.05)
+    log = []
+    strategies = [
+        _strategy("slow", 1.0, {"scraped_text": "slow"}, log),
+        _strategy("fast", 0.01, {"scraped_text": "fast"}, log),
+    ]
+
+    result = await engine.race("https://example.com/job", strategies, accept=lambda r: bool(r))
+    await asyncio.sleep(0)
+
+    assert result == {"scraped_text": "fast"}
+    assert log == ["start:slow", "start:fast", "cancel:slow"]
+
+
+@pytest.mark.asyncio
+async def test_failure_falls_through_without_waiting_and_reorders():
+    engine = StrategyEngine(hedge_delay=10)
+    log = []
+    strategies = [
+        _strategy("blocked", 0.02, {}, log),
+        _strategy("works", 0.0, {"scraped_text": "jd"}, log),
+    ]
+
+    result = await asyncio.wait_for(
+        engine.race("https://www.naukri.com/job-1", strategies, accept=lambda r: bool(r)), timeout=1
+    )
+    assert result == {"scraped_text": "jd"}
+
+    ordered = [name for name, _ in engine.order("naukri.com", strategies)]
+    assert ordered == ["works", "blocked"]
+    assert engine.snapshot()["naukri.com"]["blocked"]["successes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_skips_failing_strategy_on_that_domain():
+    engine = StrategyEngine(hedge_delay=10)
+    log = []
+    strategies = [
+        _strategy("curl_cffi", 0.0, {}, log),
+        _strategy("tavily", 0.0, {"scraped_text": "jd"}, log),
+    ]
+    for _ in range(5):
+        await engine.race("https://www.naukri.com/job-1", [strategies[0]], accept=lambda r: bool(r))
+    assert engine.snapshot()["naukri.com"]["curl_cffi"]["circuit"] == "open"
+
+    log.clear()
+    result = await engine.race("https://www.naukri.com/job-2", strategies, accept=lambda r: bool(r))
+    assert result == {"scraped_text": "jd"}
+    assert log == ["start:tavily"]
+
+    # Other domains keep their own breaker
+    assert await engine.race("https://example.com/job", [strategies[0]], accept=lambda r: bool(r)) == {}
+    assert log[-1] == "start:curl_cffi"
+
+
+@pytest.mark.asyncio
+async def test_domain_breakers_are_bounded_and_not_exported_per_domain():
+    import circuit_breaker
+    from metrics import registry
+
+    engine = StrategyEngine(hedge_delay=10, max_breakers=2)
+    failing = _strategy("curl_cffi", 0.0, {}, [])
+    for i in range(5):
+        for _ in range(5):
+            await engine.race(f"https://site{i}.test/job", [failing], accept=lambda r: bool(r))
+
+    assert len(engine._breakers) == 2
+    assert engine.open_breakers() == 2
+    assert not any("@" in b.name for b in circuit_breaker._breakers)
+    rendered = registry.render()
+    assert "site0.test" not in rendered
+    assert "verijob_scrape_circuits_open" in rendered
+
+
+@pytest.mark.asyncio
+async def test_domain_stats_are_bounded_and_snapshot_is_capped():
+    engine = StrategyEngine(hedge_delay=10, max_domains=3)
+    works = _strategy("httpx", 0.0, {"scraped_text": "jd"}, [])
+    for i in range(5):
+        await engine.race(f"https://site{i}.test/job", [works], accept=lambda r: bool(r))
+
+    assert list(engine._stats) == ["site2.test", "site3.test", "site4.test"]
+    assert list(engine.snapshot(limit=2)) == ["site4.test", "site3.test"]
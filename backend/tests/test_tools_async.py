@@ -0,0 +1,121 @@
+import httpx
+import pytest
+from unittest.mock import patch
+
+import tools
+
+
+def _mock_client(handler):
+    return httpx.AsyncClient(base_url="https://tavily.test", transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_async_tavily_search_retries_transient_errors():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"results": [{"title": "ok"}]})
+
+    client = _mock_client(handler)
+    with patch.object(tools, "tavily_api_key", "test-key"), \
+         patch.object(tools, "_get_tavily_http", return_value=client), \
+         patch("tools.asyncio.sleep") as mock_sleep:
+        result = await tools.async_tavily_search("acme layoffs", max_results=3)
+
+    assert result == {"results": [{"title": "ok"}]}
+    assert len(calls) == 2
+    mock_sleep.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_async_tavily_search_does_not_retry_client_errors():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(401)
+
+    client = _mock_client(handler)
+    with patch.object(tools, "tavily_api_key", "test-key"), \
+         patch.object(tools, "_get_tavily_http", return_value=client):
+        result = await tools.async_tavily_search("acme layoffs")
+
+    assert result == {}
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_are_bounded_and_time_out(tmp_path):
+    import asyncio
+    from langchain_core.messages import AIMessage
+    from langchain_core.runnables import RunnableLambda
+    from llm_cache import LLMCache
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_llm(prompt_value):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return AIMessage(content='{"ghost_probability": 10}')
+
+    with patch.object(tools, "llm", RunnableLambda(fake_llm)), \
+         patch.object(tools, "llm_cache", LLMCache(path=str(tmp_path / "llm.db"))), \
+         patch.object(tools.groq_limiter, "max_concurrency", 2), \
+         patch.object(tools.groq_limiter, "limit", 2.0):
+        results = await asyncio.gather(*[tools.analyze_job_description(f"Backend engineer {i}") for i in range(5)])
+
+    assert peak == 2
+    assert all(r == {"raw_analysis": '{"ghost_probability": 10}'} for r in results)
+
+    async def stuck_llm(prompt_value):
+        await asyncio.sleep(1)
+
+    with patch.object(tools, "llm", RunnableLambda(stuck_llm)), \
+         patch.object(tools, "llm_cache", LLMCache(path=str(tmp_path / "llm.db"))), \
+         patch.object(tools, "LLM_TIMEOUT", 0.05):
+        result = await tools.analyze_job_description("Backend engineer")
+
+    assert "error" in result
+
+
+def test_jd_quality_batch_matches_single_scoring():
+    texts = [
+        "",
+        "We need a rockstar ninja guru who is a self-starter in a fast-paced environment. " * 3,
+        "Backend engineer, 5 years of experience, salary ₹30L, tech stack: Python, Postgres. Reporting to the CTO. " * 2,
+        "You will be responsible for various tasks and other duties as assigned, etc. " * 5,
+        "Same opening words every time. " * 40,
+    ]
+
+    single = [tools.analyze_jd_quality(t) for t in texts]
+    assert tools.analyze_jd_quality_batch(texts) == single
+
+    assert single[0]["red_flags"] == ["Insufficient content"]
+    assert "Contains 5 generic buzzwords" in single[1]["red_flags"]
+    assert single[2]["specificity_count"] >= 4
+    assert "Repetitive sentence structure" in single[4]["red_flags"]
+
+
+@pytest.mark.asyncio
+async def test_failed_intel_search_is_an_error_and_not_stored(tmp_path):
+    from intel_store import CompanyIntelStore
+
+    client = _mock_client(lambda request: httpx.Response(401))
+    store = CompanyIntelStore(path=str(tmp_path / "intel.db"))
+    with patch.object(tools, "tavily_api_key", "test-key"), \
+         patch.object(tools, "_get_tavily_http", return_value=client), \
+         patch.object(tools, "company_intel", store):
+        news = await tools.search_company_health("Acme")
+        reddit = await tools.search_reddit_sentiment("Acme")
+
+    assert news["summary"].startswith("Error")
+    assert reddit["summary"].startswith("Error")
+    assert store.get("acme", "news") is None
+    assert store.get("acme", "reddit") is None
@@ -0,0 +1,112 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from verification_store import VerificationStore
+
+RESULT = {
+    "metadata": {"title": "Backend Engineer", "company": "Acme", "scraped_text": "Python and Postgres. " * 20},
+    "status": "Verified",
+    "score": 85,
+    "details": "Job appears legitimate based on available signals.",
+    "partial": False,
+}
+
+
+@pytest.mark.asyncio
+async def test_writes_are_buffered_then_flushed_in_one_batch(tmp_path):
+    store = VerificationStore(path=str(tmp_path / "v.db"), flush_seconds=60, batch_size=3)
+    store.record("https://www.linkedin.com/jobs/view/1?trk=feed", None, RESULT)
+    store.record("https://jobs.test/2", None, {**RESULT, "score": 40, "status": "Unverified"})
+
+    # Buffered rows already answer lookups, under the canonical URL
+    assert await store.lookup("https://linkedin.com/jobs/view/1") == RESULT
+    assert store.stats()["written"] == 0
+
+    store.record("https://jobs.test/3", "Pasted JD text " * 10, RESULT) # Reaches batch_size, wakes the flusher
+    for _ in range(50):
+        if store.stats()["written"]:
+            break
+        await asyncio.sleep(0.01)
+    assert store.stats()["written"] == 3 and store.stats()["batches"] == 1
+
+    reopened = VerificationStore(path=str(tmp_path / "v.db"))
+    assert await reopened.lookup("https://jobs.test/3", "pasted  JD text " * 10) == RESULT
+    assert await reopened.lookup("https://jobs.test/3") is None # Different content, different verification
+    assert reopened.recent(1) == [{
+        "title": "Backend Engineer", "company": "Acme", "url": "https://jobs.test/3",
+        "score": 85, "status": "Verified", "created_at": reopened.recent(1)[0]["created_at"],
+    }]
+    await store.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_and_old_rows_expire(tmp_path):
+    store = VerificationStore(path=str(tmp_path / "v.db"), flush_seconds=60)
+    store.record("https://jobs.test/1", None, RESULT)
+    await store.stop()
+    assert store.stats()["pending"] == 0
+
+    assert VerificationStore(path=str(tmp_path / "v.db")).get("https://jobs.test/1", "") == RESULT
+    assert VerificationStore(path=str(tmp_path / "v.db"), max_age=-1).get("https://jobs.test/1", "") is None
+
+
+@pytest.mark.asyncio
+async def test_known_job_skips_scraping(tmp_path):
+    import verifier
+    from cache import verification_cache
+
+    runs = 0
+
+    async def fake_verification(url, content=None, emit=None):
+        nonlocal runs
+        runs += 1
+        return RESULT
+
+    store = VerificationStore(path=str(tmp_path / "v.db"))
+    with patch.object(verifier, "verification_store", store), \
+         patch.object(verifier, "_timed_verification", fake_verification):
+        assert await verifier.verify_job_listing("https://jobs.test/known") == RESULT
+        verification_cache.clear() # e.g. after a restart, only the store remembers
+        assert await verifier.verify_job_listing("https://jobs.test/known?utm_source=x") == RESULT
+
+    assert runs == 1
+    assert store.stats()["hits"] == 1
+    await store.stop()
+
+
+@pytest.mark.asyncio
+async def test_stream_and_verify_share_one_run(tmp_path):
+    import verifier
+    from cache import verification_cache
+
+    runs = 0
+
+    async def fake_verification(url, content=None, emit=None):
+        nonlocal runs
+        runs += 1
+        if emit:
+            emit("metadata", {"company": "Acme"})
+        await asyncio.sleep(0.05)
+        return RESULT
+
+    async def collect(url):
+        return [event async for event in verifier.stream_verification(url)]
+
+    verification_cache.clear()
+    misses = verification_cache.misses
+    store = VerificationStore(path=str(tmp_path / "v.db"))
+    with patch.object(verifier, "verification_store", store), \
+         patch.object(verifier, "_timed_verification", fake_verification):
+        streamed, joined, verified = await asyncio.gather(
+            collect("https://jobs.test/shared"),
+            collect("https://jobs.test/shared?utm_source=x"),
+            verifier.verify_job_listing("https://jobs.test/shared"),
+        )
+
+    assert runs == 1
+    assert verification_cache.misses == misses + 1
+    assert streamed == [("metadata", {"company": "Acme"}), ("result", RESULT)]
+    assert joined == [("result", RESULT)]
+    assert verified == RESULT
+    await store.stop()
@@ -1,106 +1,300 @@
 import os
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
-from tavily import TavilyClient
-from typing import Dict, Any, List
+import asyncio
+import httpx
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlsplit
+from pydantic import BaseModel, Field
+from intel_store import company_intel
+from relevance import prefilter_sources
+from metrics import timed, PROVIDER_SECONDS, RETRIES
+from rate_limit import AdaptiveLimiter
+from circuit_breaker import CircuitBreaker, CircuitOpen
+import deadline
+from llm_cache import llm_cache, cache_key
 
 # Initialize Clients
+# Provider SDKs (langchain_groq, tavily) are heavy to import, so clients are built on first use.
 tavily_api_key = os.getenv("TAVILY_API_KEY")
 groq_api_key = os.getenv("GROQ_API_KEY")
 
 print(f"DEBUG: Tools initialized. Tavily Key Present: {bool(tavily_api_key)}")
 
-tavily_client = TavilyClient(api_key=tavily_api_key) if tavily_api_key else None
-llm = ChatGroq(
-    groq_api_key=groq_api_key, 
-    model_name="llama-3.3-70b-versatile"
-) if groq_api_key else None
+LLM_MODEL = "llama-3.3-70b-versatile"
+# Bump a prompt's version whenever its template changes, so cached answers to the old one stop matching
+ANALYZE_PROMPT_VERSION = "analyze-v1"
+EXTRACT_PROMPT_VERSION = "extract-v1"
+
+llm = None # Created by get_llm()
+
+def get_llm():
+    """
+    Returns the shared ChatGroq client, importing langchain_groq on first use.
+    """
+    global llm
+    if llm is None and groq_api_key:
+        from langchain_groq import ChatGroq
+        llm = ChatGroq(
+            groq_api_key=groq_api_key, 
+            model_name=LLM_MODEL,
+            max_retries=0, # Retries go through groq_limiter so 429s shrink our concurrency
+        )
+    return llm
+
+# Async Tavily settings
+TAVILY_API_BASE_URL = os.getenv("TAVILY_API_BASE_URL", "https://api.tavily.com")
+TAVILY_TIMEOUT = float(os.getenv("TAVILY_TIMEOUT", "20"))
+TAVILY_MAX_RETRIES = 3
+
+# Async LLM settings
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_MAX_RETRIES = 2
+
+# Provider quotas. Concurrency adapts (AIMD) below these caps on 429/503/timeouts.
+GROQ_RPM = float(os.getenv("GROQ_RPM", "30"))
+GROQ_BURST = int(os.getenv("GROQ_BURST", str(LLM_MAX_CONCURRENCY)))
+TAVILY_RPM = float(os.getenv("TAVILY_RPM", "100"))
+TAVILY_BURST = int(os.getenv("TAVILY_BURST", "20"))
+TAVILY_MAX_CONCURRENCY = int(os.getenv("TAVILY_MAX_CONCURRENCY", "10"))
+
+groq_limiter = AdaptiveLimiter("groq", GROQ_RPM, GROQ_BURST, LLM_MAX_CONCURRENCY)
+tavily_limiter = AdaptiveLimiter("tavily", TAVILY_RPM, TAVILY_BURST, TAVILY_MAX_CONCURRENCY)
+
+# Fail fast while a provider is down instead of paying its timeouts and retries on every request
+groq_breaker = CircuitBreaker("groq")
+tavily_breaker = CircuitBreaker("tavily")
 
 
-import time
 import random
 
+def _backoff_delay(attempt: int, limiter: AdaptiveLimiter) -> float:
+    """
+    Jittered exponential backoff, minus any Retry-After pause the limiter already waits out.
+    """
+    return max(0.0, (2 ** attempt) * (0.5 + random.random()) - limiter.pause_remaining())
+
 def safe_tavily_search(query: str, **kwargs) -> Dict[str, Any]:
     """
-    Wraps Tavily search with retry logic to handle connection resets.
+    Blocking wrapper around async_tavily_search, kept for scripts.
+    Shares its retries and rate limiting. Async code should await async_tavily_search.
+    """
+    async def run():
+        try:
+            return await async_tavily_search(query, **kwargs)
+        finally:
+            await aclose_clients()
+
+    return asyncio.run(run())
+
+
+_tavily_http: Optional[httpx.AsyncClient] = None
+_tavily_http_loop = None
+
+def _get_tavily_http() -> httpx.AsyncClient:
+    """
+    Returns the shared, pooled HTTP client for Tavily (created on first use).
+    Recreated if the running event loop changed (e.g. between test runs).
+    """
+    global _tavily_http, _tavily_http_loop
+    loop = asyncio.get_running_loop()
+    if _tavily_http is None or _tavily_http.is_closed or _tavily_http_loop is not loop:
+        _tavily_http = httpx.AsyncClient(
+            base_url=TAVILY_API_BASE_URL,
+            headers={"Authorization": f"Bearer {tavily_api_key}"},
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60),
+            timeout=TAVILY_TIMEOUT,
+        )
+        _tavily_http_loop = loop
+    return _tavily_http
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Network errors, timeouts, 429 and 5xx are worth retrying. Other 4xx are not.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
+async def async_tavily_search(query: str, timeout: Optional[float] = None, **kwargs) -> Dict[str, Any]:
     """
-    if not tavily_client:
+    Non-blocking Tavily search over the shared HTTP client.
+    Retries transient failures with jittered exponential backoff (asyncio.sleep).
+    Every attempt goes through tavily_limiter, which also honours Retry-After.
+    Raises CircuitOpen (without a request) while tavily_breaker is open.
+    Attempts and retries stop at the request deadline (returns {} like any other failure).
+    """
+    if not tavily_api_key:
         return {}
-    
-    max_retries = 3
-    for attempt in range(max_retries):
+
+    payload = {"query": query, **kwargs}
+
+    async def attempt_once():
+        with tavily_breaker.call():
+            async with tavily_limiter.slot():
+                with timed(PROVIDER_SECONDS, "provider", "tavily"):
+                    response = await _get_tavily_http().post("/search", json=payload, timeout=timeout or TAVILY_TIMEOUT)
+                    response.raise_for_status()
+        return response.json()
+
+    for attempt in range(TAVILY_MAX_RETRIES):
         try:
-            return tavily_client.search(query, **kwargs)
+            return await deadline.wait_for(attempt_once())
+        except CircuitOpen:
+            raise
         except Exception as e:
-            print(f"⚠️ Tavily search failed (attempt {attempt+1}/{max_retries}): {e}")
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt + random.random()) # Exponential backoff
+            print(f"⚠️ Tavily search failed (attempt {attempt+1}/{TAVILY_MAX_RETRIES}): {e!r}")
+            delay = _backoff_delay(attempt, tavily_limiter)
+            if attempt < TAVILY_MAX_RETRIES - 1 and _is_retryable(e) and deadline.budget(delay) == delay:
+                RETRIES.inc(provider="tavily")
+                await asyncio.sleep(delay)
             else:
-                print("❌ Max retries reached for Tavily search.")
-                return {} # Return empty on final failure
+                print("❌ Giving up on Tavily search.")
+                return {}
     return {}
 
+def _is_rate_limited(error: Exception) -> bool:
+    """
+    Groq told us to slow down (429) or is overloaded (503). Worth another try through the limiter.
+    """
+    return getattr(error, "status_code", None) in (429, 503)
 
-def analyze_jd_quality(jd_text: str) -> Dict[str, Any]:
+async def _ainvoke_llm(chain, inputs: Dict[str, Any], timeout: Optional[float] = None):
     """
-    Analyzes job description quality to detect AI-generated or generic postings.
-    Returns a score (0-100) and list of red flags.
+    Runs chain.ainvoke on the shared LLM client through groq_limiter, with a per-call timeout.
+    429/503 are retried after the limiter's Retry-After pause; timeouts only shrink the limit.
+    Raises CircuitOpen right away while groq_breaker is open, DeadlineExceeded once the
+    request budget is spent (the attempt is cancelled, so neither counts against Groq).
     """
-    if not jd_text or len(jd_text) < 100:
-        return {"quality_score": 0, "red_flags": ["Insufficient content"], "is_suspicious": True}
-    
-    red_flags = []
-    score = 100
-    
+    async def attempt_once():
+        with groq_breaker.call():
+            async with groq_limiter.slot():
+                with timed(PROVIDER_SECONDS, "provider", "groq"):
+                    return await asyncio.wait_for(chain.ainvoke(inputs), timeout=timeout or LLM_TIMEOUT)
+
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        try:
+            return await deadline.wait_for(attempt_once())
+        except Exception as e:
+            delay = _backoff_delay(attempt, groq_limiter)
+            if attempt == LLM_MAX_RETRIES or not _is_rate_limited(e) or deadline.budget(delay) < delay:
+                raise
+            print(f"⚠️ Groq rate limited (attempt {attempt+1}/{LLM_MAX_RETRIES + 1}), retrying")
+            RETRIES.inc(provider="groq")
+            await asyncio.sleep(delay)
+
+async def aclose_clients():
+    """
+    Closes shared network clients. Called on app shutdown.
+    """
+    global _tavily_http
+    if _tavily_http is not None and not _tavily_http.is_closed:
+        await _tavily_http.aclose()
+    _tavily_http = None
+
+
+class PhraseMatcher:
+    """
+    Phrase lists compiled once into a single table, matched per category in one call.
+    Matching uses C-level substring scans: at this phrase count they beat both a single
+    alternation regex and a pure-Python Aho-Corasick automaton in CPython.
+    """
+
+    def __init__(self, categories: Dict[str, List[str]]):
+        self.categories = list(categories)
+        self.phrases = tuple(p for phrases in categories.values() for p in phrases)
+        self.category_index = tuple(i for i, phrases in enumerate(categories.values()) for _ in phrases)
+
+    def counts(self, text_lower: str) -> Dict[str, int]:
+        """
+        Number of distinct phrases of each category present in the (lowercased) text.
+        """
+        totals = [0] * len(self.categories)
+        for phrase, category in zip(self.phrases, self.category_index):
+            if phrase in text_lower:
+                totals[category] += 1
+        return dict(zip(self.categories, totals))
+
+    def count_matrix(self, texts_lower: List[str]):
+        """
+        (n_texts x n_categories) NumPy array of distinct-phrase counts.
+        """
+        import numpy as np
+        hits = np.array([[phrase in text for phrase in self.phrases] for text in texts_lower], dtype=bool)
+        hits = hits.reshape(len(texts_lower), len(self.phrases))
+        one_hot = np.zeros((len(self.phrases), len(self.categories)), dtype=np.int32)
+        one_hot[np.arange(len(self.phrases)), self.category_index] = 1
+        return hits.astype(np.int32) @ one_hot
+
+
+JD_PHRASES = {
     # Generic buzzwords that indicate AI-generated or template content
-    generic_phrases = [
+    "buzzword": [
         "rockstar", "ninja", "guru", "wizard", "unicorn",
         "wear many hats", "fast-paced environment", "work hard play hard",
         "competitive salary", "exciting opportunity", "dynamic team",
         "self-starter", "go-getter", "think outside the box"
-    ]
-    
+    ],
     # AI-generation indicators
-    ai_indicators = [
+    "ai_pattern": [
         "as a [role], you will", "the ideal candidate will",
         "we are looking for a highly motivated", "join our growing team",
         "this is an exciting opportunity to", "you will be responsible for"
-    ]
-    
+    ],
     # Vague requirements (lack of specifics)
-    vague_indicators = [
+    "vague": [
         "various tasks", "other duties as assigned", "and more",
         "etc.", "among other things", "as needed"
-    ]
+    ],
+    # Specificity (good signs)
+    "specific": [
+        "salary", "₹", "$", "compensation", "benefits",
+        "team size", "reporting to", "tech stack", "tools:",
+        "years of experience", "degree in", "certification"
+    ],
+}
+
+jd_phrase_matcher = PhraseMatcher(JD_PHRASES)
+
+def _has_repetitive_structure(jd_text: str) -> bool:
+    sentences = jd_text.split('.')
+    if len(sentences) > 10:
+        # Simple repetition check
+        unique_starts = len(set(s.strip()[:20] for s in sentences if len(s.strip()) > 20))
+        return unique_starts < len(sentences) * 0.7
+    return False
+
+def analyze_jd_quality(jd_text: str) -> Dict[str, Any]:
+    """
+    Analyzes job description quality to detect AI-generated or generic postings.
+    Returns a score (0-100) and list of red flags.
+    """
+    if not jd_text or len(jd_text) < 100:
+        return {"quality_score": 0, "red_flags": ["Insufficient content"], "is_suspicious": True}
     
-    jd_lower = jd_text.lower()
+    red_flags = []
+    score = 100
+    
+    counts = jd_phrase_matcher.counts(jd_text.lower())
     
     # Check for generic buzzwords
-    buzzword_count = sum(1 for phrase in generic_phrases if phrase in jd_lower)
+    buzzword_count = counts["buzzword"]
     if buzzword_count >= 3:
         red_flags.append(f"Contains {buzzword_count} generic buzzwords")
         score -= 15
     
     # Check for AI-generation patterns
-    ai_pattern_count = sum(1 for phrase in ai_indicators if phrase in jd_lower)
-    if ai_pattern_count >= 3:
+    if counts["ai_pattern"] >= 3:
         red_flags.append("Shows AI-generated content patterns")
         score -= 20
     
     # Check for vague language
-    vague_count = sum(1 for phrase in vague_indicators if phrase in jd_lower)
-    if vague_count >= 2:
+    if counts["vague"] >= 2:
         red_flags.append("Contains vague/non-specific requirements")
         score -= 15
     
     # Check for specificity (good signs)
-    specific_indicators = [
-        "salary", "₹", "$", "compensation", "benefits",
-        "team size", "reporting to", "tech stack", "tools:",
-        "years of experience", "degree in", "certification"
-    ]
-    specificity_count = sum(1 for phrase in specific_indicators if phrase in jd_lower)
-    
+    specificity_count = counts["specific"]
     if specificity_count < 2:
         red_flags.append("Lacks specific details (salary, team, tech stack)")
         score -= 20
@@ -111,13 +305,9 @@ def analyze_jd_quality(jd_text: str) -> Dict[str, Any]:
         score -= 10
     
     # Check for repetitive structure
-    sentences = jd_text.split('.')
-    if len(sentences) > 10:
-        # Simple repetition check
-        unique_starts = len(set(s.strip()[:20] for s in sentences if len(s.strip()) > 20))
-        if unique_starts < len(sentences) * 0.7:
-            red_flags.append("Repetitive sentence structure")
-            score -= 15
+    if _has_repetitive_structure(jd_text):
+        red_flags.append("Repetitive sentence structure")
+        score -= 15
     
     score = max(0, score)
     is_suspicious = score < 60 or len(red_flags) >= 3
@@ -129,17 +319,72 @@ def analyze_jd_quality(jd_text: str) -> Dict[str, Any]:
         "specificity_count": specificity_count
     }
 
+def analyze_jd_quality_batch(jd_texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Scores many JDs at once (e.g. the ingest backlog). Same output as analyze_jd_quality
+    per item, but flags and scores are aggregated as NumPy column operations.
+    """
+    import numpy as np
+    if not jd_texts:
+        return []
+
+    texts = [t or "" for t in jd_texts]
+    lengths = np.array([len(t) for t in texts])
+    counts = jd_phrase_matcher.count_matrix([t.lower() for t in texts])
+    column = {name: counts[:, i] for i, name in enumerate(jd_phrase_matcher.categories)}
+
+    # (flag column, penalty, message) in the same order analyze_jd_quality reports them
+    rules = [
+        (column["buzzword"] >= 3, 15, None),
+        (column["ai_pattern"] >= 3, 20, "Shows AI-generated content patterns"),
+        (column["vague"] >= 2, 15, "Contains vague/non-specific requirements"),
+        (column["specific"] < 2, 20, "Lacks specific details (salary, team, tech stack)"),
+        (lengths > 5000, 10, "Unusually long description (possible AI padding)"),
+        (np.array([_has_repetitive_structure(t) for t in texts], dtype=bool), 15, "Repetitive sentence structure"),
+    ]
+    flags = np.stack([flag for flag, _, _ in rules], axis=1)
+    penalties = np.array([penalty for _, penalty, _ in rules])
+    scores = np.maximum(0, 100 - flags.astype(np.int32) @ penalties)
+    n_flags = flags.sum(axis=1)
+    suspicious = (scores < 60) | (n_flags >= 3)
+
+    results = []
+    for i in range(len(texts)):
+        if lengths[i] < 100:
+            results.append({"quality_score": 0, "red_flags": ["Insufficient content"], "is_suspicious": True})
+            continue
+        red_flags = [
+            message or f"Contains {int(column['buzzword'][i])} generic buzzwords"
+            for (_, _, message), hit in zip(rules, flags[i]) if hit
+        ]
+        results.append({
+            "quality_score": int(scores[i]),
+            "red_flags": red_flags,
+            "is_suspicious": bool(suspicious[i]),
+            "specificity_count": int(column["specific"][i])
+        })
+    return results
 
 
-def filter_irrelevant_sources(results: List[Dict], company_name: str, job_title: str) -> List[Dict]:
+
+async def filter_irrelevant_sources(results: List[Dict], company_name: str, job_title: str) -> List[Dict]:
     """
-    Uses LLM to filter out search results that are not relevant to the specific company/role.
+    Filters out search results that are not relevant to the specific company/role.
+    A local lexical pass settles the obvious ones; only ambiguous results go to the LLM.
     """
-    if not results or not llm:
+    if not results:
         return results
+    keep, drop, ambiguous = prefilter_sources(results, company_name)
+    print(f"🔎 Relevance pre-filter for {company_name}: keep={len(keep)} drop={len(drop)} ambiguous={len(ambiguous)}")
+    if not ambiguous:
+        return [results[i] for i in keep]
+    if not get_llm():
+        return [results[i] for i in sorted(keep + ambiguous)]
+    from langchain_core.prompts import ChatPromptTemplate
 
+    candidates = [results[i] for i in ambiguous]
     # Create a summarized list for the LLM to evaluate
-    sources_text = "\n".join([f"ID {i}: Title: {r['title']}, Content: {r['content'][:150]}..." for i, r in enumerate(results)])
+    sources_text = "\n".join([f"ID {i}: Title: {r['title']}, Content: {r['content'][:150]}..." for i, r in enumerate(candidates)])
     
     prompt = ChatPromptTemplate.from_messages([
         ("system", "You are a strict relevance filter. Return ONLY the IDs of relevant sources."),
@@ -159,10 +404,10 @@ def filter_irrelevant_sources(results: List[Dict], company_name: str, job_title:
         """)
     ])
     
-    chain = prompt | llm
+    chain = prompt | get_llm()
     try:
         import json, re
-        response = chain.invoke({})
+        response = await _ainvoke_llm(chain, {})
         content = response.content
         
         # Parse IDs
@@ -171,75 +416,116 @@ def filter_irrelevant_sources(results: List[Dict], company_name: str, job_title:
         if match:
              relevant_ids = json.loads(match.group(0))
         
-        filtered_results = [results[i] for i in relevant_ids if i < len(results)]
-        return filtered_results
+        relevant = set(keep) | {ambiguous[i] for i in relevant_ids if 0 <= i < len(ambiguous)}
+        return [results[i] for i in sorted(relevant)]
     except Exception as e:
-        print(f"Filtering error: {e}")
-        return results # Fallback to original list
+        print(f"Filtering error: {e!r}")
+        return [results[i] for i in sorted(keep + ambiguous)] # Fallback to everything not ruled out locally
+
+def _is_storable_intel(payload: Dict[str, Any]) -> bool:
+    return not payload.get("summary", "").startswith("Error")
 
-def search_company_health(company_name: str, job_title: str = "") -> Dict[str, Any]:
+async def search_company_health(company_name: str, job_title: str = "") -> Dict[str, Any]:
     """
-    Searches for recent news about company layoffs, hiring freezes, or funding.
+    Company news intel, served from the shared company store while fresh.
+    Keyed by company only, so every posting from one employer shares a single search.
     """
-    if not tavily_client:
-        return {"summary": "Error: TAVILY_API_KEY not found.", "links": []}
-        
+    return await company_intel.get_or_fetch(
+        company_name, "news", lambda: fetch_company_health(company_name, job_title), _is_storable_intel
+    )
+
+async def search_reddit_sentiment(company_name: str, job_title: str = "") -> Dict[str, Any]:
+    """
+    Reddit sentiment intel, served from the shared company store while fresh.
+    """
+    return await company_intel.get_or_fetch(
+        company_name, "reddit", lambda: fetch_reddit_sentiment(company_name, job_title), _is_storable_intel
+    )
+
+def _health_query(company_name: str, job_title: str = "") -> str:
     # Construct more specific query
     query = f"{company_name} layoffs hiring freeze funding news 2024 2025"
     if job_title and job_title.lower() != "unknown":
          query = f"{company_name} {job_title} layoffs hiring freeze 2024 2025"
+    return query
+
+def _reddit_query(company_name: str, job_title: str = "") -> str:
+    # Targeting reddit.com with specific negative keywords
+    query = f"site:reddit.com {company_name} (scam OR ghosting OR fake job OR interview experience)"
+    if job_title and job_title.lower() != "unknown":
+         query = f"site:reddit.com {company_name} {job_title} (scam OR ghosting OR fake job OR interview experience)"
+    return query
+
+def summarize_health(filtered_results: List[Dict]) -> Dict[str, Any]:
+    # Summarize results into a string
+    results_text = "\n".join([f"- {result['title']}: {result['content']}" for result in filtered_results])
+    links = [{"title": r['title'], "url": r['url']} for r in filtered_results]
+    return {
+        "summary": results_text if results_text else "No specific news found after filtering.",
+        "links": links
+    }
+
+def summarize_reddit(filtered_results: List[Dict]) -> Dict[str, Any]:
+    if not filtered_results:
+        return {"summary": "No specific negative discussions found on Reddit.", "links": []}
+    summary = "\n".join([f"- {r['title']}: {r['content'][:200]}..." for r in filtered_results])
+    links = [{"title": r['title'], "url": r['url']} for r in filtered_results]
+    return {"summary": summary, "links": links}
+
+INTEL_QUERIES = {"news": _health_query, "reddit": _reddit_query}
+INTEL_SUMMARIZERS = {"news": summarize_health, "reddit": summarize_reddit}
+
+async def search_raw_intel(kind: str, company_name: str, job_title: str = "") -> List[Dict]:
+    """
+    Unfiltered Tavily results for one intel kind ("news" or "reddit").
+    Raises if the search itself failed, so a failure never reads as "nothing found".
+    """
+    query = INTEL_QUERIES[kind](company_name, job_title)
+    response = await async_tavily_search(query, search_depth="advanced", max_results=5) # Fetch more, then filter
+    if "results" not in response:
+        raise RuntimeError(f"Tavily {kind} search failed")
+    return response["results"]
+
+async def fetch_company_health(company_name: str, job_title: str = "") -> Dict[str, Any]:
+    """
+    Searches for recent news about company layoffs, hiring freezes, or funding.
+    """
+    if not tavily_api_key:
+        return {"summary": "Error: TAVILY_API_KEY not found.", "links": []}
 
     try:
-        response = safe_tavily_search(query, search_depth="advanced", max_results=5) # Fetch more, then filter
-        results = response.get('results', [])
+        results = await search_raw_intel("news", company_name, job_title)
         
         # Filter with LLM
-        filtered_results = filter_irrelevant_sources(results, company_name, job_title)
-        
-        # Summarize results into a string
-        results_text = "\n".join([f"- {result['title']}: {result['content']}" for result in filtered_results])
-        links = [{"title": r['title'], "url": r['url']} for r in filtered_results]
-        return {
-            "summary": results_text if results_text else "No specific news found after filtering.",
-            "links": links
-        }
+        filtered_results = await filter_irrelevant_sources(results, company_name, job_title)
+        return summarize_health(filtered_results)
     except Exception as e:
         return {"summary": f"Error performing search: {str(e)}", "links": []}
 
-def search_reddit_sentiment(company_name: str, job_title: str = "") -> Dict[str, Any]:
+async def fetch_reddit_sentiment(company_name: str, job_title: str = "") -> Dict[str, Any]:
     """
     Searches Reddit for negative sentiment/scam reports about the company.
     """
-    if not tavily_client:
+    if not tavily_api_key:
         return {"summary": "Error: TAVILY_API_KEY not found.", "links": []}
-    
-    # Targeting reddit.com with specific negative keywords
-    query = f"site:reddit.com {company_name} (scam OR ghosting OR fake job OR interview experience)"
-    if job_title and job_title.lower() != "unknown":
-         query = f"site:reddit.com {company_name} {job_title} (scam OR ghosting OR fake job OR interview experience)"
 
     try:
-        response = safe_tavily_search(query, search_depth="advanced", max_results=5) # Fetch more
-        results = response.get('results', [])
+        results = await search_raw_intel("reddit", company_name, job_title)
         
         # Filter
-        filtered_results = filter_irrelevant_sources(results, company_name, job_title)
-        
-        if not filtered_results:
-            return {"summary": "No specific negative discussions found on Reddit.", "links": []}
-            
-        summary = "\n".join([f"- {r['title']}: {r['content'][:200]}..." for r in filtered_results])
-        links = [{"title": r['title'], "url": r['url']} for r in filtered_results]
-        return {"summary": summary, "links": links}
+        filtered_results = await filter_irrelevant_sources(results, company_name, job_title)
+        return summarize_reddit(filtered_results)
     except Exception as e:
         return {"summary": f"Error searching Reddit: {str(e)}", "links": []}
 
-def analyze_job_description(jd_text: str) -> Dict[str, Any]:
+async def analyze_job_description(jd_text: str) -> Dict[str, Any]:
     """
     Uses Groq (Llama 3) to analyze if a JD looks like a 'Ghost Job' template.
+    Answers are cached by normalized JD text (see llm_cache).
     """
-    if not llm:
+    if not get_llm():
         return {"ghost_probability": 0, "analysis": "Error: GROQ_API_KEY not found."}
+    from langchain_core.prompts import ChatPromptTemplate
 
     prompt = ChatPromptTemplate.from_messages([
         ("system", "You are an expert HR recruiter and scam detector. Analyze the following Job Description (JD)."),
@@ -261,23 +547,31 @@ def analyze_job_description(jd_text: str) -> Dict[str, Any]:
         """)
     ])
     
-    chain = prompt | llm
-    try:
-        # Truncate text to avoid token limits if necessary, Llama 3 70b has good context though
-        safe_text = jd_text[:8000] 
-        response = chain.invoke({"jd_text": safe_text})
-        content = response.content
-        return {"raw_analysis": content}
-    except Exception as e:
-        return {"error": str(e)}
+    chain = prompt | get_llm()
+    # Truncate text to avoid token limits if necessary, Llama 3 70b has good context though
+    safe_text = jd_text[:8000] 
+
+    async def run():
+        try:
+            response = await _ainvoke_llm(chain, {"jd_text": safe_text})
+            content = response.content
+            return {"raw_analysis": content}
+        except Exception as e:
+            return {"error": str(e) or repr(e)}
+
+    # Reposted JDs (same text on other URLs/boards) reuse the first answer
+    key = cache_key(LLM_MODEL, ANALYZE_PROMPT_VERSION, safe_text)
+    return await llm_cache.get_or_compute(key, "analyze", run, should_store=lambda result: "error" not in result)
 
 
-def extract_metadata_from_text(raw_text: str, url: str) -> Dict[str, Any]:
+async def extract_metadata_from_text(raw_text: str, url: str) -> Dict[str, Any]:
     """
     Uses LLM to extract structured metadata (Title, Company, Date) from raw page text.
+    Cached per page text and site (see llm_cache).
     """
-    if not llm:
+    if not get_llm():
         return {}
+    from langchain_core.prompts import ChatPromptTemplate
 
     prompt = ChatPromptTemplate.from_messages([
         ("system", "You are a data extraction assistant. Extract job details from the provided raw text."),
@@ -296,49 +590,196 @@ def extract_metadata_from_text(raw_text: str, url: str) -> Dict[str, Any]:
         """)
     ])
     
-    chain = prompt | llm
-    try:
-        import re
-        import json
+    chain = prompt | get_llm()
+    safe_text = raw_text[:5000]
+
+    async def run():
+        try:
+            import re
+            import json
         
-        safe_text = raw_text[:5000]
-        response = chain.invoke({"url": url, "text": safe_text})
-        content = response.content
+            response = await _ainvoke_llm(chain, {"url": url, "text": safe_text})
+            content = response.content
         
-        # Parse JSON
-        extracted_data = {}
-        match = re.search(r"```json\s*(.*?)\s*```", content, re.DOTALL)
-        if match:
-             json_str = match.group(1)
-        else:
-             start = content.find("{")
-             end = content.rfind("}")
-             if start != -1 and end != -1:
-                 json_str = content[start:end+1]
-             else:
-                 json_str = ""
-
-        if json_str:
-            try:
-                extracted_data = json.loads(json_str)
-            except:
-                pass
+            # Parse JSON
+            extracted_data = {}
+            match = re.search(r"```json\s*(.*?)\s*```", content, re.DOTALL)
+            if match:
+                 json_str = match.group(1)
+            else:
+                 start = content.find("{")
+                 end = content.rfind("}")
+                 if start != -1 and end != -1:
+                     json_str = content[start:end+1]
+                 else:
+                     json_str = ""
+
+            if json_str:
+                try:
+                    extracted_data = json.loads(json_str)
+                except:
+                    pass
                 
-        # Return merged result
-        return {
-            "llm_extracted": content, # Keep raw for debugging
-            **extracted_data # Merge parsed fields (company, title, etc)
-        }
+            # Return merged result
+            return {
+                "llm_extracted": content, # Keep raw for debugging
+                **extracted_data # Merge parsed fields (company, title, etc)
+            }
+        except Exception as e:
+            print(f"Extraction error: {e!r}")
+            return {}
+
+    # The source field depends on the board, so entries are per domain, not per URL
+    key = cache_key(LLM_MODEL, EXTRACT_PROMPT_VERSION, safe_text, urlsplit(url).netloc.lower())
+    return await llm_cache.get_or_compute(key, "extract", run, should_store=bool)
+
+
+# --- Fused analysis (optional mode) ---
+# One structured-output call returns metadata, ghost analysis and source relevance,
+# instead of extract_metadata_from_text + analyze_job_description + filter_irrelevant_sources x2.
+FUSED_LLM_ANALYSIS = os.getenv("FUSED_LLM_ANALYSIS") == "1"
+
+class SourceRelevance(BaseModel):
+    relevant_news_ids: List[int] = Field(default_factory=list, description="IDs of relevant news sources")
+    relevant_reddit_ids: List[int] = Field(default_factory=list, description="IDs of relevant Reddit sources")
+
+class FusedJobAnalysis(SourceRelevance):
+    title: str = Field(default="", description="Job title")
+    company: str = Field(default="", description="Hiring company")
+    location: str = Field(default="", description="Job location")
+    posted_date: str = Field(default="", description="Posting date as YYYY-MM-DD (infer relative dates like '2 days ago')")
+    source: str = Field(default="", description="e.g. LinkedIn, Indeed, Company Site")
+    ghost_probability: int = Field(ge=0, le=100, description="Likelihood (0-100) that this is a ghost job")
+    main_concerns: str = Field(default="", description="Summarized ghost-job concerns")
+    is_template: bool = Field(default=False, description="Whether the JD reads like a generic template")
+
+RELEVANCE_RULES = """Mark a source as RELEVANT only if it strictly discusses:
+1. '{company}' specifically (not just a list of all companies).
+2. Bad interview experiences, scams, or layoffs related to this company.
+If a source is a generic "Top 10 jobs" or "List of layoffs" without specific details on {company}, it is IRRELEVANT."""
+
+def _sources_block(sources: Dict[str, List[Dict]]) -> str:
+    blocks = []
+    for kind in ("news", "reddit"):
+        results = sources.get(kind) or []
+        lines = "\n".join(f"ID {i}: Title: {r['title']}, Content: {r['content'][:150]}..." for i, r in enumerate(results))
+        blocks.append(f"{kind.upper()} sources:\n{lines or '(none)'}")
+    return "\n\n".join(blocks)
+
+def pick_relevant(sources: Dict[str, List[Dict]], relevance: SourceRelevance) -> Dict[str, List[Dict]]:
+    """
+    Applies relevance IDs to source lists, ignoring out-of-range IDs.
+    """
+    ids = {"news": relevance.relevant_news_ids, "reddit": relevance.relevant_reddit_ids}
+    return {
+        kind: [results[i] for i in ids[kind] if 0 <= i < len(results)]
+        for kind, results in sources.items()
+    }
+
+async def fused_job_analysis(jd_text: str, url: str, sources: Optional[Dict[str, List[Dict]]] = None,
+                             company_hint: str = "") -> Optional[FusedJobAnalysis]:
+    """
+    Single schema-validated LLM call: metadata + ghost analysis + relevance of any given sources.
+    Returns None on failure so callers can fall back to the multi-call path.
+    """
+    if not get_llm():
+        return None
+    from langchain_core.prompts import ChatPromptTemplate
+
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "You are an expert HR recruiter, scam detector and data extraction assistant."),
+        ("human", """
+        Job URL: {url}
+        Company (if already known): {company_hint}
+
+        Job Description Text:
+        {jd_text}
+
+        Tasks:
+        1. Extract title, company, location, posted_date and source of the job.
+        2. Analyze the JD for 'Ghost Job' signals: vague responsibilities vs generic requirements,
+           'evergreen' language (e.g. 'We are always hiring for...'), lack of specific team details,
+           overly broad salary ranges or mismatched requirements. Give ghost_probability (0-100),
+           main_concerns and is_template.
+        3. For the search results below, return the IDs of relevant sources per list.
+        {relevance_rules}
+
+        {sources}
+        """)
+    ])
+    chain = prompt | get_llm().with_structured_output(FusedJobAnalysis)
+    try:
+        result = await _ainvoke_llm(chain, {
+            "url": url,
+            "company_hint": company_hint or "unknown",
+            "jd_text": jd_text[:8000],
+            "relevance_rules": RELEVANCE_RULES.format(company=company_hint or "the hiring company"),
+            "sources": _sources_block(sources or {}),
+        })
+        return result if isinstance(result, FusedJobAnalysis) else FusedJobAnalysis.model_validate(result)
     except Exception as e:
-        print(f"Extraction error: {e}")
-        return {}
+        print(f"Fused analysis failed, falling back to multi-call path: {e!r}")
+        return None
+
+async def filter_sources_combined(sources: Dict[str, List[Dict]], company_name: str, job_title: str) -> Dict[str, List[Dict]]:
+    """
+    Relevance for news and Reddit results in one LLM call (instead of one per list).
+    The local pre-filter runs first, so the call only sees ambiguous results and is skipped when there are none.
+    Falls back to per-list filter_irrelevant_sources on failure.
+    """
+    if not any(sources.values()):
+        return sources
+    split = {kind: prefilter_sources(results, company_name) for kind, results in sources.items()}
+    kept = {kind: set(keep) for kind, (keep, _, _) in split.items()}
+    ambiguous = {kind: amb for kind, (_, _, amb) in split.items()}
+
+    def assemble(relevant: Dict[str, set]) -> Dict[str, List[Dict]]:
+        return {kind: [results[i] for i in sorted(relevant[kind])] for kind, results in sources.items()}
+
+    if not any(ambiguous.values()):
+        return assemble(kept)
+    if not get_llm():
+        return assemble({kind: kept[kind] | set(ambiguous[kind]) for kind in sources})
+    from langchain_core.prompts import ChatPromptTemplate
+
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "You are a strict relevance filter. Return ONLY the IDs of relevant sources."),
+        ("human", """
+        We are verifying a job listing for '{company}' - '{job_title}'.
+        {relevance_rules}
+
+        {sources}
+        """)
+    ])
+    chain = prompt | get_llm().with_structured_output(SourceRelevance)
+    candidates = {kind: [sources[kind][i] for i in amb] for kind, amb in ambiguous.items()}
+    try:
+        relevance = await _ainvoke_llm(chain, {
+            "company": company_name,
+            "job_title": job_title,
+            "relevance_rules": RELEVANCE_RULES.format(company=company_name),
+            "sources": _sources_block(candidates),
+        })
+        if not isinstance(relevance, SourceRelevance):
+            relevance = SourceRelevance.model_validate(relevance)
+        ids = {"news": relevance.relevant_news_ids, "reddit": relevance.relevant_reddit_ids}
+        return assemble({
+            kind: kept[kind] | {ambiguous[kind][i] for i in ids.get(kind, []) if 0 <= i < len(ambiguous[kind])}
+            for kind in sources
+        })
+    except Exception as e:
+        print(f"Combined filtering error: {e!r}")
+        filtered = await asyncio.gather(*[
+            filter_irrelevant_sources(results, company_name, job_title) for results in sources.values()
+        ])
+        return dict(zip(sources.keys(), filtered))
 
 
-def search_hiring_signals() -> List[Dict[str, Any]]:
+async def search_hiring_signals() -> List[Dict[str, Any]]:
     """
     Searches for 'Green Flags' - signs of active hiring, funding, or expansion.
     """
-    if not tavily_client:
+    if not tavily_api_key:
         return []
 
     signals = []
@@ -351,8 +792,10 @@ def search_hiring_signals() -> List[Dict[str, Any]]:
     ]
 
     try:
-        for q_obj in queries:
-            response = safe_tavily_search(q_obj["q"], search_depth="advanced", max_results=3)
+        responses = await asyncio.gather(*[
+            async_tavily_search(q_obj["q"], search_depth="advanced", max_results=3) for q_obj in queries
+        ])
+        for q_obj, response in zip(queries, responses):
             results = response.get('results', [])
             
             for r in results:
@@ -0,0 +1,224 @@
+import asyncio
+import datetime
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from cache import job_cache_key
+
+DEFAULT_DB_PATH = os.getenv(
+    "VERIFICATION_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "verifications.db")
+)
+# How long a stored verdict is served instead of re-running the pipeline
+VERIFIED_JOB_MAX_AGE = float(os.getenv("VERIFIED_JOB_MAX_AGE", str(24 * 3600)))
+VERIFICATION_FLUSH_SECONDS = float(os.getenv("VERIFICATION_FLUSH_SECONDS", "2"))
+VERIFICATION_FLUSH_BATCH = int(os.getenv("VERIFICATION_FLUSH_BATCH", "50"))
+
+# Same columns and indexes as verified_jobs in supabase_schema.sql, in the subset of
+# DDL SQLite accepts (no identity columns; jsonb/timestamptz stored as text, ISO-8601 UTC).
+SCHEMA = """
+create table if not exists verified_jobs (
+  id integer primary key,
+  title text not null,
+  company text not null,
+  url text not null,
+  canonical_url text not null,
+  content_hash text not null default '',
+  score int not null,
+  status text not null,
+  result text not null,
+  created_at text not null
+);
+create index if not exists verified_jobs_canonical_url_idx on verified_jobs (canonical_url, content_hash, created_at desc);
+create index if not exists verified_jobs_company_idx on verified_jobs (company);
+create index if not exists verified_jobs_created_at_idx on verified_jobs (created_at desc);
+"""
+
+Row = Tuple[str, str, str, str, str, int, str, str, str]
+
+
+def _utc_iso(seconds_ago: float = 0.0) -> str:
+    when = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=seconds_ago)
+    return when.isoformat(timespec="seconds")
+
+
+class VerificationStore:
+    """
+    SQLite-backed history of finished verifications (the backend's copy of verified_jobs).
+    Writes are write-behind: record() only buffers, a background task flushes batches in
+    one transaction. Lookups see buffered rows too, so a re-request never misses a fresh result.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, max_age: float = VERIFIED_JOB_MAX_AGE,
+                 flush_seconds: float = VERIFICATION_FLUSH_SECONDS, batch_size: int = VERIFICATION_FLUSH_BATCH):
+        self.path = path
+        self.max_age = max_age
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], Tuple[Row, Dict[str, Any]]] = {} # Newest per job wins
+        self._flushing: Dict[Tuple[str, str], Tuple[Row, Dict[str, Any]]] = {} # Batch being written
+        self._wake: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.written = 0
+        self.batches = 0
+        self.failed_flushes = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+        return self._conn
+
+    # --- Reads ---
+
+    def get(self, canonical_url: str, content_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Latest stored result for this job + content if younger than max_age, else None.
+        """
+        with self._lock:
+            row = self._db().execute(
+                "select result from verified_jobs where canonical_url = ? and content_hash = ? and created_at >= ? "
+                "order by created_at desc, id desc limit 1",
+                (canonical_url, content_hash, _utc_iso(self.max_age)),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def lookup(self, url: str, content: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        key = job_cache_key(url, content)
+        pending = self._pending.get(key) or self._flushing.get(key)
+        result = pending[1] if pending else await asyncio.to_thread(self.get, *key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def recent(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Newest stored verifications, shaped like the verified_jobs rows the frontend reads.
+        """
+        with self._lock:
+            rows = self._db().execute(
+                "select title, company, url, score, status, created_at from verified_jobs "
+                "order by created_at desc, id desc limit ?",
+                (limit,),
+            ).fetchall()
+        keys = ("title", "company", "url", "score", "status", "created_at")
+        return [dict(zip(keys, row)) for row in rows]
+
+    # --- Writes ---
+
+    def record(self, url: str, content: Optional[str], result: Dict[str, Any]):
+        """
+        Queues a finished verification for the next batch. Never blocks the request.
+        """
+        canonical_url, content_hash = key = job_cache_key(url, content)
+        metadata = result.get("metadata") or {}
+        row = (
+            str(metadata.get("title") or "Unknown"),
+            str(metadata.get("company") or "Unknown"),
+            url,
+            canonical_url,
+            content_hash,
+            int(result.get("score", 0)),
+            result.get("status", ""),
+            json.dumps(result, default=str),
+            _utc_iso(),
+        )
+        self._pending[key] = (row, result)
+        self._ensure_flusher()
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    def write_batch(self, rows: List[Row]):
+        with self._lock:
+            db = self._db()
+            with db: # One transaction per batch
+                db.executemany(
+                    "insert into verified_jobs (title, company, url, canonical_url, content_hash, score, status, result, created_at) "
+                    "values (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+
+    async def flush(self):
+        """
+        Writes everything buffered so far. A failed batch goes back in the buffer for the next flush.
+        """
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        self._flushing = batch
+        try:
+            await asyncio.to_thread(self.write_batch, [row for row, _ in batch.values()])
+        except Exception as e:
+            self.failed_flushes += 1
+            print(f"⚠️ Verification store flush failed ({len(batch)} rows kept for retry): {e}")
+            for key, entry in batch.items():
+                self._pending.setdefault(key, entry)
+            return
+        finally:
+            self._flushing = {}
+        self.written += len(batch)
+        self.batches += 1
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    def _ensure_flusher(self):
+        task = self._flush_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            self._wake = asyncio.Event()
+            self._flush_task = asyncio.ensure_future(self._run())
+
+    def start(self):
+        """
+        Starts the background flusher (also started lazily by the first record()).
+        """
+        self._ensure_flusher()
+
+    async def stop(self):
+        """
+        Stops the flusher and writes whatever is still buffered.
+        """
+        task, self._flush_task = self._flush_task, None
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "pending": len(self._pending),
+            "written": self.written,
+            "batches": self.batches,
+            "failed_flushes": self.failed_flushes,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+verification_store = VerificationStore()
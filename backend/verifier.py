@@ -1,36 +1,80 @@
 from scraper import scrape_job_details
-from agent import agent_graph
+from agent import get_agent_graph, MIN_JD_CHARS, VERIFIED_THRESHOLD
+import tools
 
-from typing import Optional
+import asyncio
+import os
+from typing import Optional, List, Tuple, Dict, Any, AsyncIterator, Callable
 from tools import extract_metadata_from_text
+from cache import verification_cache, job_cache_key
+from verification_store import verification_store
+from metrics import timed, VERIFICATION_SECONDS, VERIFICATIONS
+import deadline
+
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+Emit = Callable[[str, Dict[str, Any]], None] # Receives (event, data) progress from a streamed run
 
 async def verify_job_listing(url: str, content: Optional[str] = None):
     """
-    Orchestrates the verification process using LangGraph Agent.
+    Returns a cached verification for this job + content if fresh, otherwise a stored one
+    (indexed read, no scraping), otherwise runs the pipeline and stores the result.
+    Identical concurrent requests share one run. Partial (out of time) and degraded results aren't cached.
+    """
+    if not (content and len(content.strip()) > 50):
+        content = None
+    key = job_cache_key(url, content)
+    return await verification_cache.get_or_compute(
+        key,
+        lambda: _stored_or_verify(url, content),
+        should_cache=_is_final,
+    )
+
+def _is_final(result: Dict[str, Any]) -> bool:
+    """
+    Results worth reusing: not errors, and not scored on partial or degraded signals
+    (those should be re-run once the budget or the provider is back).
+    """
+    return result.get("status") != "Error" and not result.get("partial") and not result.get("degraded")
+
+def _is_storable(result: Dict[str, Any]) -> bool:
+    """
+    Final results that actually read the job. A failed scrape shouldn't pin a verdict for a day.
+    """
+    scraped_text = (result.get("metadata") or {}).get("scraped_text", "")
+    return _is_final(result) and len(scraped_text) >= MIN_JD_CHARS
+
+async def _stored_or_verify(url: str, content: Optional[str] = None, emit: Optional[Emit] = None) -> Dict[str, Any]:
+    stored = await verification_store.lookup(url, content)
+    if stored is not None:
+        return stored
+    result = await _timed_verification(url, content, emit)
+    if _is_storable(result):
+        verification_store.record(url, content, result)
+    return result
+
+async def prepare_metadata(url: str, content: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Job metadata from extension-provided content, or by scraping the URL.
     """
-    # 1. Extract Metadata
     # Treat empty strings as None to trigger scraping
+    # In fused mode metadata extraction is part of the single analysis call, so skip it here
+    extract = not tools.FUSED_LLM_ANALYSIS
     if content and len(content.strip()) > 50:
         print(f"📥 Received content from extension for {url} ({len(content)} chars)")
         # Use simple structure if content is provided
-        extraction = extract_metadata_from_text(content, url)
-        metadata = {
+        # Too little text ends the graph before scoring anyway, so don't pay for extraction
+        extract = extract and len(content.strip()) >= MIN_JD_CHARS
+        extraction = await extract_metadata_from_text(content, url) if extract else {}
+        return {
             "scraped_text": content[:10000],
             **extraction
         }
-    else:
-        print(f"📥 No content provided (or too short). initiating scraping for {url}...")
-        metadata = await scrape_job_details(url)
-    
-    if not metadata:
-        return {
-            "status": "Error",
-            "score": 0,
-            "details": "Could not extract job details."
-        }
+    print(f"📥 No content provided (or too short). initiating scraping for {url}...")
+    return await scrape_job_details(url, extract_metadata=extract)
 
-    # 2. Run Agent Workflow
-    initial_state = {
+def build_initial_state(url: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    return {
         "url": url,
         "metadata": metadata,
         "health_data": "",
@@ -38,28 +82,199 @@ async def verify_job_listing(url: str, content: Optional[str] = None):
         "final_score": 0,
         "final_reasoning": ""
     }
-    
-    try:
-        # Run the graph
-        result_state = await agent_graph.ainvoke(initial_state)
+
+def format_result(result_state: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "metadata": result_state['metadata'],
+        "status": "Verified" if result_state['final_score'] > VERIFIED_THRESHOLD else "Unverified",
+        "score": result_state['final_score'],
+        "details": result_state['final_reasoning'],
+        "health_insights": result_state['health_data'][:200] + "..." if result_state['health_data'] else "No data",
+        "ai_analysis": result_state['analysis'],
+        "references": result_state.get('health_links', []) + result_state.get('reddit_links', []),
+        "partial": result_state.get('partial', False),
+        "degraded": result_state.get('degraded', False),
+    }
+
+NO_METADATA_ERROR = {
+    "status": "Error",
+    "score": 0,
+    "details": "Could not extract job details."
+}
+
+async def run_verification(url: str, content: Optional[str] = None):
+    """
+    Orchestrates the verification process using LangGraph Agent.
+    Everything below runs under one VERIFY_BUDGET_SECONDS deadline.
+    """
+    with deadline.scope():
+        # 1. Extract Metadata
+        metadata = await prepare_metadata(url, content)
         
-        print(f"DEBUG: Agent Result Keys: {result_state.keys()}")
-        print(f"DEBUG: Health Links: {result_state.get('health_links')}")
-        print(f"DEBUG: Reddit Links: {result_state.get('reddit_links')}")
+        if not metadata:
+            return NO_METADATA_ERROR
+
+        # 2. Run Agent Workflow
+        initial_state = build_initial_state(url, metadata)
         
-        return {
-            "metadata": result_state['metadata'],
-            "status": "Verified" if result_state['final_score'] > 70 else "Unverified",
-            "score": result_state['final_score'],
-            "details": result_state['final_reasoning'],
-            "health_insights": result_state['health_data'][:200] + "..." if result_state['health_data'] else "No data",
-            "ai_analysis": result_state['analysis'],
-            "references": result_state.get('health_links', []) + result_state.get('reddit_links', [])
+        try:
+            # Run the graph
+            result_state = await get_agent_graph().ainvoke(initial_state)
+            
+            print(f"DEBUG: Agent Result Keys: {result_state.keys()}")
+            print(f"DEBUG: Health Links: {result_state.get('health_links')}")
+            print(f"DEBUG: Reddit Links: {result_state.get('reddit_links')}")
+            
+            return format_result(result_state)
+        except Exception as e:
+            print(f"Agent execution failed: {e}")
+            return {
+                "status": "Error",
+                "score": 0,
+                "details": f"AI Verification failed: {str(e)}"
+            }
+
+async def _timed_verification(url: str, content: Optional[str] = None, emit: Optional[Emit] = None):
+    with timed(VERIFICATION_SECONDS, "verification", "run"):
+        if emit is None:
+            result = await run_verification(url, content)
+        else:
+            result = await run_streamed_verification(url, content, emit)
+    VERIFICATIONS.inc(status=result.get("status", "Error"))
+    return result
+
+def _node_events(node: str, update: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Maps one graph node's state update to the progress events clients render.
+    """
+    if node == "triage" and update.get("triage") in ("decisive", "out_of_time"):
+        # Decided from local signals: the stages that did run (stored intel, temporal) report here
+        return _node_events("search", update) + _node_events("temporal", update)
+    if node == "search":
+        return [
+            ("health", {"summary": update.get("health_data", ""), "links": update.get("health_links", [])}),
+            ("reddit", {"summary": update.get("reddit_data", ""), "links": update.get("reddit_links", [])}),
+        ]
+    if node == "analyze":
+        return [("analysis", update.get("analysis", {}))]
+    if node == "temporal":
+        return [("temporal", {"status": update.get("temporal_analysis", "")})]
+    if node == "score":
+        score = update.get("final_score", 0)
+        return [("score", {
+            "score": score,
+            "status": "Verified" if score > VERIFIED_THRESHOLD else "Unverified",
+            "details": update.get("final_reasoning", ""),
+            "partial": update.get("partial", False),
+            "degraded": update.get("degraded", False),
+        })]
+    return []
+
+async def run_streamed_verification(url: str, content: Optional[str], emit: Emit) -> Dict[str, Any]:
+    """
+    run_verification, reporting each stage through emit(event, data) as it finishes.
+    """
+    with deadline.scope():
+        metadata = await prepare_metadata(url, content)
+        if not metadata:
+            return NO_METADATA_ERROR
+        emit("metadata", {k: v for k, v in metadata.items() if k not in ("scraped_text", "llm_extracted")})
+
+        state = build_initial_state(url, metadata)
+        try:
+            async for chunk in get_agent_graph().astream(state, stream_mode="updates"):
+                for node, update in chunk.items():
+                    state.update(update or {})
+                    for event, data in _node_events(node, update or {}):
+                        emit(event, data)
+            return format_result(state)
+        except Exception as e:
+            print(f"Agent execution failed: {e}")
+            return {
+                "status": "Error",
+                "score": 0,
+                "details": f"AI Verification failed: {str(e)}"
+            }
+
+async def stream_verification(url: str, content: Optional[str] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Same pipeline as verify_job_listing, but yields (event, data) as each stage finishes:
+    metadata, health, reddit, analysis, temporal, score, then the full result.
+    A fresh cached or stored verification, or the result of an identical run already
+    in flight (streamed or not), is returned as the only event.
+    The run is shared through verification_cache, so it finishes (and is cached) even
+    if this client goes away.
+    """
+    if not (content and len(content.strip()) > 50):
+        content = None
+    key = job_cache_key(url, content)
+    cached = verification_cache.get(key)
+    if cached is not None:
+        verification_cache.hits += 1
+        yield "result", cached
+        return
+
+    inflight = verification_cache.in_flight(key)
+    if inflight is None:
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def compute():
+            try:
+                return await _stored_or_verify(url, content, lambda event, data: events.put_nowait((event, data)))
+            finally:
+                events.put_nowait(None)
+
+        inflight = verification_cache.start(key, compute, should_cache=_is_final)
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            yield event
+    else:
+        verification_cache.coalesced += 1
+
+    try:
+        result = await asyncio.shield(inflight)
+    except Exception as e:
+        result = {
+            "status": "Error",
+            "score": 0,
+            "details": f"Internal Error: {str(e)}"
         }
+    yield "result", result
+
+async def _verify_or_error(url: str, content: Optional[str]) -> Dict[str, Any]:
+    try:
+        return await verify_job_listing(url, content)
     except Exception as e:
-        print(f"Agent execution failed: {e}")
         return {
             "status": "Error",
             "score": 0,
-            "details": f"AI Verification failed: {str(e)}"
+            "details": f"Internal Error: {str(e)}"
         }
+
+async def verify_job_listings(
+    items: List[Tuple[str, Optional[str]]], concurrency: int = BATCH_CONCURRENCY
+) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Verifies (url, content) pairs with at most `concurrency` running at once.
+    Yields (index, result) as each one finishes, so callers can stream results
+    without waiting for the slowest item or holding the whole batch.
+    """
+    if not items:
+        return
+    next_index = iter(range(len(items)))
+    done: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+
+    async def worker():
+        for i in next_index:
+            url, content = items[i]
+            await done.put((i, await _verify_or_error(url, content)))
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(items)))]
+    try:
+        for _ in range(len(items)):
+            yield await done.get()
+    finally:
+        for task in workers:
+            task.cancel()
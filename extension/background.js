@@ -19,3 +19,53 @@ chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
         return true; // Keep the message channel open for async response
     }
 });
+
+// Streaming variant: content scripts open a port and get one message per finished stage
+// (metadata, health, reddit, analysis, temporal, score, result) from /verify/stream.
+chrome.runtime.onConnect.addListener((port) => {
+    if (port.name !== "verifyJobStream") return;
+
+    port.onMessage.addListener(async (payload) => {
+        const apiUrl = "http://localhost:8000/verify/stream";
+        try {
+            const response = await fetch(apiUrl, {
+                method: "POST",
+                headers: { "Content-Type": "application/json" },
+                body: JSON.stringify(payload)
+            });
+            if (!response.ok) {
+                // e.g. a FastAPI error JSON: not SSE, so no result event would ever arrive
+                const body = await response.text();
+                let details = `Server error (${response.status})`;
+                try {
+                    details = JSON.parse(body).detail || details;
+                } catch (e) { }
+                port.postMessage({ event: "result", data: { status: "Error", score: 0, details: String(details) } });
+                port.disconnect();
+                return;
+            }
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = "";
+
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+
+                // SSE frames are separated by a blank line
+                let boundary;
+                while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+                    const frame = buffer.slice(0, boundary);
+                    buffer = buffer.slice(boundary + 2);
+                    const event = (frame.match(/^event: (.*)$/m) || [])[1];
+                    const data = (frame.match(/^data: (.*)$/m) || [])[1];
+                    if (event && data) port.postMessage({ event, data: JSON.parse(data) });
+                }
+            }
+        } catch (error) {
+            port.postMessage({ event: "error", data: { message: error.message } });
+        }
+        port.disconnect();
+    });
+});
@@ -57,40 +57,70 @@ async function processLinkedInJob() {
         loadingBadge.style.backgroundColor = "#6366f1"; // Indigo
         titleElement.appendChild(loadingBadge);
 
-        try {
-            const pageContent = document.body.innerText; // Capture text
+        const pageContent = document.body.innerText; // Capture text
+        verifyWithProgress(titleElement, loadingBadge, { url: jobUrl, content: pageContent });
+    }
+}
 
-            // Send message to background script to handle the fetch (bypasses CORS/CSP)
-            chrome.runtime.sendMessage({
-                action: "verifyJob",
-                data: {
-                    url: jobUrl,
-                    content: pageContent
-                }
-            }, (response) => {
-                if (chrome.runtime.lastError) {
-                    console.error("Runtime Error:", chrome.runtime.lastError);
-                    throw new Error(chrome.runtime.lastError.message);
-                }
+// Stage labels shown on the loading badge while /verify/stream is running
+const STAGE_LABELS = {
+    metadata: "Job details read...",
+    health: "Company news checked...",
+    reddit: "Reddit checked...",
+    analysis: "JD analyzed...",
+    temporal: "Freshness checked..."
+};
+
+// Streams a verification through the background script and updates the badge as each stage lands.
+// The score badge is shown as soon as the score stage arrives, before the final result.
+function verifyWithProgress(titleElement, loadingBadge, payload) {
+    let resultBadge = null;
+    let finished = false;
+
+    const showError = (message) => {
+        finished = true;
+        loadingBadge.innerText = "Error";
+        loadingBadge.title = message; // Show error on hover
+        loadingBadge.style.backgroundColor = "#71717a";
+    };
 
-                if (response && response.success) {
-                    // Remove loader
-                    loadingBadge.remove();
+    const showScore = (score, status) => {
+        loadingBadge.remove();
+        if (resultBadge) resultBadge.remove();
+        resultBadge = createBadge(score, status);
+        titleElement.appendChild(resultBadge);
+    };
 
-                    // Append result badge
-                    const resultBadge = createBadge(response.data.score, response.data.status);
-                    titleElement.appendChild(resultBadge);
+    try {
+        const port = chrome.runtime.connect({ name: "verifyJobStream" });
+
+        port.onMessage.addListener(({ event, data }) => {
+            if (STAGE_LABELS[event]) {
+                loadingBadge.innerText = STAGE_LABELS[event];
+            } else if (event === "score") {
+                showScore(data.score, data.status);
+            } else if (event === "result") {
+                if (data.status === "Error") {
+                    showError(data.details || "Verification failed");
                 } else {
-                    throw new Error(response.error || "Unknown error from background script");
+                    finished = true;
+                    showScore(data.score, data.status);
                 }
-            });
+            } else if (event === "error") {
+                console.error("VeriJob Error Details:", data.message);
+                showError(data.message);
+            }
+        });
 
-        } catch (error) {
-            console.error("VeriJob Error Details:", error);
-            loadingBadge.innerText = "Error";
-            loadingBadge.title = error.message; // Show error on hover
-            loadingBadge.style.backgroundColor = "#71717a";
-        }
+        // Stream closed without a result (e.g. the background script went away): don't stay on "loading"
+        port.onDisconnect.addListener(() => {
+            if (!finished) showError("Verification stopped before a result arrived");
+        });
+
+        port.postMessage(payload);
+    } catch (error) {
+        console.error("VeriJob Error Details:", error);
+        showError(error.message);
     }
 }
 
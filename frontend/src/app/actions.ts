@@ -40,7 +40,20 @@ export async function getVerifiedJobs() {
         }
     }
 
-    // 2. Fallback to Live Feed from Backend
+    // 2. Verifications stored by the backend itself
+    try {
+        const res = await fetch(`${BACKEND_URL}/verified?limit=5`, { next: { revalidate: 300 } });
+        if (res.ok) {
+            const stored = await res.json();
+            if (stored.length > 0) {
+                return stored;
+            }
+        }
+    } catch (e) {
+        console.error("Stored verifications fetch error:", e);
+    }
+
+    // 3. Fallback to Live Feed from Backend
     try {
         console.log(`Fetching feed from ${BACKEND_URL}/feed`);
         const res = await fetch(`${BACKEND_URL}/feed`, { next: { revalidate: 3600 } });